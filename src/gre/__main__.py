@@ -1,9 +1,16 @@
+import argparse
+
 from gre.ingestion.main import run
-from gre.condensation.main import run as run_condensation
+from gre.condensation.main import run as run_condensation, build_processor as build_condensation_processor, run_batch as run_condensation_batch
+from gre.condensation.handoff import CondensationHandoff
 from gre.config.config import ConfigLoader
+from gre.bench import suite as bench_suite
 from gre.logger.logger import get_logger
 
 
+logger = get_logger(__name__)
+
+
 def get_config():
     try:
         shared_config = ConfigLoader()
@@ -13,7 +20,115 @@ def get_config():
         return
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(prog='gre')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for ingestion (overrides ingestion.workers, defaults to the CPU count)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-ingest every PDF even if its cached output is up to date'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Write a cProfile dump per document and stage next to the timing report'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Only condense documents that did not finish in an earlier run, according to the run journal'
+    )
+    parser.add_argument(
+        '--pipelined',
+        action='store_true',
+        help='Condense each document as soon as it is ingested instead of after the whole batch'
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+    bench = subparsers.add_parser(
+        'bench',
+        help='Benchmark ingestion throughput on a generated synthetic corpus'
+    )
+    bench_suite.add_arguments(bench)
+
+    batch = subparsers.add_parser(
+        'batch',
+        help='Condense through the provider batch API: submit runs ingestion and submits the prompts, collect writes the outputs'
+    )
+    batch.add_argument('action', choices=['submit', 'collect'])
+
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
+    args = parse_args()
+    if args.command == 'bench':
+        bench_suite.run_from_args(args)
+        raise SystemExit(0)
+
     config = get_config()
-    run(config.get_ingestion_input_dir(), config.get_ingestion_output_dir())
-    run_condensation(config.get_ingestion_output_dir(), config.get_condensation_output_dir(), config.get_condensation_prompt_path())
\ No newline at end of file
+    workers = args.workers if args.workers is not None else config.get_ingestion_workers()
+    ingestion_args = dict(
+        workers=workers,
+        extractor_settings=config.get_extractor_settings(),
+        use_cache=config.get_ingestion_cache() and not args.no_cache,
+        artifacts_dir=config.get_ingestion_artifacts_dir(),
+        metrics_dir=config.get_ingestion_metrics_dir(),
+        profile=args.profile,
+        cleaner_time_limit=config.get_cleaner_time_limit(),
+        queue_dir=config.get_work_queue_dir(),
+        lease_ttl=config.get_work_queue_lease_ttl()
+    )
+
+    condensation_args = dict(
+        queue_dir=config.get_work_queue_dir(),
+        lease_ttl=config.get_work_queue_lease_ttl(),
+        completion_tokens=config.get_condensation_completion_tokens(),
+        response_cache_path=config.get_condensation_response_cache_path(),
+        response_cache_max_mb=config.get_condensation_response_cache_max_mb(),
+        chunk_tokens=config.get_condensation_chunk_tokens(),
+        reduce_prompt_path=config.get_condensation_reduce_prompt_path(),
+        compaction=config.get_condensation_compaction(),
+        repair_prompt_path=config.get_condensation_repair_prompt_path(),
+        streaming=config.get_condensation_streaming(),
+        resume=args.resume
+    )
+
+    if args.command == 'batch':
+        if args.action == 'submit':
+            run(config.get_ingestion_input_dir(), config.get_ingestion_output_dir(), **ingestion_args)
+        run_condensation_batch(
+            args.action,
+            config.get_ingestion_output_dir(),
+            config.get_condensation_output_dir(),
+            config.get_condensation_prompt_path(),
+            config.get_condensation_batch(),
+            **condensation_args
+        )
+        raise SystemExit(0)
+
+    if args.pipelined:
+        handoff = CondensationHandoff(
+            build_condensation_processor(config.get_condensation_prompt_path(), **condensation_args),
+            config.get_condensation_output_dir(),
+            maxsize=config.get_condensation_handoff_queue_size()
+        )
+        handoff.start()
+        try:
+            run(config.get_ingestion_input_dir(), config.get_ingestion_output_dir(), on_output=handoff.submit, **ingestion_args)
+        finally:
+            handoff.close()
+        raise SystemExit(0)
+
+    run(config.get_ingestion_input_dir(), config.get_ingestion_output_dir(), **ingestion_args)
+    run_condensation(
+        config.get_ingestion_output_dir(),
+        config.get_condensation_output_dir(),
+        config.get_condensation_prompt_path(),
+        **condensation_args
+    )
@@ -0,0 +1,95 @@
+import argparse
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Optional
+
+from gre.ingestion.loader.backends import BACKENDS
+from gre.ingestion.loader.text_extractor import TextExtractor
+from gre.logger.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def _similarity(reference: str, candidate: str) -> float:
+    '''
+    Line-level similarity in [0, 1]; 1.0 means identical line sequences.
+    '''
+    return SequenceMatcher(None, reference.splitlines(), candidate.splitlines(), autojunk=False).ratio()
+
+
+def benchmark_backends(pdfs: list[Path], backends: list[str]) -> dict[str, dict[str, float]]:
+    '''
+    Extracts every PDF with every backend. Throughput is reported per backend and
+    output differences are measured against the first backend in the list.
+    '''
+    outputs: dict[str, dict[Path, str]] = {name: {} for name in backends}
+    report: dict[str, dict[str, float]] = {}
+
+    for name in backends:
+        extractor = TextExtractor(backend=name)
+        pages = 0
+        failed = 0
+        start_time = time.perf_counter()
+
+        for pdf in pdfs:
+            try:
+                text = extractor.extract(pdf)
+            except Exception as e:
+                logger.warning('Extraction failed | backend=%s | pdf=%s | error=%s', name, pdf, e)
+                failed += 1
+                continue
+            outputs[name][pdf] = text
+            pages += text.count('=== PAGE ')
+
+        duration = time.perf_counter() - start_time
+        report[name] = {
+            'docs': len(outputs[name]),
+            'failed': failed,
+            'pages': pages,
+            'seconds': duration,
+            'pages_per_sec': pages / duration if duration > 0 else 0.0,
+            'chars': sum(len(t) for t in outputs[name].values()),
+        }
+
+    reference = backends[0]
+    for name in backends:
+        ratios = [
+            _similarity(outputs[reference][pdf], outputs[name][pdf])
+            for pdf in pdfs
+            if pdf in outputs[reference] and pdf in outputs[name]
+        ]
+        report[name]['similarity_mean'] = sum(ratios) / len(ratios) if ratios else 1.0
+        report[name]['similarity_min'] = min(ratios) if ratios else 1.0
+
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m gre.bench.backends',
+        description='Compare extraction backends on a sample corpus.'
+    )
+    parser.add_argument('corpus', type=Path, help='Directory with sample PDFs (searched recursively)')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--limit', type=int, default=None, help='Use at most this many PDFs')
+    args = parser.parse_args(argv)
+
+    pdfs = sorted(args.corpus.rglob('*.pdf'))[:args.limit]
+    if not pdfs:
+        parser.error(f'No PDFs found under {args.corpus}')
+
+    report = benchmark_backends(pdfs, args.backends)
+
+    print(f'{"backend":<12} {"docs":>5} {"failed":>6} {"pages":>6} {"seconds":>9} {"pages/s":>9} {"chars":>10} {"sim_mean":>9} {"sim_min":>8}')
+    for name, row in report.items():
+        print(
+            f'{name:<12} {row["docs"]:>5} {row["failed"]:>6} {row["pages"]:>6} {row["seconds"]:>9.2f} {row["pages_per_sec"]:>9.1f} '
+            f'{row["chars"]:>10} {row["similarity_mean"]:>9.3f} {row["similarity_min"]:>8.3f}'
+        )
+    print(f'(similarity is measured against {args.backends[0]})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+import random
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+COLUMN_X = (50, 310)
+COLUMN_CHARS = 52
+LINE_HEIGHT = 11
+BODY_TOP = 780
+BODY_BOTTOM = 60
+LINES_PER_COLUMN = (BODY_TOP - BODY_BOTTOM) // LINE_HEIGHT
+
+JOURNAL = 'Journal of Synthetic Reviews'
+
+WORDS = (
+    'graph neural network retrieval augmented generation knowledge model method dataset '
+    'benchmark evaluation metric survey approach taxonomy language transformer attention '
+    'embedding entity relation representation inference reasoning community summarization '
+    'question answering pipeline extraction ontology corpus baseline performance robustness '
+    'scalability architecture encoder decoder supervision annotation alignment'
+).split()
+
+SECTIONS = [
+    'INTRODUCTION', 'BACKGROUND', 'RELATED WORK', 'METHOD', 'TAXONOMY', 'DATASETS',
+    'EVALUATION', 'RESULTS', 'DISCUSSION', 'OPEN CHALLENGES', 'CONCLUSION',
+]
+
+
+def _escape(text: str) -> bytes:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1')
+
+
+class _PdfWriter:
+    '''
+    Minimal PDF 1.4 writer: one Helvetica font, text-only pages. Objects are
+    streamed to the file as they are produced; only their offsets are kept.
+    '''
+
+    FONT_ID = 1
+    PAGES_ID = 2
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self.handle = handle
+        self.offsets: dict[int, int] = {}
+        self.page_ids: list[int] = []
+        self.next_id = 3
+        self.handle.write(b'%PDF-1.4\n')
+        self._write_object(self.FONT_ID, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+
+    def _write_object(self, obj_id: int, body: bytes) -> None:
+        self.offsets[obj_id] = self.handle.tell()
+        self.handle.write(b'%d 0 obj\n' % obj_id + body + b'\nendobj\n')
+
+
+    def _allocate(self) -> int:
+        obj_id = self.next_id
+        self.next_id += 1
+        return obj_id
+
+
+    def add_page(self, items: list[tuple[float, float, float, str]]) -> None:
+        '''
+        Adds a page from (x, y, font size, text) items.
+        '''
+        content = b'\n'.join(
+            b'BT /F1 %g Tf %g %g Td (%s) Tj ET' % (size, x, y, _escape(text))
+            for x, y, size, text in items
+        )
+        stream = zlib.compress(content)
+        content_id = self._allocate()
+        self._write_object(
+            content_id,
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream'
+        )
+
+        page_id = self._allocate()
+        self._write_object(
+            page_id,
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R '
+            b'/Resources << /Font << /F1 %d 0 R >> >> >>'
+            % (self.PAGES_ID, PAGE_WIDTH, PAGE_HEIGHT, content_id, self.FONT_ID)
+        )
+        self.page_ids.append(page_id)
+
+
+    def close(self) -> None:
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+        self._write_object(self.PAGES_ID, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_ids)))
+        catalog_id = self._allocate()
+        self._write_object(catalog_id, b'<< /Type /Catalog /Pages %d 0 R >>' % self.PAGES_ID)
+
+        xref_offset = self.handle.tell()
+        self.handle.write(b'xref\n0 %d\n0000000000 65535 f \n' % self.next_id)
+        for obj_id in range(1, self.next_id):
+            self.handle.write(b'%010d 00000 n \n' % self.offsets[obj_id])
+        self.handle.write(
+            b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (self.next_id, catalog_id, xref_offset)
+        )
+
+
+def _wrap(words: list[str], rnd: random.Random) -> Iterator[str]:
+    '''
+    Greedy column wrap. Long words that do not fit are sometimes hyphenated
+    across the line break, as in typeset articles.
+    '''
+    line = ''
+    for word in words:
+        candidate = f'{line} {word}' if line else word
+        if len(candidate) <= COLUMN_CHARS:
+            line = candidate
+            continue
+
+        room = COLUMN_CHARS - len(line) - 2
+        if len(word) >= 8 and room >= 4 and rnd.random() < 0.4:
+            cut = min(room, len(word) - 3)
+            yield f'{line} {word[:cut]}-'
+            line = word[cut:]
+        else:
+            yield line
+            line = word
+    if line:
+        yield line
+
+
+def _sentence(rnd: random.Random, reference_count: int) -> str:
+    words = [rnd.choice(WORDS) for _ in range(rnd.randint(8, 22))]
+    words[0] = words[0].capitalize()
+    if rnd.random() < 0.35:
+        first = rnd.randint(1, reference_count)
+        citation = f'[{first}]' if rnd.random() < 0.6 else f'[{first}, {min(first + 1, reference_count)}]'
+        words.insert(rnd.randint(1, len(words)), citation)
+    return ' '.join(words) + '.'
+
+
+def _body_lines(rnd: random.Random, reference_count: int) -> Iterator[str]:
+    section = 0
+    while True:
+        yield ''
+        yield f'{section + 1}. {SECTIONS[section % len(SECTIONS)]}'
+        section += 1
+        for _ in range(rnd.randint(3, 8)):
+            sentences = [_sentence(rnd, reference_count) for _ in range(rnd.randint(3, 7))]
+            yield from _wrap(' '.join(sentences).split(), rnd)
+            yield ''
+
+
+def _reference_lines(rnd: random.Random, reference_count: int) -> Iterator[str]:
+    yield 'REFERENCES'
+    for number in range(1, reference_count + 1):
+        authors = ', '.join(f'{rnd.choice("ABCDEFGHJKLMNPRST")}. {rnd.choice(WORDS).capitalize()}' for _ in range(rnd.randint(1, 3)))
+        title = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(4, 9))).capitalize()
+        entry = f'[{number}] {authors}, {title}, {JOURNAL} {rnd.randint(1, 40)} ({rnd.randint(2005, 2024)}) {rnd.randint(1, 900)}-{rnd.randint(901, 999)}.'
+        yield from _wrap(entry.split(), rnd)
+    while True:
+        yield ''
+
+
+def _front_matter(rnd: random.Random, pages: int) -> list[str]:
+    title = ' '.join(rnd.choice(WORDS) for _ in range(6)).title()
+    return [
+        f'Contents lists available at ScienceDirect',
+        f'{JOURNAL}',
+        f'journal homepage: www.elsevier.com/locate/jsr',
+        f'A Survey of {title}',
+        f'A. Author a,*, B. Author b',
+        f'a Department of Computer Science, Synthetic University',
+        f'* Corresponding author. E-mail address: a.author@example.org',
+        f'Received 12 March 2024; accepted 3 June 2024',
+        f'Available online 1 July 2024',
+        f'https://doi.org/10.1016/j.jsr.2024.{rnd.randint(1000, 9999)}',
+        f'(c) 2024 Elsevier Ltd. All rights reserved.',
+        '',
+        'A B S T R A C T',
+        *_wrap(' '.join(_sentence(rnd, 10) for _ in range(5)).split(), rnd),
+        '',
+        'Keywords: ' + ', '.join(rnd.sample(WORDS, 5)),
+    ]
+
+
+def write_review_pdf(path: Path, pages: int, seed: int = 0) -> None:
+    '''
+    Writes a reproducible synthetic review article with `pages` pages. It has
+    two-column body text, running headers and footers, `]n[` page-number
+    artifacts, inline citations, hyphenated line breaks and a numbered
+    reference section of roughly a tenth of the document.
+    '''
+    rnd = random.Random(f'{seed}:{pages}')
+    reference_pages = max(1, pages // 10) if pages > 1 else 0
+    reference_count = max(10, reference_pages * LINES_PER_COLUMN)
+    body = _body_lines(rnd, reference_count)
+    references = _reference_lines(rnd, reference_count)
+
+    with open(path, 'wb') as handle:
+        writer = _PdfWriter(handle)
+
+        for page in range(1, pages + 1):
+            items: list[tuple[float, float, float, str]] = [
+                (50, 805, 8, f'{JOURNAL} {seed % 40 + 1} (2024) 1-{pages}'),
+                (50, 30, 8, f'{JOURNAL} - Synthetic Benchmark Edition'),
+                (290, 42, 8, f']{page}['),
+            ]
+
+            top = BODY_TOP
+            if page == 1:
+                for line in _front_matter(rnd, pages):
+                    items.append((50, top, 9, line))
+                    top -= LINE_HEIGHT
+
+            source = references if page > pages - reference_pages else body
+            for x in COLUMN_X:
+                y = top
+                while y >= BODY_BOTTOM:
+                    line = next(source)
+                    if line:
+                        items.append((x, y, 9, line))
+                    y -= LINE_HEIGHT
+
+            writer.add_page(items)
+
+        writer.close()
+
+
+def generate_corpus(root: Path, sizes: list[int], docs_per_size: int = 1, seed: int = 0) -> dict[int, list[Path]]:
+    '''
+    Generates (or reuses) `docs_per_size` PDFs per page count under
+    `root/p<pages>/`. File names encode the size and seed, so existing files
+    are identical to freshly generated ones.
+    '''
+    corpus: dict[int, list[Path]] = {}
+    for pages in sizes:
+        size_dir = root / f'p{pages:04d}'
+        size_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for index in range(docs_per_size):
+            path = size_dir / f'review-p{pages:04d}-s{seed + index}.pdf'
+            if not path.exists():
+                tmp_path = path.with_suffix('.tmp')
+                write_review_pdf(tmp_path, pages, seed + index)
+                tmp_path.replace(path)
+            paths.append(path)
+        corpus[pages] = paths
+    return corpus
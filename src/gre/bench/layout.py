@@ -0,0 +1,84 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+from gre.ingestion.loader.text_extractor import TextExtractor
+from gre.ingestion.pre.layout_repairer import LayoutRepairer
+
+
+def _load_corpus(corpus: Path, limit: Optional[int]) -> list[str]:
+    '''
+    Raw extracted texts for the corpus: `.txt` files are used as they are,
+    PDFs are extracted once with the default extractor; unreadable PDFs
+    are skipped.
+    '''
+    texts = [p.read_text(encoding='utf-8') for p in sorted(corpus.rglob('*.txt'))[:limit]]
+    if texts:
+        return texts
+
+    extractor = TextExtractor()
+    for pdf in sorted(corpus.rglob('*.pdf'))[:limit]:
+        try:
+            texts.append(extractor.extract(pdf))
+        except Exception as e:
+            print(f'skipped {pdf.name}: {e}')
+    return texts
+
+
+def benchmark_layout_repair(texts: list[str], repeat: int = 3) -> dict[str, dict[str, float]]:
+    '''
+    Times the fused `LayoutRepairer.process` against the multi-pass reference on
+    the same texts. The best of `repeat` runs is reported for each.
+    '''
+    repairer = LayoutRepairer()
+    chars = sum(len(t) for t in texts)
+    report: dict[str, dict[str, float]] = {}
+
+    for name, repair in (('multipass', repairer.process_multipass), ('fused', repairer.process)):
+        best = float('inf')
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for text in texts:
+                repair(text)
+            best = min(best, time.perf_counter() - start_time)
+
+        report[name] = {
+            'seconds': best,
+            'mb_per_sec': chars / best / 1e6 if best > 0 else 0.0,
+        }
+
+    report['fused']['mismatches'] = sum(
+        1 for text in texts if repairer.process(text) != repairer.process_multipass(text)
+    )
+    report['multipass']['mismatches'] = 0
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m gre.bench.layout',
+        description='Compare the fused layout repairer with the multi-pass reference.'
+    )
+    parser.add_argument('corpus', type=Path, help='Directory with raw extracted .txt files or sample PDFs')
+    parser.add_argument('--limit', type=int, default=None, help='Use at most this many documents')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per implementation')
+    args = parser.parse_args(argv)
+
+    texts = _load_corpus(args.corpus, args.limit)
+    if not texts:
+        parser.error(f'No .txt or .pdf files found under {args.corpus}')
+
+    # Per-token repair logging would dominate the timings
+    logging.disable(logging.INFO)
+    report = benchmark_layout_repair(texts, args.repeat)
+
+    print(f'{"impl":<10} {"seconds":>9} {"MB/s":>8} {"mismatches":>11}')
+    for name, row in report.items():
+        print(f'{name:<10} {row["seconds"]:>9.3f} {row["mb_per_sec"]:>8.2f} {row["mismatches"]:>11}')
+    print(f'({len(texts)} documents, {sum(len(t) for t in texts)} chars)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import logging
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.cleaners.front_matter_cleaner import FrontMatterCleaner
+from gre.ingestion.cleaners.header_footer_cleaner import HeaderFooterCleaner
+from gre.ingestion.cleaners.inline_reference_cleaner import InlineReferenceCleaner
+from gre.ingestion.cleaners.noise_cleaner import NoiseCleaner
+from gre.ingestion.cleaners.publication_metadata_cleaner import PublicationMetadataCleaner
+from gre.ingestion.cleaners.reference_cleaner import ReferenceCleaner
+from gre.ingestion.document import Document
+from gre.ingestion.post.line_normalizer import LineNormalizer
+from gre.ingestion.pre.layout_repairer import LayoutRepairer
+
+
+# Slack on the fitted exponent for timer noise and cache effects
+TOLERANCE = 0.35
+
+
+@dataclass
+class ScalingCase:
+    '''
+    One stage fed a worst-case input family. `make_input(n)` builds an input
+    whose size grows linearly with n; the runtime of `run` may grow at most
+    like n ** bound.
+    '''
+    name: str
+    bound: float
+    make_input: Callable[[int], str]
+    run: Callable[[str], Any]
+    base_size: int = 500
+
+
+def _cleaner_run(cleaner: BaseCleaner) -> Callable[[str], Any]:
+    return lambda text: cleaner.run(Document.from_text(text))
+
+
+def _normalize(text: str) -> Any:
+    return LineNormalizer().normalize(Document.from_text(text))
+
+
+def _running_heads(n: int) -> str:
+    # Every page carries a slightly different running head, so none of them
+    # repeats often enough to be dropped and all stay candidates
+    pages = []
+    for page in range(1, n + 1):
+        pages.append(
+            f'=== PAGE {page} ===\n'
+            f'Journal of Synthetic Reviews {page % 97} (2024) {page}-{page + 9}\n'
+            f'Journal of Synthetic Reviews {page % 89} special issue\n'
+            'graph retrieval model evaluation benchmark survey\n'
+            f'Synthetic Benchmark Edition {page % 83}\n'
+            f']{page}['
+        )
+    return '\n'.join(pages)
+
+
+def build_cases() -> list[ScalingCase]:
+    repairer = LayoutRepairer()
+
+    return [
+        # LayoutRepairer token scan: one giant spaced-out run, and long caps
+        # runs that end in a lowercase letter (no closing word boundary)
+        ScalingCase('repair/spaced-run', 1.0, lambda n: ' '.join('A' * (n * 20)) + 'x', repairer.process),
+        ScalingCase('repair/caps-no-boundary', 1.0, lambda n: ('A' * 200 + 'a ') * n, repairer.process),
+        # LayoutRepairer newline scan: hyphenation and unwrap chains, blank runs
+        ScalingCase('repair/hyphen-chain', 1.0, lambda n: 'word-\n' * (n * 20) + 'end', repairer.process),
+        ScalingCase('repair/unwrap-chain', 1.0, lambda n: 'a\nb\n' * (n * 20), repairer.process),
+        ScalingCase('repair/blank-runs', 1.0, lambda n: ('x' + '\n' * 50) * (n * 2), repairer.process),
+        ScalingCase('front-matter/metadata-block', 1.0, lambda n: 'Received 12 March 2024; accepted 3 June 2024\n' * n + 'Abstract\nbody text', _cleaner_run(FrontMatterCleaner())),
+        ScalingCase('header-footer/near-duplicate-heads', 1.0, _running_heads, _cleaner_run(HeaderFooterCleaner()), base_size=200),
+        ScalingCase('publication-metadata/giant-block', 1.0, lambda n: 'doi: 10.1016/j.x.2024 Received 2024 accepted ISSN 1234-5678\n' * (n * 4), _cleaner_run(PublicationMetadataCleaner())),
+        # Every heading candidate fails validation, so each one scans its window
+        ScalingCase('reference/failing-candidates', 1.0, lambda n: 'REFERENCES\nplain text without markers\n' * (n * 4), _cleaner_run(ReferenceCleaner())),
+        # One open citation spanning the whole document, and a dense citation block
+        ScalingCase('inline-reference/open-citation', 1.0, lambda n: 'text [1,\n' * (n * 4) + '2]', _cleaner_run(InlineReferenceCleaner())),
+        ScalingCase('inline-reference/nested-brackets', 1.0, lambda n: '[1,' * (n * 4) + '\n', _cleaner_run(InlineReferenceCleaner())),
+        ScalingCase('noise/artifact-lines', 1.0, lambda n: ']12[\n...\nbody text line\n' * (n * 4), _cleaner_run(NoiseCleaner())),
+        ScalingCase('normalizer/fragments', 1.0, lambda n: 'a\n' * (n * 20), _normalize),
+    ]
+
+
+def _best_time(run: Callable[[str], Any], text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        run(text)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def _slope(sizes: list[int], seconds: list[float]) -> float:
+    '''
+    Least-squares slope of log(seconds) over log(size).
+    '''
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    num = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    den = sum((x - x_mean) ** 2 for x in xs)
+    return num / den
+
+
+def measure_case(case: ScalingCase, steps: int = 4, repeat: int = 3) -> dict[str, Any]:
+    '''
+    Times the case on doubling input sizes and fits the growth exponent.
+    '''
+    sizes = [case.base_size * 2 ** i for i in range(steps)]
+    seconds = [_best_time(case.run, case.make_input(n), repeat) for n in sizes]
+    slope = _slope(sizes, seconds)
+
+    return {
+        'name': case.name,
+        'bound': case.bound,
+        'sizes': sizes,
+        'seconds': seconds,
+        'slope': slope,
+        'ok': slope <= case.bound + TOLERANCE,
+    }
+
+
+def run_scaling(names: Optional[list[str]] = None, steps: int = 4, repeat: int = 3) -> list[dict[str, Any]]:
+    # Per-document logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+    try:
+        return [
+            measure_case(case, steps, repeat)
+            for case in build_cases()
+            if not names or any(case.name.startswith(name) for name in names)
+        ]
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m gre.bench.scaling',
+        description='Feeds every ingestion stage growing worst-case inputs and fails if runtime grows faster than its declared bound.'
+    )
+    parser.add_argument('cases', nargs='*', help='Only run cases whose name starts with one of these')
+    parser.add_argument('--steps', type=int, default=4, help='Number of input size doublings')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size, the best one counts')
+    args = parser.parse_args(argv)
+
+    rows = run_scaling(args.cases, args.steps, args.repeat)
+
+    print(f'{"case":<40} {"bound":>6} {"slope":>6} {"largest_s":>10} {"":>4}')
+    for row in rows:
+        status = 'ok' if row['ok'] else 'FAIL'
+        print(f'{row["name"]:<40} {row["bound"]:>6.2f} {row["slope"]:>6.2f} {row["seconds"][-1]:>10.4f} {status:>4}')
+
+    if not all(row['ok'] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import json
+import logging
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Optional
+
+from gre.bench.corpus import generate_corpus
+from gre.ingestion.batch_runner import BatchIngestionRunner
+from gre.ingestion.loader.backends import BACKENDS
+from gre.ingestion.loader.pdf_loader import PdfLoader
+from gre.ingestion.main import build_processor
+from gre.ingestion.metrics import MetricsReport
+from gre.ingestion.post.text_writer import TextWriter
+from gre.ingestion.processor import PdfIngestionProcessor
+
+
+DEFAULT_SIZES = [5, 50, 500]
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _quiet_processor(extractor_settings: dict[str, Any]) -> PdfIngestionProcessor:
+    # Keeps per-document logging off the terminal in every worker process
+    logging.disable(logging.WARNING)
+    return build_processor(extractor_settings)
+
+
+def _bench_size(size_dir: str, pages: int, workers: int, backend: str) -> dict[str, Any]:
+    '''
+    Ingests one size group. Runs in a fresh process so that peak RSS covers
+    this group only.
+    '''
+    extractor_settings = {'backend': backend}
+
+    with tempfile.TemporaryDirectory(prefix='gre-bench-') as tmp:
+        tmp_dir = Path(tmp)
+        metrics = MetricsReport(tmp_dir / 'metrics')
+        runner = BatchIngestionRunner(
+            loader=PdfLoader(Path(size_dir)),
+            processor=_quiet_processor(extractor_settings),
+            writer=TextWriter(tmp_dir / 'out'),
+            workers=workers,
+            processor_factory=partial(_quiet_processor, extractor_settings),
+            metrics=metrics
+        )
+
+        start_time = time.perf_counter()
+        results = runner.run()
+        duration = time.perf_counter() - start_time
+        summary = json.loads((metrics.run_dir / MetricsReport.SUMMARY_NAME).read_text(encoding='utf-8'))
+
+    docs = sum(1 for r in results if r.ok)
+    return {
+        'pages': pages,
+        'docs': docs,
+        'failed': len(results) - docs,
+        'seconds': duration,
+        'docs_per_sec': docs / duration if duration > 0 else 0.0,
+        'pages_per_sec': docs * pages / duration if duration > 0 else 0.0,
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF),
+        'peak_worker_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        'stages': summary['stages'],
+    }
+
+
+def run_benchmark(
+    corpus_dir: Path,
+    sizes: list[int],
+    docs_per_size: int = 1,
+    workers: int = 1,
+    backend: str = 'pdfplumber',
+    seed: int = 0
+) -> list[dict[str, Any]]:
+    '''
+    Generates the synthetic corpus (reused across runs) and runs the full
+    `BatchIngestionRunner` on every size group. Each row holds throughput,
+    peak RSS and the per-stage timing summary.
+    '''
+    corpus = generate_corpus(corpus_dir, sizes, docs_per_size, seed)
+    rows = []
+
+    for pages in sizes:
+        size_dir = corpus[pages][0].parent
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            rows.append(executor.submit(_bench_size, str(size_dir), pages, workers, backend).result())
+
+    return rows
+
+
+def _print_report(rows: list[dict[str, Any]]) -> None:
+    print(f'{"pages":>6} {"docs":>5} {"failed":>6} {"seconds":>9} {"docs/s":>8} {"pages/s":>8} {"rss_mb":>8} {"wrk_rss_mb":>10}')
+    for row in rows:
+        print(
+            f'{row["pages"]:>6} {row["docs"]:>5} {row["failed"]:>6} {row["seconds"]:>9.2f} {row["docs_per_sec"]:>8.2f} '
+            f'{row["pages_per_sec"]:>8.1f} {row["peak_rss_mb"]:>8.1f} {row["peak_worker_rss_mb"]:>10.1f}'
+        )
+
+    print()
+    print(f'{"stage":<28} {"pages":>6} {"p50":>9} {"p95":>9} {"max":>9} {"share":>6}')
+    for row in rows:
+        total = sum(stage['total'] for stage in row['stages'].values()) or 1.0
+        for name, stage in sorted(row['stages'].items(), key=lambda item: -item[1]['total']):
+            print(
+                f'{name:<28} {row["pages"]:>6} {stage["p50"]:>9.4f} {stage["p95"]:>9.4f} '
+                f'{stage["max"]:>9.4f} {stage["total"] / total:>6.1%}'
+            )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--corpus-dir',
+        type=Path,
+        default=Path(tempfile.gettempdir()) / 'gre-bench-corpus',
+        help='Where the synthetic PDFs are generated and reused'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Page counts to benchmark')
+    parser.add_argument('--docs', type=int, default=1, help='Documents per page count')
+    parser.add_argument('--workers', type=int, default=1, help='Ingestion worker processes')
+    parser.add_argument('--backend', default='pdfplumber', choices=list(BACKENDS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=Path, default=None, help='Also write the results to this JSON file')
+
+
+def run_from_args(args: argparse.Namespace) -> None:
+    rows = run_benchmark(args.corpus_dir, args.sizes, args.docs, args.workers, args.backend, args.seed)
+    _print_report(rows)
+    if args.json is not None:
+        args.json.write_text(json.dumps(rows, indent=2), encoding='utf-8')
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m gre bench',
+        description='End-to-end ingestion throughput on a synthetic review-article corpus.'
+    )
+    add_arguments(parser)
+    run_from_args(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class LLMProvider(ABC):
@@ -8,6 +9,11 @@ class LLMProvider(ABC):
         pass
 
 
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        '''Yields the response in pieces as it is generated; by default all at once.'''
+        yield await self.agenerate(prompt, **kwargs)
+
+
 class ResponseValidator(ABC):
     @abstractmethod
     def validate(self, response: str) -> bool:
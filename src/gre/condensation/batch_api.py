@@ -0,0 +1,180 @@
+import asyncio
+import json
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from gre.condensation.base import LLMProvider
+from gre.logger.logger import get_logger
+
+
+CHAT_ENDPOINT = '/v1/chat/completions'
+COMPLETED = 'completed'
+# Terminal batch states besides `completed`; anything else is still running
+FAILED_STATES = ('failed', 'expired', 'cancelled')
+
+
+def request_record(custom_id: str, model: str, prompt: str, **kwargs) -> Dict[str, Any]:
+    '''
+    One line of a batch input file, in the OpenAI batch format other batch
+    endpoints also accept.
+    '''
+    return {
+        'custom_id': custom_id,
+        'method': 'POST',
+        'url': CHAT_ENDPOINT,
+        'body': {'model': model, 'messages': [{'role': 'user', 'content': prompt}], **kwargs},
+    }
+
+
+def parse_result(record: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+    '''
+    Reads one line of a batch output file as (custom_id, content, error).
+    '''
+    custom_id = record.get('custom_id', '')
+    if record.get('error'):
+        return custom_id, None, json.dumps(record['error'])
+
+    response = record.get('response') or {}
+    if response.get('status_code') != 200:
+        return custom_id, None, f'status_code={response.get("status_code")}'
+    try:
+        return custom_id, response['body']['choices'][0]['message']['content'], None
+    except (KeyError, IndexError, TypeError):
+        return custom_id, None, 'malformed response body'
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class BatchClient(ABC):
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+
+    @abstractmethod
+    async def asubmit(self, requests_path: Path) -> str:
+        '''Submits a batch input file and returns the batch id.'''
+        pass
+
+
+    @abstractmethod
+    async def astatus(self, batch_id: str) -> str:
+        '''Returns the provider status of the batch, `completed` once results are available.'''
+        pass
+
+
+    @abstractmethod
+    async def aresults(self, batch_id: str) -> List[Dict[str, Any]]:
+        '''Returns the lines of the batch output file.'''
+        pass
+
+
+class LocalBatchClient(BatchClient):
+    '''
+    Stand-in for a provider batch endpoint: a submitted input file is
+    answered right away through `llm`, one live request per line, and the
+    output file is written in the provider format under `work_dir`.
+    '''
+
+    def __init__(self, model: str, work_dir: Path, llm: Optional[LLMProvider] = None) -> None:
+        super().__init__(model)
+        self.work_dir = work_dir
+        self.llm = llm
+        self.logger = get_logger(self.__class__.__name__)
+
+
+    async def asubmit(self, requests_path: Path) -> str:
+        batch_id = f'local_{uuid.uuid4().hex}'
+        batch_dir = self.work_dir / batch_id
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(requests_path, batch_dir / 'input.jsonl')
+
+        # Without an LLM the batch stays pending until output.jsonl is put in place
+        if self.llm is not None:
+            records = list(read_jsonl(batch_dir / 'input.jsonl'))
+            results = await asyncio.gather(*(self._arun(record) for record in records))
+            tmp_path = batch_dir / 'output.jsonl.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for result in results:
+                    f.write(json.dumps(result) + '\n')
+            tmp_path.replace(batch_dir / 'output.jsonl')
+        return batch_id
+
+
+    async def _arun(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        body = dict(record['body'])
+        prompt = body.pop('messages')[-1]['content']
+        body.pop('model', None)
+        try:
+            content = await self.llm.agenerate(prompt, **body)
+        except Exception as e:
+            self.logger.error('Local batch request failed | custom_id=%s | error=%s', record['custom_id'], e)
+            return {'custom_id': record['custom_id'], 'response': None, 'error': {'message': str(e)}}
+        return {
+            'custom_id': record['custom_id'],
+            'response': {'status_code': 200, 'body': {'choices': [{'message': {'role': 'assistant', 'content': content}}]}},
+            'error': None,
+        }
+
+
+    async def astatus(self, batch_id: str) -> str:
+        return COMPLETED if (self.work_dir / batch_id / 'output.jsonl').exists() else 'in_progress'
+
+
+    async def aresults(self, batch_id: str) -> List[Dict[str, Any]]:
+        return list(read_jsonl(self.work_dir / batch_id / 'output.jsonl'))
+
+
+class LiteLLMBatchClient(BatchClient):
+    '''
+    Provider batch endpoint through litellm's OpenAI-compatible file and
+    batch API. Results are available within `completion_window`.
+    '''
+
+    def __init__(self, model: str, provider: str = 'openai', completion_window: str = '24h') -> None:
+        super().__init__(model)
+        self.provider = provider
+        self.completion_window = completion_window
+        self.logger = get_logger(self.__class__.__name__)
+
+
+    async def asubmit(self, requests_path: Path) -> str:
+        import litellm
+
+        with open(requests_path, 'rb') as f:
+            uploaded = await litellm.acreate_file(file=f, purpose='batch', custom_llm_provider=self.provider)
+        batch = await litellm.acreate_batch(
+            completion_window=self.completion_window,
+            endpoint=CHAT_ENDPOINT,
+            input_file_id=uploaded.id,
+            custom_llm_provider=self.provider
+        )
+        return batch.id
+
+
+    async def astatus(self, batch_id: str) -> str:
+        import litellm
+
+        batch = await litellm.aretrieve_batch(batch_id=batch_id, custom_llm_provider=self.provider)
+        return batch.status
+
+
+    async def aresults(self, batch_id: str) -> List[Dict[str, Any]]:
+        import litellm
+
+        batch = await litellm.aretrieve_batch(batch_id=batch_id, custom_llm_provider=self.provider)
+        records = []
+        # Requests that failed validation on the provider side end up in the error file
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await litellm.afile_content(file_id=file_id, custom_llm_provider=self.provider)
+            records.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+        return records
@@ -1,14 +1,59 @@
+import hashlib
+import json
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Optional, List
-from gre.logger.logger import get_logger
-from gre.condensation.pipeline import ReviewCondensationPipeline
+from typing import Dict, List, Optional, Tuple
+from gre.logger.logger import document_context, get_logger
+from gre.condensation.pipeline import GENERATION_KWARGS, ReviewCondensationPipeline
+from gre.condensation.batch_api import COMPLETED, FAILED_STATES, BatchClient, parse_result, request_record
+from gre.condensation.response_cache import ResponseCache
+from gre.condensation.scheduler import AdmissionScheduler
+from gre.workqueue.journal import DONE, FAILED, IN_FLIGHT, RunJournal, write_atomic
+from gre.workqueue.lease import CLAIMED, LeaseQueue
+
+
+JOURNAL_NAME = '.condensation_journal.jsonl'
+# Compacted inputs of a submitted batch, below the batch directory
+BATCH_INPUTS_DIR = 'inputs'
 
 
 import asyncio
 
 class BatchCondensationProcessor:
-    def __init__(self, pipeline: ReviewCondensationPipeline):
+    def __init__(
+        self,
+        pipeline: ReviewCondensationPipeline,
+        queue: Optional[LeaseQueue] = None,
+        concurrency: int = 8,
+        scheduler: Optional[AdmissionScheduler] = None,
+        report_interval: float = 30.0,
+        response_cache: Optional[ResponseCache] = None,
+        resume: bool = False,
+        model: Optional[str] = None,
+        max_attempts: int = 3
+    ):
+        '''
+        With a shared `queue`, files are claimed one at a time by `concurrency`
+        tasks, so processors on several hosts can split one input directory.
+        `concurrency` bounds the files in flight in every mode.
+        The `scheduler` the pipeline's LLM requests go through is reported
+        every `report_interval` seconds while a batch runs; the hit rate of
+        the `response_cache` is reported at the end.
+        Document states are journaled in the output directory; with `resume`,
+        files that finished in an earlier run with the same input, pipeline
+        settings and `model` are not scheduled again. Batch submits give up
+        on a file that failed `max_attempts` times with the same input.
+        '''
         self.pipeline = pipeline
+        self.queue = queue
+        self.concurrency = concurrency
+        self.scheduler = scheduler
+        self.report_interval = report_interval
+        self.response_cache = response_cache
+        self.resume = resume
+        self.model = model
+        self.max_attempts = max_attempts
+        self.journal: Optional[RunJournal] = None
         self.logger = get_logger(self.__class__.__name__)
 
 
@@ -29,26 +74,350 @@ class BatchCondensationProcessor:
         files = list(input_path.glob('*.txt'))
         self.logger.info(f'Found {len(files)} files to process in {input_path}')
 
-        # We can process files in parallel using gather, or with a semaphore to limit concurrency if needed.
-        # GraphRag config has 'concurrent_requests', but that's per LLM instance usually.
-        # Let's process them concurrently.
-        tasks = [self._aprocess_single_file(file_path, output_path) for file_path in files]
-        await asyncio.gather(*tasks)
+        with self._journaled(output_path):
+            if self.resume:
+                files = [file_path for file_path in files if not self._is_finished(file_path, output_path)]
+                self.logger.info(f'Resuming: {len(files)} unfinished files left')
+            self.journal.record_pending(file_path.name for file_path in files)
+
+            async with self._reporting():
+                if self.queue is not None:
+                    await self._aprocess_claimed(files, output_path)
+                    return
 
+                # `concurrency` workers share one iterator, so only that many files are
+                # read and held in memory at a time
+                pending = iter(files)
 
-    async def _aprocess_single_file(self, file_path: Path, output_path: Path) -> None:
+                async def worker() -> None:
+                    for file_path in pending:
+                        await self._aprocess_single_file(file_path, output_path)
+
+                await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+
+    @contextmanager
+    def _journaled(self, output_path: Path):
+        self.journal = RunJournal(output_path / JOURNAL_NAME)
         try:
-            self.logger.info(f'Processing file: {file_path.name}')
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            yield self.journal
+        finally:
+            self.journal.close()
+            self.journal = None
 
-            condensed_content = await self.pipeline.arun(content)
 
-            output_file = output_path / f'condensed_{file_path.name}'
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(condensed_content)
+    def _is_finished(self, file_path: Path, output_path: Path) -> bool:
+        # A changed input or prompt makes a finished file unfinished again
+        return (
+            (output_path / f'condensed_{file_path.name}').exists()
+            and self.journal.is_done(file_path.name, self._token(file_path))
+        )
 
-            self.logger.info(f'Saved condensed file to: {output_file}')
 
-        except Exception as e:
-            self.logger.error(f'Error processing file {file_path.name}: {e}')
+    @asynccontextmanager
+    async def _reporting(self):
+        reporter = None
+        if self.scheduler is not None:
+            reporter = asyncio.create_task(self.scheduler.areport(self.report_interval))
+        try:
+            yield
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+                self.scheduler.log_stats('Admission finished')
+            if self.response_cache is not None:
+                self.response_cache.log_stats()
+
+
+    async def _aprocess_claimed(self, files: List[Path], output_path: Path) -> None:
+        assert self.queue is not None
+        tokens = {file_path: self._token(file_path) for file_path in files}
+        claims = self.queue.claim_all(files, lambda file_path: file_path.stem, tokens.__getitem__)
+        # The claim iterator may sleep while waiting on other hosts, so it is
+        # advanced in a thread, one task at a time.
+        lock = asyncio.Lock()
+
+        async def worker() -> None:
+            while True:
+                async with lock:
+                    file_path = await asyncio.to_thread(next, claims, None)
+                if file_path is None:
+                    return
+                ok = await self._aprocess_single_file(file_path, output_path)
+                self.queue.complete(file_path.stem, tokens[file_path], ok=ok)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            self.queue.close()
+
+
+    async def asubmit_batch(self, input_dir: str, batch_dir: str, output_dir: str, client: BatchClient) -> Optional[str]:
+        '''
+        Writes the condensation prompts for the text files in the input
+        directory that have no current output in `output_dir` to
+        `requests.jsonl` in `batch_dir` and submits it. That covers new and
+        changed inputs as well as files an earlier batch failed, up to
+        `max_attempts` tries. The batch is recorded in `batch.json` for
+        `acollect_batch`.
+        '''
+        input_path = Path(input_dir)
+        batch_path = Path(batch_dir)
+        output_path = Path(output_dir)
+        state_file = batch_path / 'batch.json'
+
+        if state_file.exists():
+            state = json.loads(state_file.read_text(encoding='utf-8'))
+            if not state.get('collected'):
+                self.logger.error(f'Batch {state["batch_id"]} has not been collected yet; not submitting another')
+                return None
+
+        output_path.mkdir(parents=True, exist_ok=True)
+        with self._journaled(output_path):
+            files = self._batch_candidates(sorted(input_path.glob('*.txt')), output_path)
+            batch_id, counts, tokens = await self._asubmit_files(files, batch_path, client)
+            if batch_id is None:
+                self.logger.warning(f'No files to submit from {input_path}')
+                return None
+            # Each submit is one attempt, so a file that keeps failing is given up on
+            await asyncio.to_thread(self.journal.record_many, ((name, IN_FLIGHT, tokens[name], None) for name in counts))
+
+        state = {'batch_id': batch_id, 'input_dir': str(input_path), 'files': counts, 'tokens': tokens, 'collected': False, 'failed': []}
+        write_atomic(state_file, json.dumps(state, indent=2))
+        self.logger.info(f'Submitted batch {batch_id} with {sum(counts.values())} requests for {len(counts)} files')
+        return batch_id
+
+
+    def _batch_candidates(self, files: List[Path], output_path: Path) -> List[Path]:
+        candidates = []
+        for file_path in files:
+            if self._is_finished(file_path, output_path):
+                continue
+            entry = self.journal.entries.get(file_path.name)
+            if (
+                entry is not None and entry.state == FAILED
+                and entry.attempts >= self.max_attempts and entry.token == self._token(file_path)
+            ):
+                self.logger.warning(f'Giving up on {file_path.name} after {entry.attempts} failed attempts: {entry.error}')
+                continue
+            candidates.append(file_path)
+        return candidates
+
+
+    async def _asubmit_files(
+        self,
+        files: List[Path],
+        batch_path: Path,
+        client: BatchClient
+    ) -> Tuple[Optional[str], Dict[str, int], Dict[str, str]]:
+        inputs_path = batch_path / BATCH_INPUTS_DIR
+        inputs_path.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        tokens = {}
+        requests_file = batch_path / 'requests.jsonl'
+        tmp_file = requests_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for file_path in files:
+                input_text = self.pipeline.prepare(file_path.read_text(encoding='utf-8'))
+                prompts = self.pipeline.batch_prompts(input_text)
+                if not prompts:
+                    self.logger.warning(f'Skipping empty file: {file_path.name}')
+                    continue
+                # Collect finishes from the same compacted text instead of compacting again
+                write_atomic(inputs_path / file_path.name, input_text)
+                counts[file_path.name] = len(prompts)
+                tokens[file_path.name] = self._token(file_path)
+                for i, prompt in enumerate(prompts):
+                    record = request_record(self._custom_id(file_path.name, i), client.model, prompt, **GENERATION_KWARGS)
+                    f.write(json.dumps(record) + '\n')
+        tmp_file.replace(requests_file)
+        if not counts:
+            return None, counts, tokens
+        return await client.asubmit(requests_file), counts, tokens
+
+
+    async def acollect_batch(self, batch_dir: str, output_dir: str, client: BatchClient) -> bool:
+        '''
+        Writes the outputs of the batch recorded in `batch_dir` once the
+        provider has finished it. Returns False while it is still running.
+        Files whose requests failed or are missing from the results are
+        recorded as `failed` in `batch.json` and the journal, so the next
+        submit retries them; a batch the provider failed, expired or cancelled
+        fails all of its files.
+        '''
+        state_file = Path(batch_dir) / 'batch.json'
+        if not state_file.exists():
+            self.logger.error(f'No submitted batch found in {batch_dir}')
+            return False
+        state = json.loads(state_file.read_text(encoding='utf-8'))
+        if state.get('collected'):
+            self.logger.info(f'Batch {state["batch_id"]} has already been collected')
+            return True
+
+        status = await client.astatus(state['batch_id'])
+        if status in FAILED_STATES:
+            self.logger.error(f'Batch {state["batch_id"]} ended with status {status}; all {len(state["files"])} files failed')
+            # The batch is settled, so the next submit must not wait for it
+            state['collected'] = True
+            state['failed'] = list(state['files'])
+            await asyncio.to_thread(self._record_collected, state, output_dir, {name: f'batch {status}' for name in state['failed']})
+            write_atomic(state_file, json.dumps(state, indent=2))
+            return False
+        if status != COMPLETED:
+            self.logger.info(f'Batch {state["batch_id"]} is not finished yet (status {status})')
+            return False
+
+        responses = {}
+        for record in await client.aresults(state['batch_id']):
+            custom_id, content, error = parse_result(record)
+            if error is not None:
+                self.logger.error(f'Batch request {custom_id} failed: {error}')
+                continue
+            responses[custom_id] = content
+
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        inputs_path = Path(batch_dir) / BATCH_INPUTS_DIR
+
+        names = list(state['files'])
+        async with self._reporting():
+            tasks = [
+                self._acollect_file(inputs_path / name, output_path, [responses.get(self._custom_id(name, i)) for i in range(state['files'][name])])
+                for name in names
+            ]
+            errors = await asyncio.gather(*tasks)
+
+        state['collected'] = True
+        state['failed'] = [name for name, error in zip(names, errors) if error is not None]
+        await asyncio.to_thread(self._record_collected, state, output_dir, dict(zip(names, errors)))
+        write_atomic(state_file, json.dumps(state, indent=2))
+        self.logger.info(f'Collected batch {state["batch_id"]}: {len(names) - len(state["failed"])} of {len(names)} files written')
+        if state['failed']:
+            self.logger.warning(f'{len(state["failed"])} files failed; the next submit retries them')
+        return True
+
+
+    def _record_collected(self, state: dict, output_dir: str, errors: Dict[str, Optional[str]]) -> None:
+        tokens = state.get('tokens', {})
+        with self._journaled(Path(output_dir)):
+            self.journal.record_many(
+                (name, FAILED if error is not None else DONE, tokens.get(name), error)
+                for name, error in errors.items()
+            )
+
+
+    @staticmethod
+    def _custom_id(name: str, index: int) -> str:
+        return f'{name}#{index}'
+
+
+    async def _acollect_file(self, file_path: Path, output_path: Path, responses: List[Optional[str]]) -> Optional[str]:
+        '''
+        Returns the error that kept the output from being written, if any.
+        '''
+        with document_context(file_path.name):
+            if any(response is None for response in responses):
+                self.logger.error('Missing batch results')
+                return 'missing batch results'
+            try:
+                condensed_content = await self.pipeline.afinish(file_path.read_text(encoding='utf-8'), responses)
+                output_file = output_path / f'condensed_{file_path.name}'
+                write_atomic(output_file, condensed_content)
+                self.logger.info(f'Saved condensed file to: {output_file}')
+                return None
+            except Exception as e:
+                self.logger.error(f'Error processing file: {e}')
+                return str(e)
+
+
+    async def aprocess_queue(self, files: 'asyncio.Queue[Optional[Path]]', output_dir: str) -> None:
+        '''
+        Condenses text files as they arrive on `files` until a `None` sentinel is
+        received, with `concurrency` files in flight.
+        '''
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        async def worker() -> None:
+            while True:
+                file_path = await files.get()
+                if file_path is None:
+                    # Hand the sentinel on to the next worker
+                    await files.put(None)
+                    return
+                if self.resume and self._is_finished(file_path, output_path):
+                    self.logger.info(f'Skipping file finished in an earlier run: {file_path.name}')
+                    continue
+                await asyncio.to_thread(self.journal.record_pending, [file_path.name])
+                await self._aprocess_claimed_file(file_path, output_path)
+
+        try:
+            with self._journaled(output_path):
+                async with self._reporting():
+                    await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            if self.queue is not None:
+                self.queue.close()
+
+
+    async def _aprocess_claimed_file(self, file_path: Path, output_path: Path) -> None:
+        if self.queue is None:
+            await self._aprocess_single_file(file_path, output_path)
+            return
+
+        token = self._token(file_path)
+        if self.queue.claim(file_path.stem, token) != CLAIMED:
+            self.logger.info(f'Skipping file handled by another worker: {file_path.name}')
+            return
+        ok = await self._aprocess_single_file(file_path, output_path)
+        self.queue.complete(file_path.stem, token, ok=ok)
+
+
+    def _token(self, file_path: Path) -> str:
+        # The same input text condensed with the same settings and model is the same work
+        digest = hashlib.sha256(file_path.read_bytes())
+        digest.update(self.pipeline.fingerprint().encode('utf-8'))
+        digest.update((self.model or '').encode('utf-8'))
+        return digest.hexdigest()
+
+
+    async def _aprocess_single_file(self, file_path: Path, output_path: Path) -> bool:
+        # Each file runs in its own task, so the context only tags this file's records
+        with document_context(file_path.name):
+            token = self._token(file_path) if self.journal is not None else None
+            # Journal writes fsync, so they run in a thread instead of stalling the other documents
+            await self._arecord(file_path.name, IN_FLIGHT, token)
+            try:
+                await self._aprocess_file(file_path, output_path)
+            except Exception as e:
+                self.logger.error(f'Error processing file: {e}')
+                await self._arecord(file_path.name, FAILED, token, error=str(e))
+                return False
+            await self._arecord(file_path.name, DONE, token)
+            return True
+
+
+    async def _arecord(self, name: str, state: str, token: Optional[str], error: Optional[str] = None) -> None:
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.record, name, state, token, error)
+
+
+    async def _aprocess_file(self, file_path: Path, output_path: Path) -> None:
+        output_file = output_path / f'condensed_{file_path.name}'
+        # A streamed response is saved section by section, so progress is visible before it completes
+        partial_file = output_file.with_name(f'{output_file.name}.partial')
+        self.logger.info('Processing file')
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        def write_partial(text: str) -> None:
+            write_atomic(partial_file, text)
+
+        try:
+            condensed_content = await self.pipeline.arun(content, on_partial=write_partial)
+            # A crash mid-write must not leave a truncated output that looks finished
+            write_atomic(output_file, condensed_content)
+        finally:
+            partial_file.unlink(missing_ok=True)
+
+        self.logger.info(f'Saved condensed file to: {output_file}')
@@ -0,0 +1,67 @@
+import re
+from typing import Iterator, List
+
+from gre.condensation.scheduler import CHARS_PER_TOKEN, estimate_tokens
+
+
+# Numbered headings ("2. Related Work", "3.1 Datasets") and short all-caps lines
+HEADING_RE = re.compile(r'^(?:\d+(?:\.\d+)*\.?\s+[A-Z][^\n]{0,80}|[A-Z][A-Z0-9 ,&:/-]{3,60})$', re.MULTILINE)
+PARAGRAPH_RE = re.compile(r'\n\s*\n')
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _sections(text: str) -> List[str]:
+    starts = [m.start() for m in HEADING_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(text)]
+    return [text[bounds[i]:bounds[i + 1]] for i in range(len(starts)) if text[bounds[i]:bounds[i + 1]].strip()]
+
+
+def _hard_split(text: str, max_tokens: int) -> Iterator[str]:
+    size = max_tokens * CHARS_PER_TOKEN
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def _units(text: str, max_tokens: int) -> Iterator[str]:
+    '''
+    Pieces of at most `max_tokens`, cut at the coarsest boundary that fits:
+    sections, then paragraphs, then sentences, then plain character runs.
+    '''
+    for section in _sections(text):
+        if estimate_tokens(section) <= max_tokens:
+            yield section
+            continue
+        for paragraph in PARAGRAPH_RE.split(section):
+            if estimate_tokens(paragraph) <= max_tokens:
+                yield paragraph + '\n\n'
+                continue
+            for sentence in SENTENCE_RE.split(paragraph):
+                if estimate_tokens(sentence) <= max_tokens:
+                    yield sentence + ' '
+                else:
+                    yield from _hard_split(sentence, max_tokens)
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    '''
+    Splits `text` into chunks of at most `max_tokens` estimated tokens. Whole
+    sections are kept together where they fit, and units are packed greedily
+    in document order.
+    '''
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for unit in _units(text, max_tokens):
+        tokens = estimate_tokens(unit)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(''.join(current).strip())
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(''.join(current).strip())
+    return [chunk for chunk in chunks if chunk]
@@ -0,0 +1,155 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from gre.condensation.chunking import HEADING_RE
+from gre.condensation.scheduler import estimate_tokens
+from gre.logger.logger import EventCounter, get_logger
+
+
+# Section numbering in front of a heading: "7.", "7.2", "A.", "IV."
+HEADING_NUMBER_RE = re.compile(r'^(?:\d+(?:\.\d+)*\.?|[A-Z]\.\d*|[IVX]+\.)\s*')
+# Caption openers: "Figure 3.", "Fig. 3:", "Table 2." (body text like "Table 2 shows" is kept)
+CAPTION_RE = re.compile(r'^\s*(?:Fig\.|Figure|Table|Tab\.)\s*[A-Z]?\d+(?:\.\d+)?\s*[.:|]', re.IGNORECASE)
+MAX_HEADING_CHARS = 80
+MAX_HEADING_WORDS = 8
+MAX_CAPTION_LINES = 5
+# Lowercase words allowed inside a Title Case heading ("Limitations of the Study")
+MINOR_WORDS = {'a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'in', 'of', 'on', 'or', 'the', 'to', 'vs', 'with'}
+TERMINAL_PUNCTUATION = ('.', '!', '?', ';', ',')
+
+
+def is_heading(line: str) -> bool:
+    '''
+    Whether `line` looks like a section heading: short, no sentence ending,
+    and numbered, ALL CAPS or Title Case.
+    '''
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADING_CHARS or stripped.endswith(TERMINAL_PUNCTUATION):
+        return False
+    if HEADING_RE.fullmatch(stripped):
+        return True
+
+    words = HEADING_NUMBER_RE.sub('', stripped).rstrip(':').split()
+    if not words or len(words) > MAX_HEADING_WORDS or not words[0][0].isupper():
+        return False
+    return all(word[0].isupper() or not word[0].isalpha() or word.lower() in MINOR_WORDS for word in words)
+
+
+@dataclass
+class SectionRule:
+    '''
+    `heading` is matched (case-insensitively, in full) against heading lines
+    without their numbering. `drop` removes the section, `truncate` keeps its
+    heading and the first `max_chars` characters of its body. A section ends
+    at the next heading, or with `to_end` only at the end of the document.
+    '''
+    heading: str
+    action: str = 'drop'
+    max_chars: int = 0
+    to_end: bool = False
+
+    def __post_init__(self) -> None:
+        if self.action not in ('drop', 'truncate'):
+            raise ValueError(f'Unknown compaction action: {self.action}')
+        self.regex = re.compile(self.heading, re.IGNORECASE)
+
+
+DEFAULT_RULES = [
+    SectionRule(r'acknowledge?ments?'),
+    SectionRule(r'funding(?: sources?| information)?'),
+    SectionRule(r'(?:declaration of )?(?:competing interests?|conflicts? of interest)'),
+    SectionRule(r'credit authorship contribution statement|authors?\'? contributions?'),
+    SectionRule(r'data availability(?: statement)?'),
+    SectionRule(r'(?:appendix|appendices)(?: [A-Z0-9]+)?(?:[.:].*)?', to_end=True),
+    SectionRule(r'supplementary (?:material|data|information)', action='truncate', max_chars=300),
+    SectionRule(r'(?:author )?biograph(?:y|ies)|about the authors?', to_end=True),
+]
+
+
+def rules_from_config(entries: Optional[Iterable[Dict[str, Any]]]) -> List[SectionRule]:
+    if entries is None:
+        return list(DEFAULT_RULES)
+    return [SectionRule(**entry) for entry in entries]
+
+
+class TextCompactor:
+    '''
+    Deterministic pre-prompt compaction: drops or shortens low-value sections
+    matched by `rules` and, with `drop_captions`, figure and table captions.
+    Token savings are logged per document.
+    '''
+
+    def __init__(self, rules: Optional[List[SectionRule]] = None, drop_captions: bool = True) -> None:
+        self.rules = rules if rules is not None else list(DEFAULT_RULES)
+        self.drop_captions = drop_captions
+        self.logger = get_logger(self.__class__.__name__)
+
+
+    def _match_rule(self, line: str) -> Optional[SectionRule]:
+        stripped = line.strip()
+        if not stripped or len(stripped) > MAX_HEADING_CHARS:
+            return None
+        name = HEADING_NUMBER_RE.sub('', stripped).rstrip(' .:')
+        for rule in self.rules:
+            if rule.regex.fullmatch(name):
+                return rule
+        return None
+
+
+    def compact(self, text: str) -> str:
+        lines = text.split('\n')
+        kept: List[str] = []
+        events = EventCounter()
+
+        rule: Optional[SectionRule] = None
+        budget = 0
+        caption_lines = 0
+        caption_open = False
+
+        for line in lines:
+            matched = self._match_rule(line)
+            if matched is not None:
+                rule = matched
+                budget = rule.max_chars
+                events.add(rule.action)
+                if rule.action == 'truncate':
+                    kept.append(line)
+                continue
+
+            if rule is not None and not rule.to_end and is_heading(line):
+                rule = None
+
+            if rule is not None:
+                if rule.action == 'truncate' and budget > 0:
+                    kept.append(line[:budget])
+                    budget -= len(line) + 1
+                continue
+
+            if self.drop_captions:
+                if CAPTION_RE.match(line):
+                    caption_lines = MAX_CAPTION_LINES
+                    caption_open = not line.rstrip().endswith(TERMINAL_PUNCTUATION)
+                    events.add('caption')
+                    continue
+                # Only a wrapped caption continues on the next line: the caption line
+                # has no sentence ending and the next one does not start a sentence
+                stripped = line.strip()
+                if caption_open and caption_lines and stripped and not stripped[0].isupper():
+                    caption_lines -= 1
+                    caption_open = not stripped.endswith(TERMINAL_PUNCTUATION)
+                    continue
+                caption_open = False
+
+            kept.append(line)
+
+        compacted = '\n'.join(kept)
+        before, after = estimate_tokens(text), estimate_tokens(compacted)
+        events.log(self.logger, 'Compaction rules applied')
+        self.logger.info(
+            'Text compacted | tokens_before=%d | tokens_after=%d | tokens_saved=%d',
+            before,
+            after,
+            before - after
+        )
+        return compacted
@@ -0,0 +1,90 @@
+import asyncio
+import concurrent.futures
+import threading
+from pathlib import Path
+from typing import Optional
+
+from gre.condensation.batch_processor import BatchCondensationProcessor
+from gre.logger.logger import get_logger
+
+
+class CondensationHandoff:
+    '''
+    Runs the condensation side on its own event loop thread and feeds it
+    cleaned text files through a bounded `asyncio.Queue`, so LLM calls start
+    as soon as the first document is ingested. `submit` blocks while the queue
+    is full, which holds ingestion back when the LLM side is the slower one.
+
+    Ingestion keeps the main thread, so the SIGALRM-based cleaner time limit
+    stays active in sequential mode.
+    '''
+
+    # Seconds between checks that the condensation thread is still alive while `submit` waits
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, processor: BatchCondensationProcessor, output_dir: str, maxsize: int = 16) -> None:
+        self.processor = processor
+        self.output_dir = output_dir
+        self.maxsize = maxsize
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._files: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name='condensation', daemon=True)
+        self._submitted = 0
+
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+        self.logger.info('Condensation handoff started | queue_size=%d', self.maxsize)
+
+
+    def submit(self, text_path: Optional[Path]) -> None:
+        '''
+        Queues a cleaned text file for condensation; `None` ends the stream.
+        Raises `RuntimeError` if the condensation thread dies while waiting.
+        '''
+        assert self._loop is not None and self._files is not None
+        if not self._thread.is_alive():
+            raise RuntimeError('Condensation handoff is not running')
+        future = asyncio.run_coroutine_threadsafe(self._files.put(text_path), self._loop)
+        while True:
+            try:
+                future.result(timeout=self.POLL_INTERVAL)
+                break
+            except concurrent.futures.CancelledError:
+                # The loop cancels the pending put when it shuts down
+                raise RuntimeError('Condensation handoff stopped while queueing a file')
+            except concurrent.futures.TimeoutError:
+                # A dead loop never drains the queue, so the put would wait forever
+                if not self._thread.is_alive():
+                    future.cancel()
+                    raise RuntimeError('Condensation handoff stopped while queueing a file')
+        if text_path is not None:
+            self._submitted += 1
+
+
+    def close(self) -> None:
+        '''
+        Ends the stream and waits until every queued file is condensed.
+        '''
+        if self._thread.is_alive():
+            try:
+                self.submit(None)
+            except RuntimeError as e:
+                self.logger.error('Condensation handoff ended early | error=%s', e)
+            self._thread.join()
+        self.logger.info('Condensation handoff finished | files=%d', self._submitted)
+
+
+    def _run_loop(self) -> None:
+        asyncio.run(self._amain())
+
+
+    async def _amain(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._files = asyncio.Queue(maxsize=self.maxsize)
+        self._ready.set()
+        await self.processor.aprocess_queue(self._files, self.output_dir)
@@ -1,5 +1,6 @@
 import argparse
 from pathlib import Path
+from typing import Any, Optional
 
 from gre.logger.logger import get_logger
 from gre.condensation.providers import GraphRagLLMProvider
@@ -7,6 +8,12 @@ from gre.config.llm_config import LLMConfigLoader
 from gre.condensation.validators import ReviewArticleValidator
 from gre.condensation.pipeline import ReviewCondensationPipeline
 from gre.condensation.batch_processor import BatchCondensationProcessor
+from gre.condensation.scheduler import AdmissionScheduler, ScheduledLLMProvider
+from gre.condensation.response_cache import CachedLLMProvider, ResponseCache
+from gre.condensation.compaction import TextCompactor, rules_from_config
+from gre.condensation.streaming import StreamLimits
+from gre.condensation.batch_api import BatchClient, LiteLLMBatchClient, LocalBatchClient
+from gre.workqueue.lease import LeaseQueue
 
 
 logger = get_logger(__name__)
@@ -14,26 +21,156 @@ logger = get_logger(__name__)
 
 import asyncio
 
-def run(input_dir: str, output_dir: str, prompt_path: str):
-    asyncio.run(amain(input_dir, output_dir, prompt_path))
+def run(
+    input_dir: str,
+    output_dir: str,
+    prompt_path: str,
+    queue_dir: Optional[str] = None,
+    lease_ttl: float = 300.0,
+    completion_tokens: int = 1024,
+    response_cache_path: Optional[str] = None,
+    response_cache_max_mb: float = 512,
+    chunk_tokens: Optional[int] = None,
+    reduce_prompt_path: str = 'prompts/review_reduce.txt',
+    compaction: Optional[dict[str, Any]] = None,
+    repair_prompt_path: Optional[str] = None,
+    streaming: Optional[dict[str, Any]] = None,
+    resume: bool = False
+):
+    asyncio.run(amain(
+        input_dir, output_dir, prompt_path, queue_dir, lease_ttl, completion_tokens, response_cache_path, response_cache_max_mb,
+        chunk_tokens, reduce_prompt_path, compaction, repair_prompt_path, streaming, resume
+    ))
 
-async def amain(input_dir: str, output_dir: str, prompt_path: str):
+def build_processor(
+    prompt_path: str,
+    queue_dir: Optional[str] = None,
+    lease_ttl: float = 300.0,
+    completion_tokens: int = 1024,
+    response_cache_path: Optional[str] = None,
+    response_cache_max_mb: float = 512,
+    chunk_tokens: Optional[int] = None,
+    reduce_prompt_path: str = 'prompts/review_reduce.txt',
+    compaction: Optional[dict[str, Any]] = None,
+    repair_prompt_path: Optional[str] = None,
+    streaming: Optional[dict[str, Any]] = None,
+    resume: bool = False,
+    max_attempts: int = 3
+) -> BatchCondensationProcessor:
+    '''
+    `compaction` holds the `condensation.compaction` settings: `enabled`,
+    `drop_captions` and optional `rules` replacing the default section rules.
+    `streaming` holds `condensation.streaming`: `enabled` and the `StreamLimits`.
+    '''
+    config_loader = LLMConfigLoader() # Keeps loading LLM settings from settings.yaml
+    llm_config = config_loader.get_llm_config()
+    
+    # Requests are admitted under the model's RPM/TPM limits instead of being
+    # fired all at once and retried on 429s
+    scheduler = AdmissionScheduler(
+        requests_per_minute=llm_config.requests_per_minute,
+        tokens_per_minute=llm_config.tokens_per_minute,
+        max_in_flight=llm_config.concurrent_requests
+    )
+    llm_provider = ScheduledLLMProvider(GraphRagLLMProvider(config=llm_config), scheduler, completion_tokens)
+
+    # Identical requests from earlier runs are answered from disk, before admission
+    response_cache = None
+    if response_cache_path:
+        response_cache = ResponseCache(Path(response_cache_path), int(response_cache_max_mb * 1024 * 1024))
+        llm_provider = CachedLLMProvider(llm_provider, response_cache, llm_config.model)
+    validator = ReviewArticleValidator()
+
+    compactor = None
+    if compaction and compaction.get('enabled', True):
+        compactor = TextCompactor(rules_from_config(compaction.get('rules')), compaction.get('drop_captions', True))
+
+    stream_limits = None
+    if streaming and streaming.get('enabled', True):
+        stream_limits = StreamLimits(**{key: value for key, value in streaming.items() if key != 'enabled'})
+    
+    pipeline = ReviewCondensationPipeline(
+        llm=llm_provider, 
+        validator=validator,
+        prompt_path=prompt_path,
+        chunk_tokens=chunk_tokens,
+        reduce_prompt_path=reduce_prompt_path,
+        compactor=compactor,
+        repair_prompt_path=repair_prompt_path,
+        stream_limits=stream_limits
+    )
+    
+    # With a shared queue dir, hosts split the batch instead of each doing all of it
+    queue = LeaseQueue(Path(queue_dir) / 'condensation', ttl=lease_ttl) if queue_dir else None
+    return BatchCondensationProcessor(
+        pipeline=pipeline,
+        queue=queue,
+        # Enough files in flight to keep every request slot busy
+        concurrency=llm_config.concurrent_requests,
+        scheduler=scheduler,
+        response_cache=response_cache,
+        resume=resume,
+        model=llm_config.model,
+        max_attempts=max_attempts
+    )
+
+
+def build_batch_client(settings: dict[str, Any], processor: BatchCondensationProcessor) -> BatchClient:
+    '''
+    `settings` holds `condensation.batch`. The `local` client answers the
+    batch through the processor's own LLM chain instead of a batch endpoint.
+    '''
+    llm_config = LLMConfigLoader().get_llm_config()
+    if settings.get('client', 'litellm') == 'local':
+        return LocalBatchClient(llm_config.model, Path(settings['dir']) / 'local', processor.pipeline.llm)
+    return LiteLLMBatchClient(llm_config.model, llm_config.model_provider, settings.get('completion_window', '24h'))
+
+
+def run_batch(action: str, input_dir: str, output_dir: str, prompt_path: str, batch: dict[str, Any], **processor_args):
+    asyncio.run(amain_batch(action, input_dir, output_dir, prompt_path, batch, **processor_args))
+
+
+async def amain_batch(action: str, input_dir: str, output_dir: str, prompt_path: str, batch: dict[str, Any], **processor_args):
+    '''
+    `submit` sends the prompts for the files in `input_dir` without a current
+    output in `output_dir` to the batch endpoint; a later
+    `collect` writes the outputs to `output_dir` once the batch has finished.
+    '''
+    try:
+        processor = build_processor(prompt_path, max_attempts=batch['max_attempts'], **processor_args)
+        client = build_batch_client(batch, processor)
+    except Exception as e:
+        logger.critical(f'Failed to initialize pipeline components: {e}')
+        return
+
+    if action == 'submit':
+        await processor.asubmit_batch(input_dir, batch['dir'], output_dir, client)
+    else:
+        await processor.acollect_batch(batch['dir'], output_dir, client)
+
+
+async def amain(
+    input_dir: str,
+    output_dir: str,
+    prompt_path: str,
+    queue_dir: Optional[str] = None,
+    lease_ttl: float = 300.0,
+    completion_tokens: int = 1024,
+    response_cache_path: Optional[str] = None,
+    response_cache_max_mb: float = 512,
+    chunk_tokens: Optional[int] = None,
+    reduce_prompt_path: str = 'prompts/review_reduce.txt',
+    compaction: Optional[dict[str, Any]] = None,
+    repair_prompt_path: Optional[str] = None,
+    streaming: Optional[dict[str, Any]] = None,
+    resume: bool = False
+):
     # Initialize components
     try:
-        config_loader = LLMConfigLoader() # Keeps loading LLM settings from settings.yaml
-        llm_config = config_loader.get_llm_config()
-        
-        llm_provider = GraphRagLLMProvider(config=llm_config)
-        validator = ReviewArticleValidator()
-        
-        pipeline = ReviewCondensationPipeline(
-            llm=llm_provider, 
-            validator=validator,
-            prompt_path=prompt_path
+        processor = build_processor(
+            prompt_path, queue_dir, lease_ttl, completion_tokens, response_cache_path, response_cache_max_mb,
+            chunk_tokens, reduce_prompt_path, compaction, repair_prompt_path, streaming, resume
         )
-        
-        processor = BatchCondensationProcessor(pipeline=pipeline)
-        
     except Exception as e:
         logger.critical(f'Failed to initialize pipeline components: {e}')
         return
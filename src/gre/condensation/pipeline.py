@@ -1,8 +1,21 @@
+import asyncio
+import json
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 from gre.logger.logger import get_logger
 from gre.condensation.base import CondensationPipeline, LLMProvider, ResponseValidator
+from gre.condensation.chunking import split_into_chunks
+from gre.condensation.compaction import TextCompactor
+from gre.condensation.scheduler import estimate_tokens
+from gre.condensation.streaming import SectionMonitor, StreamLimits
+from gre.condensation.validators import REQUIRED_SECTIONS, format_sections, parse_sections
+
+
+# frequency_penalty to reduce repetition
+# temperature=0.0 for deterministic structure
+GENERATION_KWARGS = {'temperature': 0.0, 'frequency_penalty': 0.5}
 
 
 class ReviewCondensationPipeline(CondensationPipeline):
@@ -10,12 +23,32 @@ class ReviewCondensationPipeline(CondensationPipeline):
         self, 
         llm: LLMProvider, 
         validator: ResponseValidator, 
-        prompt_path: str = 'prompts/review_condense.txt'
+        prompt_path: str = 'prompts/review_condense.txt',
+        chunk_tokens: Optional[int] = None,
+        reduce_prompt_path: str = 'prompts/review_reduce.txt',
+        compactor: Optional[TextCompactor] = None,
+        repair_prompt_path: Optional[str] = None,
+        stream_limits: Optional[StreamLimits] = None
     ):
+        '''
+        With `chunk_tokens`, inputs larger than that many estimated tokens are
+        condensed map-reduce style: chunks are condensed concurrently with the
+        main prompt and the partial results merged with the reduce prompt.
+        A `compactor` strips low-value sections from the input before any
+        prompt is formatted. With `repair_prompt_path`, sections the response
+        leaves missing or empty are requested once more on their own.
+        With `stream_limits`, responses are streamed and checked as they
+        arrive; a response that derails is cut off at the last good line.
+        '''
+        self.logger = get_logger(self.__class__.__name__)
         self.llm = llm
         self.validator = validator
         self.prompt_template = self._load_prompt(prompt_path)
-        self.logger = get_logger(self.__class__.__name__)
+        self.chunk_tokens = chunk_tokens
+        self.compactor = compactor
+        self.reduce_template = self._load_prompt(reduce_prompt_path) if chunk_tokens else None
+        self.repair_template = self._load_prompt(repair_prompt_path) if repair_prompt_path else None
+        self.stream_limits = stream_limits
 
 
     def _load_prompt(self, path: str) -> str:
@@ -27,37 +60,90 @@ class ReviewCondensationPipeline(CondensationPipeline):
             raise
         
 
-    async def arun(self, input_text: str) -> str:
+    async def arun(self, input_text: str, on_partial: Optional[Callable[[str], None]] = None) -> str:
         '''
         Runs the condensation process asynchronously: 
-        1. Formats the prompt with input text.
-        2. Calls LLM.
+        1. Formats the prompt with input text (per chunk for long inputs).
+        2. Calls LLM (plus the reduce step for long inputs).
         3. Validates response.
+        When streaming, `on_partial` receives the final response so far each
+        time a new section starts.
         '''
         if not input_text or not input_text.strip():
             self.logger.warning('Empty input text provided.')
             return ''
 
-        # Format the prompt
-        # Assuming the prompt has a placeholder {input_text}
-        try:
-            formatted_prompt = self.prompt_template.replace('{input_text}', input_text)
-        except Exception as e:
-            self.logger.error(f'Error formatting prompt: {e}')
-            raise
-        
-        # Generate with retries handled by the provider
-        # frequency_penalty to reduce repetition
-        # temperature=0.0 for deterministic structure
-        response = await self.llm.agenerate(
-            formatted_prompt, 
-            temperature=0.0,
-            frequency_penalty=0.5
-        )
-        
-        # Clean response
-        cleaned_response = self.validator.clean(response)
+        input_text = self.prepare(input_text)
+
+        if self._is_chunked(input_text):
+            cleaned_response = await self._amap_reduce(input_text, on_partial)
+        else:
+            cleaned_response = await self._acondense(self.prompt_template, input_text, on_partial, repair=True)
+
+        return self._validated(cleaned_response)
+
+
+    def fingerprint(self) -> str:
+        '''
+        The settings that change the output for the same input: prompts,
+        chunking, compaction and streaming limits.
+        '''
+        settings = {
+            'prompt': self.prompt_template,
+            'reduce_prompt': self.reduce_template,
+            'repair_prompt': self.repair_template,
+            'chunk_tokens': self.chunk_tokens,
+            'compaction': None if self.compactor is None else {
+                'rules': [asdict(rule) for rule in self.compactor.rules],
+                'drop_captions': self.compactor.drop_captions,
+            },
+            'stream_limits': None if self.stream_limits is None else asdict(self.stream_limits),
+        }
+        return json.dumps(settings, sort_keys=True)
 
+
+    def prepare(self, input_text: str) -> str:
+        '''
+        The input text as the prompts see it, i.e. after compaction.
+        '''
+        if self.compactor is not None:
+            return self.compactor.compact(input_text)
+        return input_text
+
+
+    def batch_prompts(self, input_text: str) -> List[str]:
+        '''
+        The prompts `arun` would send first for the `prepare`d `input_text`,
+        for submission to a batch endpoint: one per chunk for long inputs.
+        '''
+        if not input_text or not input_text.strip():
+            return []
+
+        if self._is_chunked(input_text):
+            return [self._format(self.prompt_template, chunk) for chunk in split_into_chunks(input_text, self.chunk_tokens)]
+        return [self._format(self.prompt_template, input_text)]
+
+
+    async def afinish(self, input_text: str, responses: List[str]) -> str:
+        '''
+        Completes `arun` from the batch responses to `batch_prompts(input_text)`,
+        for the same `prepare`d text. The reduce and repair steps, where
+        needed, are live requests.
+        '''
+        partials = [self.validator.clean(response) for response in responses]
+        if self._is_chunked(input_text):
+            cleaned_response = await self._areduce(partials)
+        else:
+            cleaned_response = await self._arepair(partials[0], input_text)
+
+        return self._validated(cleaned_response)
+
+
+    def _is_chunked(self, input_text: str) -> bool:
+        return bool(self.chunk_tokens) and estimate_tokens(input_text) > self.chunk_tokens
+
+
+    def _validated(self, cleaned_response: str) -> str:
         # Validate
         if not self.validator.validate(cleaned_response):
             self.logger.warning('LLM response failed validation. Returning raw response but marked as invalid in logs.')
@@ -65,3 +151,196 @@ class ReviewCondensationPipeline(CondensationPipeline):
             # For now returning the response but logging the failure.
         
         return cleaned_response
+
+
+    async def _acondense(
+        self,
+        template: str,
+        input_text: str,
+        on_partial: Optional[Callable[[str], None]] = None,
+        repair: bool = False
+    ) -> str:
+        '''
+        With `repair`, and always after an aborted stream, the sections the
+        response is missing are requested through the repair prompt. Without
+        a repair prompt, an aborted request is retried once instead.
+        '''
+        response, aborted = await self._agenerate(template, input_text, on_partial)
+        if aborted and self.repair_template is None:
+            self.logger.info('Retrying aborted request')
+            retry, _ = await self._agenerate(template, input_text, on_partial)
+            if len(parse_sections(retry)) >= len(parse_sections(response)):
+                response = retry
+
+        # Clean response
+        cleaned_response = self.validator.clean(response)
+        if repair or aborted:
+            cleaned_response = await self._arepair(cleaned_response, input_text)
+        return cleaned_response
+
+
+    async def _agenerate(
+        self,
+        template: str,
+        input_text: str,
+        on_partial: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, bool]:
+        '''
+        Returns the response and whether its stream was aborted.
+        '''
+        formatted_prompt = self._format(template, input_text)
+        
+        # Generate with retries handled by the provider
+        if self.stream_limits is not None:
+            return await self._astream(formatted_prompt, on_partial)
+        return await self.llm.agenerate(formatted_prompt, **GENERATION_KWARGS), False
+
+
+    def _format(self, template: str, input_text: str) -> str:
+        # Format the prompt
+        # Assuming the prompt has a placeholder {input_text}
+        try:
+            return template.replace('{input_text}', input_text)
+        except Exception as e:
+            self.logger.error(f'Error formatting prompt: {e}')
+            raise
+
+
+    async def _astream(self, prompt: str, on_partial: Optional[Callable[[str], None]]) -> Tuple[str, bool]:
+        monitor = SectionMonitor(self.stream_limits)
+        stream = self.llm.astream(prompt, **GENERATION_KWARGS)
+        sections = 0
+        aborted = False
+        try:
+            async for chunk in stream:
+                if monitor.feed(chunk):
+                    aborted = True
+                    break
+                if on_partial is not None and len(monitor.sections) > sections:
+                    sections = len(monitor.sections)
+                    on_partial(monitor.text)
+        finally:
+            # Closing the stream early stops generation, which is what saves the output tokens
+            await stream.aclose()
+
+        if not aborted:
+            # The provider finished; an offending last line is only left out
+            monitor.close()
+            return monitor.text, False
+
+        self.logger.warning(
+            'Stream aborted | reason=%s | sections=%d | chars_kept=%d',
+            monitor.reason,
+            len(monitor.sections),
+            len(monitor.text)
+        )
+        return monitor.text, True
+
+
+    async def _amap_reduce(self, input_text: str, on_partial: Optional[Callable[[str], None]] = None) -> str:
+        chunks = split_into_chunks(input_text, self.chunk_tokens)
+        self.logger.info('Chunked condensation | chunks=%d | tokens=%d', len(chunks), estimate_tokens(input_text))
+
+        partials = await asyncio.gather(*(self._acondense(self.prompt_template, chunk) for chunk in chunks))
+        return await self._areduce(list(partials), on_partial)
+
+
+    async def _areduce(self, partials: List[str], on_partial: Optional[Callable[[str], None]] = None) -> str:
+        '''
+        Merges partial condensations section by section and lets the reduce
+        prompt consolidate them. Partials that do not fit one reduce call
+        together are reduced in groups first, level by level. Partials too
+        large to be grouped at all are cut down section by section to a share
+        of `chunk_tokens` each.
+        '''
+        while True:
+            groups = self._group_partials(partials)
+            if len(groups) == 1:
+                break
+            if len(groups) == len(partials):
+                # Grouping cannot shrink the list any further, so another level would not converge
+                budget = self.chunk_tokens // len(partials)
+                self.logger.warning('Partials exceed the reduce budget, truncating | partials=%d | tokens_each=%d', len(partials), budget)
+                groups = self._group_partials([self._truncate_sections(partial, budget) for partial in partials])
+                break
+            self.logger.info('Intermediate reduce | partials=%d | groups=%d', len(partials), len(groups))
+            partials = list(await asyncio.gather(*(self._acondense(self.reduce_template, group) for group in groups)))
+
+        merged = '\n\n'.join(groups)
+        if estimate_tokens(merged) > self.chunk_tokens:
+            merged = self._truncate_sections(merged, self.chunk_tokens)
+            if estimate_tokens(merged) > self.chunk_tokens:
+                raise ValueError(f'chunk_tokens={self.chunk_tokens} is too small to hold the section headers of a reduce input')
+        # The merged partials are the input of the final call, so they stand in for the document
+        return await self._acondense(self.reduce_template, merged, on_partial, repair=True)
+
+
+    async def _arepair(self, response: str, input_text: str) -> str:
+        '''
+        Asks for the missing or empty sections of `response` only, with the
+        same input, and merges the sections that come back with content.
+        '''
+        if self.repair_template is None:
+            return response
+
+        sections = parse_sections(response)
+        empty = [name for name in REQUIRED_SECTIONS if not sections.get(name)]
+        if not empty:
+            return response
+
+        self.logger.info('Repairing sections | sections=%s', ','.join(empty))
+        template = self.repair_template.replace('{sections}', '\n'.join(f'### SECTION: {name}' for name in empty))
+        # Only the requested sections come back, so the response is not cleaned
+        repaired_response, _ = await self._agenerate(template, input_text)
+        repaired = parse_sections(repaired_response)
+
+        filled = [name for name in empty if repaired.get(name)]
+        for name in filled:
+            sections[name] = repaired[name]
+        self.logger.info('Sections repaired | filled=%d | still_empty=%d', len(filled), len(empty) - len(filled))
+        return format_sections(sections) if filled else response
+
+
+    def _truncate_sections(self, partial: str, max_tokens: int) -> str:
+        '''
+        Keeps the leading lines of every section of `partial`, each section
+        getting an equal share of `max_tokens`.
+        '''
+        sections = parse_sections(partial)
+        share = max_tokens // len(REQUIRED_SECTIONS)
+        kept: dict[str, List[str]] = {}
+        for name in REQUIRED_SECTIONS:
+            lines = kept[name] = []
+            tokens = estimate_tokens(f'### SECTION: {name}')
+            for line in sections.get(name, []):
+                tokens += estimate_tokens(line)
+                if tokens > share:
+                    break
+                lines.append(line)
+        return format_sections(kept)
+
+
+    def _group_partials(self, partials: List[str]) -> List[str]:
+        '''
+        Packs partials, each rendered as one merged section block, into groups
+        that fit `chunk_tokens`.
+        '''
+        groups: List[List[str]] = []
+        tokens = 0
+        for partial in partials:
+            size = estimate_tokens(partial)
+            if not groups or tokens + size > self.chunk_tokens:
+                groups.append([])
+                tokens = 0
+            groups[-1].append(partial)
+            tokens += size
+
+        merged_groups = []
+        for group in groups:
+            sections: dict[str, List[str]] = {}
+            for partial in group:
+                for name, lines in parse_sections(partial).items():
+                    known = sections.setdefault(name, [])
+                    known.extend(line for line in lines if line not in known)
+            merged_groups.append(format_sections(sections))
+        return merged_groups
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from gre.logger.logger import get_logger
 from gre.condensation.base import LLMProvider
@@ -71,3 +71,19 @@ class GraphRagLLMProvider(LLMProvider):
         except Exception as e:
             self.logger.error(f'GraphRag LLM completion failed: {e}')
             raise e
+
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        try:
+            self.logger.info(f'Streaming content with model: {self.config.model}')
+            stream = self.llm.achat_stream(prompt, **kwargs)
+            try:
+                async for chunk in stream:
+                    if chunk:
+                        yield chunk
+            finally:
+                # Also runs when the consumer stops early, so the request is not left running
+                await stream.aclose()
+        except Exception as e:
+            self.logger.error(f'GraphRag LLM streaming failed: {e}')
+            raise e
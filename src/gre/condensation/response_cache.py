@@ -0,0 +1,137 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from gre.condensation.base import LLMProvider
+from gre.logger.logger import get_logger
+
+
+class ResponseCache:
+    '''
+    On-disk LLM response cache in a single SQLite file. Entries are evicted
+    least recently used first once their total size exceeds `max_bytes`.
+    '''
+
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.logger = get_logger(self.__class__.__name__)
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Used from the event loop thread, which may not be the one that built it
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        # Running size of the entries, kept so that a put does not have to sum the table
+        self._total = self._sum_sizes()
+
+
+    @staticmethod
+    def key(model: str, prompt: str, kwargs: dict[str, Any]) -> str:
+        payload = json.dumps({'model': model, 'prompt': prompt, 'kwargs': kwargs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return row[0]
+
+
+    def put(self, key: str, response: str) -> None:
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            row = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, size, last_used) VALUES (?, ?, ?, ?)',
+                (key, response, size, time.time())
+            )
+            self._total += size - (row[0] if row else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+
+    def _sum_sizes(self) -> int:
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+
+    def _evict(self) -> None:
+        # Other processes may share the file, so recount before deleting anything
+        total = self._sum_sizes()
+        evicted = 0
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_used').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self._total = total
+        self.logger.debug('Responses evicted | count=%d | size=%d', evicted, total)
+
+
+    def log_stats(self) -> None:
+        self.logger.info('LLM response cache | hits=%d | misses=%d | path=%s', self.hits, self.misses, self.path)
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLMProvider(LLMProvider):
+    '''
+    Returns the cached response for a request with the same model, prompt and
+    generation kwargs instead of calling `llm` again. Wrap it around the
+    scheduled provider so cache hits do not use up the rate budget.
+    '''
+
+    def __init__(self, llm: LLMProvider, cache: ResponseCache, model: str) -> None:
+        self.llm = llm
+        self.cache = cache
+        self.model = model
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        key = self.cache.key(self.model, prompt, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.agenerate(prompt, **kwargs)
+        self.cache.put(key, response)
+        return response
+
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        key = self.cache.key(self.model, prompt, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        received = []
+        inner = self.llm.astream(prompt, **kwargs)
+        try:
+            async for chunk in inner:
+                received.append(chunk)
+                yield chunk
+            # Not reached when the consumer aborts the stream, so partial responses are never cached
+            self.cache.put(key, ''.join(received))
+        finally:
+            await inner.aclose()
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from gre.condensation.base import LLMProvider
+from gre.logger.logger import get_logger
+
+
+# Rough size of a token in characters for English prose; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class _TokenBucket:
+    '''
+    Refills continuously at `per_minute` / 60 per second up to one minute's
+    budget. The level may go negative when a request turns out to cost more
+    than was reserved; later requests then wait for the debt to refill.
+    '''
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+    def try_take(self, amount: float) -> float:
+        '''
+        Takes `amount` and returns 0, or returns the seconds to wait before it is available.
+        '''
+        self._refill()
+        # A request larger than the whole budget is admitted once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            self.level -= amount
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+    def adjust(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+
+class Admission:
+    '''
+    Handle for one admitted request; `settle` corrects the reserved token cost
+    once the actual cost is known.
+    '''
+
+    def __init__(self, scheduler: 'AdmissionScheduler', tokens: int) -> None:
+        self.scheduler = scheduler
+        self.tokens = tokens
+
+
+    def settle(self, actual_tokens: int) -> None:
+        self.scheduler._settle(actual_tokens - self.tokens)
+        self.tokens = actual_tokens
+
+
+class AdmissionScheduler:
+    '''
+    Admits LLM requests in arrival order under a requests-per-minute budget,
+    a tokens-per-minute budget (on the estimated prompt + completion cost) and
+    a cap on requests in flight. A budget of `None` is not enforced.
+    '''
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_in_flight: int = 25
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max_in_flight
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._order = asyncio.Lock()
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.tokens_used = 0
+        self._started: Optional[float] = None
+        # (time, tokens) of the last minute, for the achieved tokens/minute
+        self._recent: deque[tuple[float, int]] = deque()
+
+
+    async def _take(self, bucket: Optional[_TokenBucket], amount: float) -> None:
+        if bucket is None:
+            return
+        while (delay := bucket.try_take(amount)) > 0:
+            await asyncio.sleep(delay)
+
+
+    @asynccontextmanager
+    async def admit(self, tokens: int) -> AsyncIterator[Admission]:
+        '''
+        Waits until the request fits all budgets and holds its in-flight slot
+        for the duration of the block.
+        '''
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+            try:
+                # One request at a time waits on the buckets, so admission stays FIFO
+                async with self._order:
+                    await self._take(self._requests, 1)
+                    await self._take(self._tokens, tokens)
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        if self._started is None:
+            self._started = time.monotonic()
+        self.in_flight += 1
+        self.admitted += 1
+        self._count_tokens(tokens)
+        try:
+            yield Admission(self, tokens)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+
+    def _count_tokens(self, tokens: int) -> None:
+        self.tokens_used += tokens
+        self._recent.append((time.monotonic(), tokens))
+
+
+    def _settle(self, delta: int) -> None:
+        self._count_tokens(delta)
+        if self._tokens is not None:
+            self._tokens.adjust(delta)
+
+
+    def stats(self) -> dict[str, float]:
+        '''
+        `tokens_per_minute` counts the tokens of the last 60 seconds (or of the
+        whole run while it is shorter), which is the window providers enforce.
+        '''
+        now = time.monotonic()
+        while self._recent and self._recent[0][0] < now - 60:
+            self._recent.popleft()
+        elapsed = min(60.0, now - self._started) if self._started is not None else 0.0
+        recent_tokens = sum(tokens for _, tokens in self._recent)
+        return {
+            'waiting': self.waiting,
+            'in_flight': self.in_flight,
+            'admitted': self.admitted,
+            'tokens': self.tokens_used,
+            'tokens_per_minute': recent_tokens / max(elapsed, 1.0) * 60 if elapsed > 0 else 0.0,
+        }
+
+
+    def log_stats(self, msg: str = 'Admission stats', level: int = logging.INFO) -> None:
+        stats = self.stats()
+        self.logger.log(
+            level,
+            '%s | waiting=%d | in_flight=%d | admitted=%d | tokens=%d | tokens_per_minute=%.0f',
+            msg,
+            stats['waiting'],
+            stats['in_flight'],
+            stats['admitted'],
+            stats['tokens'],
+            stats['tokens_per_minute']
+        )
+
+
+    async def areport(self, interval: float = 30.0) -> None:
+        '''
+        Logs queue depth and achieved throughput every `interval` seconds until cancelled.
+        '''
+        while True:
+            await asyncio.sleep(interval)
+            self.log_stats()
+
+
+class ScheduledLLMProvider(LLMProvider):
+    '''
+    Passes every request through an `AdmissionScheduler`. The reservation is
+    the estimated prompt size plus `completion_tokens`; it is settled against
+    the estimated size of the actual response.
+    '''
+
+    def __init__(self, llm: LLMProvider, scheduler: AdmissionScheduler, completion_tokens: int = 1024) -> None:
+        self.llm = llm
+        self.scheduler = scheduler
+        self.completion_tokens = completion_tokens
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        prompt_tokens = estimate_tokens(prompt)
+        async with self.scheduler.admit(prompt_tokens + self.completion_tokens) as admission:
+            response = await self.llm.agenerate(prompt, **kwargs)
+            admission.settle(prompt_tokens + estimate_tokens(response))
+        return response
+
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        prompt_tokens = estimate_tokens(prompt)
+        async with self.scheduler.admit(prompt_tokens + self.completion_tokens) as admission:
+            received = []
+            try:
+                async for chunk in self.llm.astream(prompt, **kwargs):
+                    received.append(chunk)
+                    yield chunk
+            finally:
+                # An aborted stream is only charged for what was generated
+                admission.settle(prompt_tokens + estimate_tokens(''.join(received)))
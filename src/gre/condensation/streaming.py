@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from gre.condensation.validators import REQUIRED_SECTIONS, SECTION_HEADER_RE
+
+
+@dataclass
+class StreamLimits:
+    '''
+    Limits a streamed response is held to. `max_repeats` is how often the
+    same content line may occur in a row, `max_preamble_chars` how much
+    text may come before the first section header and `max_line_chars` how
+    long a single line may grow.
+    '''
+    max_repeats: int = 3
+    max_preamble_chars: int = 200
+    max_line_chars: int = 2000
+
+
+class SectionMonitor:
+    '''
+    Checks a streamed condensation line by line as it arrives. `feed` returns
+    the reason to abort once the response derails: an unknown or repeated
+    section header, too much text outside any section, a content line
+    repeated too often in a row or a line that never ends. `text` is the
+    response up to, and excluding, the offending line.
+    '''
+
+    def __init__(self, limits: Optional[StreamLimits] = None) -> None:
+        self.limits = limits or StreamLimits()
+        self.sections: List[str] = []
+        self.reason: Optional[str] = None
+        self._lines: List[str] = []
+        self._buffer = ''
+        self._preamble = 0
+        self._last_line: Optional[str] = None
+        self._repeats = 0
+
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self._lines)
+
+
+    def feed(self, chunk: str) -> Optional[str]:
+        if self.reason is not None:
+            return self.reason
+
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            if self._check(line):
+                return self.reason
+
+        if len(self._buffer) > self.limits.max_line_chars:
+            self.reason = 'runaway_line'
+        return self.reason
+
+
+    def close(self) -> Optional[str]:
+        '''
+        Checks the last, unterminated line once the stream has ended.
+        '''
+        if self.reason is None and self._buffer:
+            self._check(self._buffer)
+            self._buffer = ''
+        return self.reason
+
+
+    def _check(self, line: str) -> bool:
+        stripped = line.strip()
+        header = SECTION_HEADER_RE.match(stripped)
+
+        if header is not None:
+            name = header.group(1)
+            if name not in REQUIRED_SECTIONS:
+                self.reason = 'unknown_section'
+            elif name in self.sections:
+                self.reason = 'duplicate_section'
+            else:
+                self.sections.append(name)
+                self._last_line = None
+        elif stripped and not self.sections:
+            self._preamble += len(stripped)
+            if self._preamble > self.limits.max_preamble_chars:
+                self.reason = 'missing_header'
+        elif stripped:
+            # Only a run of the same line is a loop; "- N/A" may well recur across sections
+            self._repeats = self._repeats + 1 if stripped == self._last_line else 1
+            self._last_line = stripped
+            if self._repeats > self.limits.max_repeats:
+                self.reason = 'repetition'
+
+        if self.reason is not None:
+            return True
+        self._lines.append(line)
+        return False
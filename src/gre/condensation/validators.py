@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import Dict, List
 
 from gre.logger.logger import get_logger
 from gre.condensation.base import ResponseValidator
@@ -15,6 +15,34 @@ REQUIRED_SECTIONS = [
     'Open_Challenges'
 ]
 
+SECTION_HEADER_RE = re.compile(r'^### SECTION: (\w+)\s*$', re.MULTILINE)
+
+
+def parse_sections(response: str) -> Dict[str, List[str]]:
+    '''
+    Splits a condensed response into its sections: header name -> non-empty
+    content lines. Text before the first header is ignored.
+    '''
+    sections: Dict[str, List[str]] = {}
+    headers = list(SECTION_HEADER_RE.finditer(response))
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(response)
+        lines = [line.strip() for line in response[header.end():end].splitlines() if line.strip()]
+        sections.setdefault(header.group(1), []).extend(lines)
+    return sections
+
+
+def format_sections(sections: Dict[str, List[str]]) -> str:
+    '''
+    Renders the required sections in their canonical order; missing ones get
+    an empty header, as the prompt asks for.
+    '''
+    blocks = []
+    for section in REQUIRED_SECTIONS:
+        lines = sections.get(section, [])
+        blocks.append('\n'.join([f'### SECTION: {section}', *lines]))
+    return '\n\n'.join(blocks)
+
 
 class ReviewArticleValidator(ResponseValidator):
     def __init__(self):
@@ -52,9 +52,86 @@ class ConfigLoader:
         return self.config.get('ingestion', {}).get('output_dir', default)
         
 
+    def get_ingestion_workers(self, default: Optional[int] = None) -> Optional[int]:
+        return self.config.get('ingestion', {}).get('workers', default)
+
+
+    def get_ingestion_cache(self, default: bool = True) -> bool:
+        return bool(self.config.get('ingestion', {}).get('cache', default))
+
+
+    def get_ingestion_artifacts_dir(self, default: Optional[str] = None) -> Optional[str]:
+        return self.config.get('ingestion', {}).get('artifacts_dir', default)
+
+
+    def get_ingestion_metrics_dir(self, default: Optional[str] = None) -> Optional[str]:
+        return self.config.get('ingestion', {}).get('metrics_dir', default)
+
+
+    def get_cleaner_time_limit(self, default: Optional[float] = None) -> Optional[float]:
+        return self.config.get('ingestion', {}).get('cleaner_time_limit', default)
+
+
+    def get_extractor_settings(self) -> Dict[str, Any]:
+        '''
+        Keyword arguments for `TextExtractor` (e.g. shard_threshold, shard_pages, shard_workers).
+        '''
+        return self.config.get('ingestion', {}).get('extractor') or {}
+
+
+    def get_work_queue_dir(self, default: Optional[str] = None) -> Optional[str]:
+        return self.config.get('work_queue', {}).get('dir', default)
+
+
+    def get_work_queue_lease_ttl(self, default: float = 300.0) -> float:
+        return float(self.config.get('work_queue', {}).get('lease_ttl', default))
+
+
     def get_condensation_output_dir(self, default: str = 'output/condensed_texts') -> str:
         return self.config.get('condensation', {}).get('output_dir', default)
 
 
+    def get_condensation_handoff_queue_size(self, default: int = 16) -> int:
+        return int(self.config.get('condensation', {}).get('handoff_queue_size', default))
+
+
+    def get_condensation_completion_tokens(self, default: int = 1024) -> int:
+        return int(self.config.get('condensation', {}).get('completion_tokens', default))
+
+
+    def get_condensation_response_cache_path(self, default: Optional[str] = None) -> Optional[str]:
+        return self.config.get('condensation', {}).get('response_cache_path', default)
+
+
+    def get_condensation_response_cache_max_mb(self, default: float = 512) -> float:
+        return float(self.config.get('condensation', {}).get('response_cache_max_mb', default))
+
+
+    def get_condensation_chunk_tokens(self, default: Optional[int] = None) -> Optional[int]:
+        return self.config.get('condensation', {}).get('chunk_tokens', default)
+
+
+    def get_condensation_reduce_prompt_path(self, default: str = 'prompts/review_reduce.txt') -> str:
+        return self.config.get('condensation', {}).get('reduce_prompt_path', default)
+
+
+    def get_condensation_repair_prompt_path(self, default: Optional[str] = None) -> Optional[str]:
+        return self.config.get('condensation', {}).get('repair_prompt_path', default)
+
+
+    def get_condensation_batch(self) -> Dict[str, Any]:
+        settings = {'dir': 'output/condensation_batch', 'client': 'litellm', 'completion_window': '24h', 'max_attempts': 3}
+        settings.update(self.config.get('condensation', {}).get('batch') or {})
+        return settings
+
+
+    def get_condensation_streaming(self) -> Optional[Dict[str, Any]]:
+        return self.config.get('condensation', {}).get('streaming')
+
+
+    def get_condensation_compaction(self) -> Optional[Dict[str, Any]]:
+        return self.config.get('condensation', {}).get('compaction')
+
+
     def get_condensation_prompt_path(self, default: str = 'prompts/review_condense.txt') -> str:
         return self.config.get('condensation', {}).get('prompt_path', default)
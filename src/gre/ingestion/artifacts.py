@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+from gre.logger.logger import get_logger
+
+
+class StageArtifactStore:
+    '''
+    Stores intermediate stage outputs (raw extraction, layout repair) under a
+    content key, so a re-run can resume from the first stage whose input,
+    code or configuration changed.
+
+    Layout: <root>/<stage>/<key[:2]>/<key>.txt
+    '''
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.logger = get_logger(self.__class__.__name__)
+
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / f'{key}.txt'
+
+
+    def load(self, stage: str, key: str) -> Optional[str]:
+        path = self._path(stage, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+
+        self.logger.debug('Stage artifact reused | stage=%s | key=%s', stage, key[:12])
+        return text
+
+
+    def save(self, stage: str, key: str, text: str) -> None:
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write-then-rename keeps artifacts whole when several workers race on one key.
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        tmp_path.replace(path)
@@ -1,20 +1,307 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from gre.ingestion.cache import IngestionCache
+from gre.ingestion.fingerprint import file_sha256, fingerprint_digest
 from gre.ingestion.loader.pdf_loader import PdfLoader
+from gre.ingestion.metrics import MetricsReport, StageTimer
 from gre.ingestion.post.text_writer import TextWriter
 from gre.ingestion.processor import PdfIngestionProcessor
 from gre.logger.logger import get_logger
+from gre.workqueue.lease import LeaseQueue
+
+
+@dataclass
+class IngestionResult:
+    path: Path
+    worker: str
+    duration: float
+    error: Optional[str] = None
+    stages: dict[str, float] = field(default_factory=dict)
+    # Cleaners skipped because they hit their time limit; the output is degraded
+    timeouts: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Per-process state for parallel mode, populated by `_init_worker`.
+_worker_processor: Optional[PdfIngestionProcessor] = None
+_worker_writer: Optional[TextWriter] = None
+_worker_profile_dir: Optional[Path] = None
+
+
+def _init_worker(
+    processor_factory: Callable[[], PdfIngestionProcessor],
+    writer: TextWriter,
+    profile_dir: Optional[Path] = None
+) -> None:
+    global _worker_processor, _worker_writer, _worker_profile_dir
+    _worker_processor = processor_factory()
+    _worker_writer = writer
+    _worker_profile_dir = profile_dir
+
+
+def _process_in_worker(pdf: Path, content_hash: Optional[str] = None) -> IngestionResult:
+    assert _worker_processor is not None and _worker_writer is not None
+    return _process_file(_worker_processor, _worker_writer, pdf, _worker_profile_dir, content_hash)
+
+
+def _process_file(
+    processor: PdfIngestionProcessor,
+    writer: TextWriter,
+    pdf: Path,
+    profile_dir: Optional[Path] = None,
+    content_hash: Optional[str] = None
+) -> IngestionResult:
+    start_time = time.perf_counter()
+    worker = f'pid-{os.getpid()}'
+    timer = StageTimer(profile_dir / pdf.stem if profile_dir is not None else None)
+    try:
+        cleaned_text = processor.process(pdf, timer, content_hash)
+        with timer.stage('write'):
+            writer.write(pdf.stem, cleaned_text)
+    except Exception as e:
+        processor.logger.error('PDF processing failed | file=%s | error=%s', pdf.name, e)
+        return IngestionResult(pdf, worker, time.perf_counter() - start_time, error=str(e), stages=timer.stages)
+    return IngestionResult(pdf, worker, time.perf_counter() - start_time, stages=timer.stages, timeouts=timer.timeouts)
 
 
 class BatchIngestionRunner:
-    def __init__(self, loader: PdfLoader, processor: PdfIngestionProcessor, writer: TextWriter) -> None:
+    CACHE_SAVE_INTERVAL = 50
+
+    def __init__(
+        self,
+        loader: PdfLoader,
+        processor: PdfIngestionProcessor,
+        writer: TextWriter,
+        workers: Optional[int] = 1,
+        processor_factory: Optional[Callable[[], PdfIngestionProcessor]] = None,
+        cache: Optional[IngestionCache] = None,
+        metrics: Optional[MetricsReport] = None,
+        queue: Optional[LeaseQueue] = None,
+        on_output: Optional[Callable[[Path], None]] = None
+    ) -> None:
+        '''
+        `workers` > 1 enables the process-pool mode; `None` means one worker per CPU core.
+        Parallel mode needs a picklable `processor_factory` so that every worker
+        builds its own `PdfIngestionProcessor`. With a `cache`, PDFs whose content
+        and pipeline fingerprint are unchanged since the last run are skipped.
+        With `metrics`, per-stage timings of every processed PDF are reported.
+        With a shared `queue`, each PDF is claimed before it is processed, so
+        runners on several hosts can split one input directory.
+        `on_output` is called with the text file of every PDF whose output is
+        current, as soon as it is written or found in the cache, e.g. to hand
+        it to condensation while the batch is still running.
+        '''
         self.loader = loader
         self.processor = processor
         self.writer = writer
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.processor_factory = processor_factory
+        self.cache = cache
+        self.metrics = metrics
+        self.queue = queue
+        self.on_output = on_output
         self.logger = get_logger(self.__class__.__name__)
-    
-
-    def run(self):
-        self.logger.info('Ingestion started')
-        for pdf in self.loader.list_items():
-            cleaned_text = self.processor.process(pdf)
-            self.writer.write(pdf.stem, cleaned_text)
-        self.logger.info('Ingestion finished')
\ No newline at end of file
+        self._results: list[IngestionResult] = []
+        self._cache_keys: dict[Path, str] = {}
+        self._queue_tokens: dict[Path, str] = {}
+        self._pipeline_fingerprint: Optional[str] = None
+
+
+    def run(self) -> list[IngestionResult]:
+        parallel = self.workers > 1 and self.processor_factory is not None
+        self.logger.info('Ingestion started | workers=%d', self.workers if parallel else 1)
+
+        start_time = time.perf_counter()
+        self._results = []
+        self._cache_keys = {}
+        self._queue_tokens = {}
+        # Discovery is streamed: PDFs are dispatched while the input tree is still being walked
+        pdfs = self.loader.iter_items()
+
+        if self.cache is not None:
+            pdfs = self._skip_cached(pdfs)
+
+        if self.queue is not None:
+            pdfs = self.queue.claim_all(pdfs, lambda pdf: pdf.stem, self._queue_token)
+
+        try:
+            if parallel:
+                self._run_parallel(pdfs)
+            else:
+                self._run_sequential(pdfs)
+        finally:
+            if self.queue is not None:
+                self.queue.close()
+            if self.cache is not None:
+                self.cache.save()
+            if self.metrics is not None:
+                self._report_stages(self.metrics.close())
+
+        self._report(self._results, time.perf_counter() - start_time)
+        return self._results
+
+
+    def _skip_cached(self, pdfs: Iterable[Path]) -> Iterator[Path]:
+        assert self.cache is not None
+        hits = misses = 0
+
+        for pdf in pdfs:
+            try:
+                key = self.cache.key(pdf, self.loader.content_hash(pdf))
+            except OSError as e:
+                self.logger.warning('Cache key failed, processing anyway | file=%s | error=%s', pdf.name, e)
+                misses += 1
+                yield pdf
+                continue
+
+            if self.cache.is_fresh(pdf, key):
+                hits += 1
+                self._emit_output(pdf)
+                continue
+
+            self._cache_keys[pdf] = key
+            misses += 1
+            yield pdf
+
+        self.logger.info('Ingestion cache | hits=%d | misses=%d', hits, misses)
+
+
+    def _queue_token(self, pdf: Path) -> str:
+        '''
+        Identifies the work done for a PDF: the same content under the same
+        pipeline fingerprint, i.e. the ingestion cache key.
+        '''
+        token = self._cache_keys.get(pdf)
+        if token is None:
+            content_hash = self.loader.content_hash(pdf) or file_sha256(pdf)
+            if self._pipeline_fingerprint is None:
+                self._pipeline_fingerprint = self.processor.fingerprint()
+            token = fingerprint_digest(content_hash, self._pipeline_fingerprint)
+        self._queue_tokens[pdf] = token
+        return token
+
+
+    def _complete(self, result: IngestionResult) -> None:
+        self._results.append(result)
+
+        if self.queue is not None:
+            self.queue.complete(result.path.stem, self._queue_tokens.get(result.path, ''), ok=result.ok and not result.timeouts)
+
+        if self.metrics is not None:
+            self.metrics.record(result.path, result.worker, result.duration, result.stages, result.error, result.timeouts)
+
+        # Degraded output from a timed-out cleaner is written but not cached,
+        # so the PDF is retried on the next run.
+        key = self._cache_keys.get(result.path)
+        if self.cache is not None and result.ok and not result.timeouts and key is not None:
+            self.cache.record(result.path, key)
+            # Persist periodically so an interrupted batch keeps most of its progress.
+            if len(self._results) % self.CACHE_SAVE_INTERVAL == 0:
+                self.cache.save()
+
+        if result.ok:
+            self._emit_output(result.path)
+
+
+    def _emit_output(self, pdf: Path) -> None:
+        if self.on_output is None:
+            return
+        text_path = self.writer.output_dir / f'{pdf.stem}.txt'
+        # The text file is already written; a failing consumer must not abort the batch
+        try:
+            self.on_output(text_path)
+        except Exception as e:
+            self.logger.error('Output callback failed | file=%s | error=%s', text_path.name, e)
+
+
+    def _run_sequential(self, pdfs: Iterable[Path]) -> None:
+        for pdf in pdfs:
+            self._complete(_process_file(self.processor, self.writer, pdf, self._profile_dir(), self.loader.content_hash(pdf)))
+
+
+    def _run_parallel(self, pdfs: Iterable[Path]) -> None:
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.processor_factory, self.writer, self._profile_dir())
+        ) as executor:
+            # Only a bounded number of PDFs is in flight, so discovery (and claiming
+            # from a shared queue) advances as fast as the workers finish.
+            in_flight: dict[Future, Path] = {}
+            for pdf in pdfs:
+                if len(in_flight) >= self.workers * 2:
+                    self._collect(in_flight, wait(in_flight, return_when=FIRST_COMPLETED).done)
+                # The loader hashed the PDF during discovery; the worker need not read it again
+                in_flight[executor.submit(_process_in_worker, pdf, self.loader.content_hash(pdf))] = pdf
+
+            self._collect(in_flight, wait(in_flight).done)
+
+
+    def _collect(self, in_flight: dict[Future, Path], done: set[Future]) -> None:
+        for future in done:
+            pdf = in_flight.pop(future)
+            try:
+                self._complete(future.result())
+            except Exception as e:
+                # The worker itself died (e.g. a crash inside a native library).
+                self.logger.error('Worker failed | file=%s | error=%s', pdf.name, e)
+                self._complete(IngestionResult(pdf, 'unknown', 0.0, error=str(e)))
+
+
+    def _profile_dir(self) -> Optional[Path]:
+        return self.metrics.profile_dir if self.metrics is not None else None
+
+
+    def _report_stages(self, summary: dict) -> None:
+        for stage, row in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+            self.logger.info(
+                'Stage timing | stage=%s | docs=%d | total=%.2fs | p50=%.3fs | p95=%.3fs | max=%.3fs',
+                stage,
+                row['docs'],
+                row['total'],
+                row['p50'],
+                row['p95'],
+                row['max']
+            )
+
+
+    def _report(self, results: list[IngestionResult], duration: float) -> None:
+        per_worker: dict[str, list[IngestionResult]] = defaultdict(list)
+        for result in results:
+            per_worker[result.worker].append(result)
+
+        for worker, worker_results in sorted(per_worker.items()):
+            busy = sum(r.duration for r in worker_results)
+            self.logger.info(
+                'Worker throughput | worker=%s | docs=%d | failed=%d | busy=%.2fs | docs_per_sec=%.2f',
+                worker,
+                len(worker_results),
+                sum(1 for r in worker_results if not r.ok),
+                busy,
+                len(worker_results) / busy if busy > 0 else 0.0
+            )
+
+        failed = [r for r in results if not r.ok]
+        for result in failed:
+            self.logger.warning('Failed PDF | file=%s | error=%s', result.path.name, result.error)
+
+        for result in results:
+            if result.timeouts:
+                self.logger.warning('Cleaner time limit hit | file=%s | cleaners=%s', result.path.name, ','.join(result.timeouts))
+
+        self.logger.info(
+            'Ingestion finished | docs=%d | failed=%d | duration=%.2fs | docs_per_sec=%.2f',
+            len(results),
+            len(failed),
+            duration,
+            len(results) / duration if duration > 0 else 0.0
+        )
@@ -0,0 +1,69 @@
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from gre.ingestion.fingerprint import file_sha256, fingerprint_digest
+from gre.logger.logger import get_logger
+
+
+class IngestionCache:
+    '''
+    Content-addressed record of already ingested PDFs. An entry is keyed by the
+    SHA-256 of the PDF bytes combined with the pipeline fingerprint; a PDF whose
+    key matches and whose `.txt` output still exists can be skipped.
+    '''
+
+    MANIFEST_NAME = '.ingestion_cache.json'
+
+    def __init__(self, output_dir: Path, pipeline_fingerprint: str) -> None:
+        self.output_dir = output_dir
+        self.pipeline_fingerprint = pipeline_fingerprint
+        self.manifest_path = output_dir / self.MANIFEST_NAME
+        self.logger = get_logger(self.__class__.__name__)
+        self.entries: dict[str, dict[str, Any]] = self._load()
+        self._recorded: set[str] = set()
+
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if not self.manifest_path.exists():
+            return {}
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning('Ingestion cache unreadable, starting empty | path=%s | error=%s', self.manifest_path, e)
+            return {}
+
+
+    def key(self, pdf_path: Path, content_hash: Optional[str] = None) -> str:
+        '''
+        `content_hash` is the SHA-256 of the PDF if it is already known, which
+        saves reading the file a second time.
+        '''
+        return fingerprint_digest(content_hash or file_sha256(pdf_path), self.pipeline_fingerprint)
+
+
+    def is_fresh(self, pdf_path: Path, key: str) -> bool:
+        entry = self.entries.get(pdf_path.stem)
+        if not entry or entry.get('key') != key:
+            return False
+        return (self.output_dir / f'{pdf_path.stem}.txt').exists()
+
+
+    def record(self, pdf_path: Path, key: str) -> None:
+        self.entries[pdf_path.stem] = {'key': key, 'source': str(pdf_path)}
+        self._recorded.add(pdf_path.stem)
+
+
+    def save(self) -> None:
+        # Runners on other hosts may share the output directory, so entries they
+        # saved in the meantime are merged instead of overwritten.
+        entries = self._load()
+        entries.update({stem: self.entries[stem] for stem in self._recorded})
+        self.entries.update(entries)
+        tmp_path = self.manifest_path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.manifest_path)
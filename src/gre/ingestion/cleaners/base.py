@@ -1,31 +1,47 @@
 from abc import ABC, abstractmethod
+from gre.ingestion.document import Document
+from gre.ingestion.guard import StageTimeout, time_limit
 from gre.logger.logger import get_logger
-from typing import Any
+from typing import Any, Optional
 
 
 class BaseCleaner(ABC):
+    # Cleaners edit the shared document model and match through shared pattern sets
+    FINGERPRINT_MODULES = ('gre.ingestion.document', 'gre.ingestion.cleaners.patterns')
+
     def __init__(self) -> None:
         self.logger = get_logger(self.__class__.__name__)
-        self.source_id: str | None = None
-    
 
-    def run(self, text: str) -> str:
-        if not text:
+
+    def run(self, document: Document, time_limit_seconds: Optional[float] = None) -> Document:
+        '''
+        With `time_limit_seconds`, a cleaner that runs longer is interrupted,
+        its partial edits are rolled back and `StageTimeout` is raised.
+        '''
+        input_len = document.char_count()
+        if not input_len:
             self.log_warning('Cleaner received empty input')
-            return text
-        
-        input_len = len(text)
+            return document
+
         self.log_info(
             'Cleaner started | input chars=%d',
             input_len
         )
 
-        output = self.clean(text)
+        snapshot = document.snapshot() if time_limit_seconds else None
+        try:
+            with time_limit(time_limit_seconds, self.__class__.__name__):
+                self.clean_document(document)
+        except StageTimeout:
+            document.restore(snapshot)
+            self.log_error('Cleaner exceeded time limit, changes discarded | limit=%.1fs', time_limit_seconds)
+            raise
+        document.compact()
 
-        output_len = len(output or '')
+        output_len = document.char_count()
         removed_ratio = 1 - (output_len / max(input_len, 1))
 
-        if not output.strip():
+        if document.is_blank():
             self.log_error(
                 'Cleaner produced empty output | removed_ratio=%.2f',
                 removed_ratio
@@ -33,45 +49,43 @@ class BaseCleaner(ABC):
         else:
             self.log_info(
                 'Cleaner completed | output_chars=%d | removed_ratio=%.2f',
-                output_len, 
+                output_len,
                 removed_ratio
             )
-        
-        return output
-    
 
-    def set_source(self, source_id: str) -> None:
-        self.source_id = source_id
+        return document
 
 
-    @abstractmethod
     def clean(self, text: str) -> str:
+        '''
+        Convenience wrapper for plain strings.
+        '''
+        document = Document.from_text(text)
+        self.clean_document(document)
+        return document.text()
+
+
+    @abstractmethod
+    def clean_document(self, document: Document) -> None:
+        '''
+        Cleans the document in place by editing or deleting lines.
+        '''
         pass
 
 
+    # The current document is added to each record by the logging context
+    # (see gre.logger.logger.document_context), not by these helpers.
     def log_info(self, msg: str, *args: Any) -> None:
-        if self.source_id:
-            self.logger.info(f'file={self.source_id} | {msg}', *args)
-        else:
-            self.logger.info(msg, *args)
+        self.logger.info(msg, *args)
 
 
     def log_warning(self, msg: str, *args: Any) -> None:
-        if self.source_id:
-            self.logger.warning(f'file={self.source_id} | {msg}', *args)
-        else:
-            self.logger.warning(msg, *args)
-    
+        self.logger.warning(msg, *args)
+
 
     def log_error(self, msg: str, *args: Any) -> None:
-        if self.source_id:
-            self.logger.error(f'file={self.source_id} | {msg}', *args)
-        else:
-            self.logger.error(msg, *args)
-    
+        self.logger.error(msg, *args)
+
 
     def log_debug(self, msg: str, *args: Any) -> None:
-        if self.source_id:
-            self.logger.debug(f'file={self.source_id} | {msg}', *args)
-        else:
-            self.logger.debug(msg, *args)
\ No newline at end of file
+        self.logger.debug(msg, *args)
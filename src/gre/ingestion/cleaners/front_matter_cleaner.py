@@ -1,6 +1,9 @@
 import re
 
 from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.cleaners.patterns import PatternSet
+from gre.ingestion.document import Document
+from gre.logger.logger import EventCounter
 
 
 STOP_MARKERS = [
@@ -25,35 +28,32 @@ METADATA_PATTERNS = [
     r'Contents lists available at',
 ]
 
+METADATA_MATCHER = PatternSet(METADATA_PATTERNS, re.IGNORECASE)
+
 
 class FrontMatterCleaner(BaseCleaner):
     def __init__(self) -> None:
         super().__init__()
 
     
-    def clean(self, text: str) -> str:
-        lines = text.splitlines()
-        output: list[str] = []
-        stop_cleaning: bool = False
+    def clean_document(self, document: Document) -> None:
+        events = EventCounter()
 
-        for idx, line in enumerate(lines):
+        for idx, line in enumerate(document.live()):
             # Safety brake: Stop cleaning after Page 1 or 500 lines
-            if idx > 500 or '=== PAGE 2 ===' in line:
-                stop_cleaning = True
-            
-            if stop_cleaning:
-                output.append(line)
-                continue
-            
+            if idx > 500 or '=== PAGE 2 ===' in line.text:
+                break
+
             # Remove metadata lines if they match patterns
-            if any(re.search(p, line, re.IGNORECASE) for p in METADATA_PATTERNS):
-                self.logger.info(
-                    'Front-matter metadata removed | line_no=%d | text=\'%s\'',
+            pattern = METADATA_MATCHER.search(line.text)
+            if pattern is not None:
+                events.add(pattern)
+                self.logger.debug(
+                    'Front-matter metadata removed | line_no=%d | pattern=%s | text=\'%s\'',
                     idx,
-                    line[:120]
+                    pattern,
+                    line.text[:120]
                 )
-                continue
+                line.deleted = True
 
-            output.append(line)
-        
-        return '\n'.join(output)
+        events.log(self.logger, 'Front-matter metadata removed')
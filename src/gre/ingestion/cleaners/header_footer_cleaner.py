@@ -1,43 +1,140 @@
 from collections import Counter
 import re
 from difflib import SequenceMatcher
-from typing import List, Tuple, Set
+from typing import Iterable, List, Optional, Tuple, Set
 
 from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.document import PAGE_MARKER_RE, Document, Line
+from gre.logger.logger import EventCounter
+
+
+# Overlaps longer than this (in normalized characters) count as header/footer text
+MIN_OVERLAP = 12
+
+
+class CandidateIndex:
+    """
+    k-gram index over the normalized candidates with k = MIN_OVERLAP + 1.
+    A common substring longer than MIN_OVERLAP always contains a shared k-gram,
+    so only candidates hit by one of the line's k-grams need the exact
+    longest-match comparison. Each candidate keeps one SequenceMatcher so its
+    lookup tables are built once instead of once per boundary line.
+    """
+
+    def __init__(self, norm_candidates: Iterable[str]) -> None:
+        self.k = MIN_OVERLAP + 1
+        self.candidates = list(norm_candidates)
+        self._matchers: List[SequenceMatcher] = []
+        self._grams: dict[str, List[int]] = {}
+
+        for cand_id, cand in enumerate(self.candidates):
+            matcher = SequenceMatcher(None)
+            matcher.set_seq2(cand)
+            self._matchers.append(matcher)
+            for gram in {cand[i:i + self.k] for i in range(len(cand) - self.k + 1)}:
+                self._grams.setdefault(gram, []).append(cand_id)
+
+    def find_overlap(self, norm_line: str) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (start, size) of the longest match against the first candidate,
+        in candidate order, that overlaps the line by more than MIN_OVERLAP.
+        """
+        hits = set()
+        for i in range(len(norm_line) - self.k + 1):
+            cand_ids = self._grams.get(norm_line[i:i + self.k])
+            if cand_ids:
+                hits.update(cand_ids)
+
+        for cand_id in sorted(hits):
+            matcher = self._matchers[cand_id]
+            matcher.set_seq1(norm_line)
+            match = matcher.find_longest_match(0, len(norm_line), 0, len(self.candidates[cand_id]))
+            if match.size > MIN_OVERLAP:
+                return match.a, match.size
+
+        return None
 
 
 class HeaderFooterCleaner(BaseCleaner):
     PAGE_RE = re.compile(r"(=== PAGE \d+ ===)")
+    PAGE_NUMBER_RE = re.compile(r"^\W*\]\d+\[\W*$")
+    WHITESPACE_RE = re.compile(r"\s+")
 
     def __init__(self, min_repeats: int = 3, boundary_lines: int = 3) -> None:
         super().__init__()
         self.min_repeats = min_repeats
         self.boundary_lines = boundary_lines
 
-    def clean(self, text: str) -> str:
-        pages = self._split_pages(text)
-        candidates = self._find_candidates(pages)
+    def clean_document(self, document: Document) -> None:
+        pages = self._split_pages(document.live())
+        candidates = self._find_candidates([body for _, _, body, _ in pages])
         
         # Determine normalized forms of candidates
         norm_candidates = {self._normalize(c): c for c in candidates}
+        index = CandidateIndex(norm_candidates)
         
-        cleaned_pages = []
+        cleaned_lines: list[Line] = []
+        events = EventCounter()
         
-        for page_header, page_body in pages:
-            cleaned_text = self._clean_page(page_body, norm_candidates)
-            
-            if page_header:
-                cleaned_pages.append(f"{page_header}\n{cleaned_text}")
-            else:
-                cleaned_pages.append(cleaned_text)
-                
-        return "\n".join(cleaned_pages)
+        for marker, page_header, body, sources in pages:
+            start, end = self._clean_page(body, index, events)
+            start, end = self._strip_range(body, start, end)
+
+            if marker is not None:
+                marker.text = page_header
+                cleaned_lines.append(marker)
+
+            if start >= end:
+                if marker is not None:
+                    # An emptied page keeps a blank line after its marker
+                    cleaned_lines.append(self._reuse_line(sources, '', marker))
+                continue
+
+            body[start] = body[start].lstrip()
+            body[end - 1] = body[end - 1].rstrip()
+
+            for i in range(start, end):
+                source = sources[i]
+                if source is None:
+                    # Text that followed the page marker on the same line
+                    source = Line(body[i], marker.page, marker.offset + len(page_header))
+                else:
+                    source.text = body[i]
+                cleaned_lines.append(source)
+
+        document.lines = cleaned_lines
+        events.log(self.logger, 'Header/footer lines cleaned')
+
+    @staticmethod
+    def _page_number(header: str, default: int) -> int:
+        marker = PAGE_MARKER_RE.match(header)
+        return int(marker.group(1)) if marker else default
+
+    @staticmethod
+    def _reuse_line(sources: List[Optional[Line]], text: str, marker: Line) -> Line:
+        for source in sources:
+            if source is not None:
+                source.text = text
+                return source
+        return Line(text, marker.page, marker.offset)
+
+    @staticmethod
+    def _strip_range(lines: List[str], start: int, end: int) -> Tuple[int, int]:
+        '''
+        Narrows lines[start:end] to the span that survives joining and stripping
+        the page text: leading and trailing blank lines are dropped.
+        '''
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        return start, end
 
-    def _find_candidates(self, pages: List[Tuple[str, str]]) -> Set[str]:
+    def _find_candidates(self, pages: List[List[str]]) -> Set[str]:
         boundary_lines = []
         # Sample lines for candidate detection
-        for _, body in pages:
-            lines = [l.strip() for l in body.splitlines() if l.strip()]
+        for body in pages:
+            lines = [l.strip() for l in body if l.strip()]
             boundary_lines.extend(lines[:self.boundary_lines])
             boundary_lines.extend(lines[-self.boundary_lines:])
             
@@ -52,10 +149,13 @@ class HeaderFooterCleaner(BaseCleaner):
              
         return valid_candidates
 
-    def _clean_page(self, text: str, norm_candidates: dict[str, str]) -> str:
-        lines = text.splitlines()
+    def _clean_page(self, lines: List[str], index: CandidateIndex, events: EventCounter) -> Tuple[int, int]:
+        '''
+        Trims header/footer artifacts from the page boundaries. Trimmed lines are
+        updated in place; returns the [start, end) range of lines to keep.
+        '''
         if not lines:
-            return text
+            return 0, 0
             
         # 1. Clean Top
         clean_start_idx = 0
@@ -66,21 +166,24 @@ class HeaderFooterCleaner(BaseCleaner):
                 continue
 
             # Check for page number artifacts first
-            if re.search(r"^\W*\]\d+\[\W*$", original):
-                 self.logger.info("Removed page number artifact: '%s'", original[:50])
+            if self.PAGE_NUMBER_RE.search(original):
+                 events.add('page_numbers_removed')
+                 self.logger.debug("Removed page number artifact: '%s'", original[:50])
                  clean_start_idx = i + 1
                  continue
                 
-            cleaned_line = self._remove_artifact(original, norm_candidates)
+            cleaned_line = self._remove_artifact(original, index)
             
             if cleaned_line != original:
                 # Artifact found and removed
                 if not cleaned_line.strip():
-                    self.logger.info("Removed header line: '%s'", original[:50])
+                    events.add('headers_removed')
+                    self.logger.debug("Removed header line: '%s'", original[:50])
                     clean_start_idx = i + 1
                     continue
                 else:
-                    self.logger.info("Trimmed merged header: '%s' -> '%s'", original[:50], cleaned_line[:50])
+                    events.add('headers_trimmed')
+                    self.logger.debug("Trimmed merged header: '%s' -> '%s'", original[:50], cleaned_line[:50])
                     lines[i] = cleaned_line
                     # Stop after modifying a merged line
                     clean_start_idx = i
@@ -98,19 +201,22 @@ class HeaderFooterCleaner(BaseCleaner):
                 continue
 
             # Check for page number artifacts first
-            if re.search(r"^\W*\]\d+\[\W*$", original):
-                 self.logger.info("Removed page number artifact: '%s'", original[:50])
+            if self.PAGE_NUMBER_RE.search(original):
+                 events.add('page_numbers_removed')
+                 self.logger.debug("Removed page number artifact: '%s'", original[:50])
                  clean_end_limit = i
                  continue
 
-            cleaned_line = self._remove_artifact(original, norm_candidates)
+            cleaned_line = self._remove_artifact(original, index)
             
             if cleaned_line != original:
                 if not cleaned_line.strip():
-                    self.logger.info("Removed footer line: '%s'", original[:50])
+                    events.add('footers_removed')
+                    self.logger.debug("Removed footer line: '%s'", original[:50])
                     clean_end_limit = i
                 else:
-                    self.logger.info("Trimmed merged footer: '%s' -> '%s'", original[:50], cleaned_line[:50])
+                    events.add('footers_trimmed')
+                    self.logger.debug("Trimmed merged footer: '%s' -> '%s'", original[:50], cleaned_line[:50])
                     lines[i] = cleaned_line
                     # If we trimmed it, we keep it but don't look further up (usually)
                     clean_end_limit = i + 1
@@ -118,10 +224,9 @@ class HeaderFooterCleaner(BaseCleaner):
             else:
                 break
                 
-        kept_lines = lines[clean_start_idx:clean_end_limit]
-        return "\n".join(kept_lines).strip()
+        return clean_start_idx, clean_end_limit
 
-    def _remove_artifact(self, line: str, norm_candidates: dict[str, str]) -> str:
+    def _remove_artifact(self, line: str, index: CandidateIndex) -> str:
         """
         Uses Longest Common Substring (LCS) to find and remove significant
         overlaps between the line and any candidate.
@@ -134,34 +239,22 @@ class HeaderFooterCleaner(BaseCleaner):
         # if re.search(r"^\W*\]\d+\[\W*$", line):
         #      return ""
             
-        best_match_ratio = 0
-        best_lcs_block = None
+        # Find the first candidate sharing a significant block (e.g. > 12 chars)
+        overlap = index.find_overlap(norm_line)
+        if overlap is None:
+            return line
+
+        # We found a significant overlap. 
+        # Now we need to map normalized indices back to original string to cut it.
+        start, size = overlap
+        cleaned = self._excise_span(line, start, start + size)
         
-        # Find best overlapping candidate
-        for norm_cand in norm_candidates:
-            # Quick check: is the norm_line strictly contained? 
-            # Or is norm_cand contained in norm_line?
-            # Or do they share a big chunk?
-            
-            # Using SequenceMatcher to find the longest common block
-            matcher = SequenceMatcher(None, norm_line, norm_cand)
-            match = matcher.find_longest_match(0, len(norm_line), 0, len(norm_cand))
+        # Residue Check: If we removed > 40% of the line (remaining is < 60%), 
+        # just kill the whole line to avoid leaving "Journal..." type artifacts.
+        if len(cleaned) < 0.6 * len(line):
+            return ""
             
-            # Use raw length of overlap as metric
-            # If overlap is significant (e.g. > 12 chars), we consider it a match
-            if match.size > 12:
-                # We found a significant overlap. 
-                # Now we need to map normalized indices back to original string to cut it.
-                cleaned = self._excise_span(line, match.a, match.a + match.size)
-                
-                # Residue Check: If we removed > 40% of the line (remaining is < 60%), 
-                # just kill the whole line to avoid leaving "Journal..." type artifacts.
-                if len(cleaned) < 0.6 * len(line):
-                    return ""
-                    
-                return cleaned
-                
-        return line
+        return cleaned
 
     def _excise_span(self, original: str, norm_start: int, norm_end: int) -> str:
         """
@@ -195,18 +288,50 @@ class HeaderFooterCleaner(BaseCleaner):
         return original
 
     def _normalize(self, text: str) -> str:
-        return re.sub(r"\s+", "", text).lower()
+        return self.WHITESPACE_RE.sub("", text).lower()
 
-    def _split_pages(self, text: str) -> List[Tuple[str, str]]:
-        parts = self.PAGE_RE.split(text)
-        if len(parts) == 1:
-            return [("", text)]
-        
-        pages = []
-        it = iter(parts)
-        for part in it:
-            if self.PAGE_RE.match(part):
-                header = part.strip()
-                content = next(it, "")
-                pages.append((header, content))
-        return pages
\ No newline at end of file
+    def _split_pages(self, lines: List[Line]) -> List[Tuple[Optional[Line], str, List[str], List[Optional[Line]]]]:
+        '''
+        Groups lines into pages as (marker line, page header, body texts, body sources).
+        A marker may sit anywhere in a line: text before it ends the previous
+        page, text after it is the first body entry of its page, with no source
+        line of its own. Lines before the first marker are dropped.
+        '''
+        pages: List[Tuple[Optional[Line], str, List[str], List[Optional[Line]]]] = []
+        body: List[str] = []
+        sources: List[Optional[Line]] = []
+
+        for line in lines:
+            matches = list(self.PAGE_RE.finditer(line.text))
+            if not matches:
+                if pages:
+                    body.append(line.text)
+                    sources.append(line)
+                continue
+
+            prefix = line.text[:matches[0].start()]
+            if prefix and pages:
+                body.append(prefix)
+                sources.append(line)
+
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(line.text)
+                header = match.group(1)
+                if i == 0 and not prefix:
+                    marker = line
+                else:
+                    marker = Line(header, self._page_number(header, line.page), line.offset + match.start())
+                body = [line.text[match.end():end]]
+                sources = [None]
+                pages.append((marker, header, body, sources))
+
+        if not pages:
+            pages.append((None, "", [line.text for line in lines], list(lines)))
+
+        # A trailing newline does not start another line of the last page
+        body, sources = pages[-1][2], pages[-1][3]
+        if body and body[-1] == "":
+            body.pop()
+            sources.pop()
+
+        return pages
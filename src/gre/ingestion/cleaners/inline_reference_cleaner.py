@@ -1,6 +1,25 @@
 import re
 
 from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.document import Document, Line
+
+
+# Remove inline citations like [1], [1, 2], [1-3]
+# Regex explanation:
+# \[          Literal [
+# \d+         One or more digits
+# (?:         Non-capturing group for subsequent numbers
+#   [,\-]     Comma or dash separator
+#   \s*       Optional whitespace
+#   \d+       Next number
+# )*          Repeat 0 or more times
+# \]          Literal ]
+CITATION_RE = re.compile(r'\[\d+(?:[,\-]\s*\d+)*\]')
+
+# A citation still open at the end of a line ("[12,") may continue on the next one.
+OPEN_CITATION_RE = re.compile(r'\[\d+(?:[,\-]\s*\d+)*[,\-]\s*$')
+
+REFERENCE_LINE_RE = re.compile(r'^\s*\[\d+\]\s+')
 
 
 class InlineReferenceCleaner(BaseCleaner):
@@ -9,41 +28,71 @@ class InlineReferenceCleaner(BaseCleaner):
         self.min_block_size = min_block_size
     
 
-    def clean(self, text: str) -> str:
-        lines = text.split('\n')
+    def clean_document(self, document: Document) -> None:
+        lines = document.live()
 
         start_idx = int(len(lines) * 0.7)
-        tail = lines[start_idx:]
-
-        ref_indices: list[int] = []
 
-        for i, line in enumerate(tail):
-            if re.match(r'^\s*\[\d+\]\s+', line):
-                ref_indices.append(start_idx + i)
+        ref_indices: list[int] = [
+            i for i in range(start_idx, len(lines))
+            if REFERENCE_LINE_RE.match(lines[i].text)
+        ]
 
-        
-        processed_text = text
         if len(ref_indices) >= self.min_block_size:
             cut_index = min(ref_indices)
             self.log_info('Truncating inline references | starting line=%d | lines removed=%d', cut_index + 1, len(lines) - cut_index)
-            processed_text = '\n'.join(lines[:cut_index])
+            for line in lines[cut_index:]:
+                line.deleted = True
+            lines = lines[:cut_index]
         elif ref_indices:
              self.log_debug('Found candidates=%d fewer than threshold=%d', len(ref_indices), self.min_block_size)
 
-        # Remove inline citations like [1], [1, 2], [1-3]
-        # Regex explanation:
-        # \[          Literal [
-        # \d+         One or more digits
-        # (?:         Non-capturing group for subsequent numbers
-        #   [,\-]     Comma or dash separator
-        #   \s*       Optional whitespace
-        #   \d+       Next number
-        # )*          Repeat 0 or more times
-        # \]          Literal ]
-        pattern = r'\[\d+(?:[,\-]\s*\d+)*\]'
-        cleaned_text, count = re.subn(pattern, '', processed_text)
+        count = self._remove_citations(lines)
         
         if count > 0:
             self.log_info('Removed inline citations | count=%d', count)
-            
-        return cleaned_text
\ No newline at end of file
+
+
+    def _remove_citations(self, lines: list[Line]) -> int:
+        count = 0
+        i = 0
+
+        while i < len(lines):
+            line = lines[i]
+
+            if '[' not in line.text:
+                i += 1
+                continue
+
+            if not OPEN_CITATION_RE.search(line.text):
+                line.text, n = CITATION_RE.subn('', line.text)
+                count += n
+                i += 1
+                continue
+
+            # The citation separator may span line breaks ("[12,\n13]"): substitute over
+            # the joined group and map the result back onto the group's lines.
+            end = self._citation_group_end(lines, i)
+            group = lines[i:end]
+            cleaned, n = CITATION_RE.subn('', '\n'.join(l.text for l in group))
+            count += n
+
+            parts = cleaned.split('\n')
+            for line, part in zip(group, parts):
+                line.text = part
+            for line in group[len(parts):]:
+                line.deleted = True
+
+            i = end
+
+        return count
+
+
+    def _citation_group_end(self, lines: list[Line], start: int) -> int:
+        end = start + 1
+        while end < len(lines):
+            text = lines[end].text
+            end += 1
+            if text.strip() and not OPEN_CITATION_RE.search(text):
+                break
+        return end
@@ -0,0 +1,49 @@
+import re
+from typing import Iterable, Optional
+
+
+# Constructs that change meaning once a pattern sits inside the combined
+# alternation: global inline flags, and backreferences or group conditionals,
+# whose group numbers the wrapping groups shift
+_UNSUPPORTED_RE = re.compile(r'\(\?[aiLmsux]+\)|(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=|\(\?\(')
+
+
+class PatternSet:
+    '''
+    Compiles a cleaner's pattern list into a single alternation so each line is
+    scanned once instead of once per pattern. Every pattern is wrapped in its
+    own named group, which lets `search` still report which pattern fired.
+    Patterns must not use global inline flags or backreferences; pass
+    `flags` or a scoped `(?i:...)` group instead.
+    '''
+
+    def __init__(self, patterns: Iterable[str], flags: int = 0) -> None:
+        self.patterns = list(patterns)
+        for pattern in self.patterns:
+            if _UNSUPPORTED_RE.search(pattern):
+                raise ValueError(f'Pattern uses inline flags or backreferences, which a PatternSet cannot combine: {pattern!r}')
+        self._compiled = [re.compile(p, flags) for p in self.patterns]
+        self._combined = re.compile(
+            '|'.join(f'(?P<p{i}>{p})' for i, p in enumerate(self.patterns)),
+            flags
+        )
+
+
+    def search(self, text: str) -> Optional[str]:
+        '''
+        Returns the pattern behind the leftmost match in `text`, or None.
+        '''
+        match = self._combined.search(text)
+        if match is None:
+            return None
+        return self.patterns[int(match.lastgroup[1:])]
+
+
+    def count(self, text: str) -> int:
+        '''
+        Number of distinct patterns that match somewhere in `text`. Lines with
+        no match at all are rejected by the combined scan alone.
+        '''
+        if self._combined.search(text) is None:
+            return 0
+        return sum(1 for pattern in self._compiled if pattern.search(text))
@@ -1,7 +1,8 @@
 import re
-from typing import Any
 
 from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.cleaners.patterns import PatternSet
+from gre.ingestion.document import Document, Line
 
 
 class PublicationMetadataCleaner(BaseCleaner):
@@ -16,27 +17,29 @@ class PublicationMetadataCleaner(BaseCleaner):
         r"\bGrant\b",
         r"\bsupported\s+by\b"
     ]
+    KEY_MATCHER = PatternSet(KEY_PATTERNS, re.IGNORECASE)
 
 
     def __init__(self) -> None:
         super().__init__()
 
     
-    def clean(self, text: str) -> str:
-        lines = text.split('\n')
-        cleaned: list[Any] = []
+    def clean_document(self, document: Document) -> None:
+        input_len = document.char_count()
 
-        buffer: list[str] = []
+        buffer: list[Line] = []
+        removed: list[Line] = []
         metadata_score = 0
 
+        kept_blocks = 0
         removed_blocks = 0
         removed_lines = 0
 
         def flush_buffer():
-            nonlocal buffer, metadata_score, removed_blocks, removed_lines
+            nonlocal buffer, metadata_score, kept_blocks, removed_blocks, removed_lines
             if metadata_score < 2:
-                cleaned.extend(buffer)
-                self.log_info(
+                kept_blocks += 1
+                self.log_debug(
                     'Metadata block kept | lines=%d score=%d',
                     len(buffer),
                     metadata_score,
@@ -44,7 +47,10 @@ class PublicationMetadataCleaner(BaseCleaner):
             else:
                 removed_blocks += 1
                 removed_lines += len(buffer)
-                self.log_info(
+                for line in buffer:
+                    line.deleted = True
+                removed.extend(buffer)
+                self.log_debug(
                     'Metadata block removed | lines=%d score=%d',
                     len(buffer),
                     metadata_score,
@@ -52,27 +58,29 @@ class PublicationMetadataCleaner(BaseCleaner):
             buffer = []
             metadata_score = 0
         
-        for line in lines:
+        for line in document.live():
             buffer.append(line)
 
-            for pattern in self.KEY_PATTERNS:
-                if re.search(pattern, line, re.IGNORECASE):
-                    metadata_score += 1
+            metadata_score += self.KEY_MATCHER.count(line.text)
             
-            if not line.strip():
+            if not line.text.strip():
                 flush_buffer()
         
         flush_buffer()
 
-        output = '\n'.join(cleaned)
+        self.log_info(
+            'Metadata blocks scanned | kept=%d | removed=%d | removed_lines=%d',
+            kept_blocks,
+            removed_blocks,
+            removed_lines,
+        )
 
-        removed_ratio = 1 - (len(output) / max(len(text), 1))
+        removed_ratio = 1 - (document.char_count() / max(input_len, 1))
 
         if removed_ratio > 0.5:
             self.log_error(
                 'PublicationMetadataCleaner aborted | excessive removal | removed_ratio=%.2f',
                 removed_ratio
             )
-            return text
-
-        return output
\ No newline at end of file
+            for line in removed:
+                line.deleted = False
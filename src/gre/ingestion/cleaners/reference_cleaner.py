@@ -1,6 +1,7 @@
 import re
 
 from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.document import Document, Line
 
 
 PATTERNS = [
@@ -8,34 +9,73 @@ PATTERNS = [
     r"(?im)\bBIBLIOGRAPHY\s*$"
 ]
 
+# Characters after a candidate heading that are checked for citation density
+SEARCH_WINDOW = 1000
+
 
 class ReferenceCleaner(BaseCleaner):
     def __init__(self):
         super().__init__()
 
-    def clean(self, text: str) -> str:
+    def clean_document(self, document: Document) -> None:
+        lines = document.live()
+
         for pattern in PATTERNS:
             # We want to find *all* matches because the first one might be a false positive
             # e.g. "We discuss References in Section 2... \nReferences"
-            for match in re.finditer(pattern, text):
+            offset = 0
+            for idx, line in enumerate(lines):
+                line_offset = offset
+                offset += len(line.text) + 1
+
+                match = re.search(pattern, line.text)
+                if not match:
+                    continue
+
                 # Verify content *after* the match candidate
-                candidate_start = match.start()
-                following_text = text[match.end():]
-                
+                candidate_start = line_offset + match.start()
+
                 # Check for Citation Density
                 # Look for at least 2 markers of type [1], [12], (1) or 1. 2.
                 # We limit the search to the first 1000 chars to avoid scanning entire doc
-                search_window = following_text[:1000]
-                
+                search_window = self._following_window(lines, idx, pattern, match.start())
+
                 citation_markers = len(re.findall(r"\[\d+\]", search_window))
                 numbered_list = len(re.findall(r"^\s*\d+\.\s", search_window, re.MULTILINE))
-                
+
                 if citation_markers >= 2 or numbered_list >= 2:
                     self.log_info('Reference section found (verified) | index=%d', candidate_start)
-                    truncated_text = text[:candidate_start]
-                    self.log_info('Reference section truncated | chars=%d', len(text) - len(truncated_text))
-                    return truncated_text
+                    input_len = document.char_count()
+                    line.text = line.text[:match.start()]
+                    for following in lines[idx + 1:]:
+                        following.deleted = True
+                    self.log_info('Reference section truncated | chars=%d', input_len - document.char_count())
+                    return
                 else:
                     self.log_info('Potential reference match skipped (validation failed) | index=%d', candidate_start)
-        
-        return text
\ No newline at end of file
+
+
+    def _following_window(self, lines: list[Line], idx: int, pattern: str, start: int) -> str:
+        '''
+        Returns the SEARCH_WINDOW characters that follow the heading match, as a
+        search over the whole document text would see them. Only as many of the
+        following lines are joined as the window needs.
+        '''
+        parts = [lines[idx].text]
+        content_chars = -1
+
+        # The match may extend over trailing blank lines, so collect until a full
+        # window of text after the first non-blank line is available.
+        for j in range(idx + 1, len(lines)):
+            text = lines[j].text
+            parts.append(text)
+            if content_chars < 0 and text.strip():
+                content_chars = 0
+            if content_chars >= 0:
+                content_chars += len(text) + 1
+                if content_chars > SEARCH_WINDOW:
+                    break
+
+        local = '\n'.join(parts)
+        match = re.compile(pattern).search(local, start)
+        return local[match.end():match.end() + SEARCH_WINDOW]
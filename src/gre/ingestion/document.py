@@ -0,0 +1,97 @@
+import re
+from typing import Iterable, Optional
+
+
+PAGE_MARKER_RE = re.compile(r'=== PAGE (\d+) ===')
+
+
+class Line:
+    '''
+    One line of a document. `page` is the page the line was extracted from
+    (0 before the first page marker) and `offset` its character offset in the
+    text the document was built from. Cleaners edit `text` in place and set
+    `deleted` instead of rebuilding the document string.
+    '''
+
+    __slots__ = ('text', 'page', 'offset', 'deleted')
+
+    def __init__(self, text: str, page: int = 0, offset: int = 0) -> None:
+        self.text = text
+        self.page = page
+        self.offset = offset
+        self.deleted = False
+
+
+    def __repr__(self) -> str:
+        flag = ' deleted' if self.deleted else ''
+        return f'Line(page={self.page}, offset={self.offset}{flag}, text={self.text!r})'
+
+
+class Document:
+    '''
+    Line-oriented representation shared by the cleaners and the normalizer.
+    The text is split once after layout repair and joined once at write time.
+    '''
+
+    __slots__ = ('lines',)
+
+    def __init__(self, lines: Optional[Iterable[Line]] = None) -> None:
+        self.lines: list[Line] = list(lines) if lines is not None else []
+
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Document':
+        lines: list[Line] = []
+        page = 0
+        offset = 0
+
+        for raw in text.split('\n'):
+            if raw.startswith('=== PAGE '):
+                marker = PAGE_MARKER_RE.match(raw)
+                if marker:
+                    page = int(marker.group(1))
+            lines.append(Line(raw, page, offset))
+            offset += len(raw) + 1
+
+        return cls(lines)
+
+
+    def live(self) -> list[Line]:
+        '''Lines that have not been deleted, in document order.'''
+        return [line for line in self.lines if not line.deleted]
+
+
+    def compact(self) -> None:
+        '''Drops deleted lines from storage.'''
+        self.lines = self.live()
+
+
+    def snapshot(self) -> list[tuple[Line, str, bool]]:
+        '''Captures the current lines and their state for `restore`.'''
+        return [(line, line.text, line.deleted) for line in self.lines]
+
+
+    def restore(self, snapshot: list[tuple[Line, str, bool]]) -> None:
+        for line, text, deleted in snapshot:
+            line.text = text
+            line.deleted = deleted
+        self.lines = [line for line, _, _ in snapshot]
+
+
+    def char_count(self) -> int:
+        '''Length of `text()` without building it.'''
+        count = 0
+        live = 0
+        for line in self.lines:
+            if not line.deleted:
+                count += len(line.text)
+                live += 1
+        return count + max(live - 1, 0)
+
+
+    def is_blank(self) -> bool:
+        return all(not line.text.strip() for line in self.lines if not line.deleted)
+
+
+    def text(self) -> str:
+        return '\n'.join(line.text for line in self.lines if not line.deleted)
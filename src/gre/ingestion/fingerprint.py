@@ -0,0 +1,90 @@
+import hashlib
+import importlib
+import inspect
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+
+# Attributes that describe runtime state rather than configuration.
+IGNORED_ATTRIBUTES = {'logger', 'source_id'}
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_own(module_name: str) -> bool:
+    return module_name.split('.')[0] == 'gre'
+
+
+@lru_cache(maxsize=None)
+def _source_sha256(cls: type) -> str:
+    '''
+    Hashes the source of every module in the class hierarchy that belongs to
+    this package, so edits to a base class invalidate its subclasses too.
+    Classes list helper modules they depend on (shared patterns, the document
+    model) in a `FINGERPRINT_MODULES` class attribute.
+    '''
+    digest = hashlib.sha256()
+    modules = dict.fromkeys(klass.__module__ for klass in cls.__mro__ if _is_own(klass.__module__))
+    for klass in cls.__mro__:
+        modules.update(dict.fromkeys(vars(klass).get('FINGERPRINT_MODULES', ())))
+
+    for module_name in modules:
+        try:
+            module = sys.modules.get(module_name) or importlib.import_module(module_name)
+            digest.update(inspect.getsource(module).encode('utf-8'))
+        except (ImportError, OSError, TypeError):
+            continue
+    return digest.hexdigest()
+
+
+def _is_plain(value: Any) -> bool:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def component_fingerprint(component: Any) -> dict[str, Any]:
+    '''
+    Describes a pipeline component by class, constructor parameters and the
+    hash of the module that implements it, so that both config and code
+    changes produce a different fingerprint. The code of package objects the
+    component holds (e.g. an extraction backend) is hashed as well.
+    Components can list parameters that do not affect their output in a
+    `FINGERPRINT_EXCLUDE` class attribute.
+    '''
+    cls = type(component)
+    excluded = IGNORED_ATTRIBUTES | set(getattr(cls, 'FINGERPRINT_EXCLUDE', ()))
+    params = {
+        name: value
+        for name, value in sorted(vars(component).items())
+        if name not in excluded and not name.startswith('_') and _is_plain(value)
+    }
+    held = {
+        name: component_fingerprint(value)
+        for name, value in sorted(vars(component).items())
+        if name not in excluded and _is_own(type(value).__module__)
+    }
+    return {
+        'class': f'{cls.__module__}.{cls.__qualname__}',
+        'params': params,
+        'source': _source_sha256(cls),
+        'held': held,
+    }
+
+
+def fingerprint_digest(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
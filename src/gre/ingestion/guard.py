@@ -0,0 +1,36 @@
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class StageTimeout(Exception):
+    '''Raised inside a stage that ran past its time limit.'''
+
+
+def _guard_available() -> bool:
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds: Optional[float], stage: str) -> Iterator[None]:
+    '''
+    Raises `StageTimeout` in the block once `seconds` of wall time have passed.
+    Uses SIGALRM, which also interrupts long regex matches, so it is only
+    active in the main thread of a process (the sequential runner and pool
+    workers). Elsewhere, or without a limit, the block runs unguarded.
+    '''
+    if not seconds or not _guard_available():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise StageTimeout(f'{stage} exceeded {seconds:.1f}s')
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -1,19 +1,45 @@
+import json
+import os
+import uuid
 from pathlib import Path
 import time
+from typing import Any, Iterator, Optional
+
+from gre.ingestion.fingerprint import file_sha256
 from gre.logger.logger import get_logger
 
 
 class PdfLoader:
-    def __init__(self, input_dir: Path) -> None:
+    '''
+    Discovers the PDFs under `input_dir`. Paths are streamed as the directory
+    tree is walked, so processing starts before the listing is complete, and
+    byte-identical PDFs are yielded only once (the first one found).
+    With a `manifest_path`, every discovered file is recorded there as one JSON
+    line (path, size, mtime, sha256, duplicate_of). Hashes of files whose size
+    and mtime are unchanged since the previous manifest are reused instead of
+    reading the file again.
+    '''
+
+    MANIFEST_NAME = '.input_manifest.jsonl'
+
+    def __init__(self, input_dir: Path, manifest_path: Optional[Path] = None) -> None:
         self.input_dir = input_dir
+        self.manifest_path = manifest_path
         self.logger = get_logger(self.__class__.__name__)
-    
-    
+        self._hashes: dict[Path, str] = {}
+
+
     def list_items(self) -> list[Path]:
         '''
-        Loads all PDF files under the given path (input_dir).
+        Loads all unique PDF files under the given path (input_dir).
         '''
+        return list(self.iter_items())
+
 
+    def iter_items(self) -> Iterator[Path]:
+        '''
+        Yields unique PDF files under the given path (input_dir) as they are found.
+        '''
         start_time = time.time()
 
         self.logger.info(
@@ -22,15 +48,117 @@ class PdfLoader:
         )
 
         if not self.input_dir.exists():
-            logger.error('Input dir does not exist: %s', self.input_dir)
-            return []
-        
-        pdf_files = list(self.input_dir.rglob('*.pdf'))
+            self.logger.error('Input dir does not exist: %s', self.input_dir)
+            return
+
+        previous = self._load_manifest()
+        seen: dict[str, Path] = {}
+        total = hashed = 0
+        completed = False
+        manifest = None
+        if self.manifest_path is not None:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+            manifest = open(tmp_path, 'w', encoding='utf-8')
+
+        try:
+            for entry in self._walk(self.input_dir):
+                path = Path(entry.path)
+                try:
+                    stat = entry.stat()
+                    sha256, reused = self._content_hash(path, stat, previous)
+                except OSError as e:
+                    self.logger.warning('PDF unreadable, skipped | path=%s | error=%s', path, e)
+                    continue
+
+                total += 1
+                hashed += not reused
+                original = seen.setdefault(sha256, path)
+                duplicate_of = original if original != path else None
+
+                if manifest is not None:
+                    record = {
+                        'path': str(path),
+                        'size': stat.st_size,
+                        'mtime_ns': stat.st_mtime_ns,
+                        'sha256': sha256,
+                        'duplicate_of': str(duplicate_of) if duplicate_of else None,
+                    }
+                    manifest.write(json.dumps(record) + '\n')
+
+                if duplicate_of is not None:
+                    self.logger.debug('Duplicate PDF skipped | path=%s | duplicate_of=%s', path, duplicate_of)
+                    continue
+
+                self._hashes[path] = sha256
+                yield path
+            completed = True
+        finally:
+            if manifest is not None:
+                manifest.close()
+                # Only a completed walk replaces the previous manifest
+                if completed:
+                    tmp_path.replace(self.manifest_path)
+                else:
+                    tmp_path.unlink(missing_ok=True)
 
         self.logger.info(
-            'PDF loading completed | total_pdfs=%d | duration=%.2fs',
-            len(pdf_files),
+            'PDF loading completed | total_pdfs=%d | unique=%d | duplicates=%d | hashed=%d | duration=%.2fs',
+            total,
+            len(seen),
+            total - len(seen),
+            hashed,
             time.time() - start_time,
         )
-        
-        return pdf_files
\ No newline at end of file
+
+
+    def content_hash(self, path: Path) -> Optional[str]:
+        '''
+        SHA-256 of a PDF yielded by `iter_items`, if it was discovered by this loader.
+        '''
+        return self._hashes.get(path)
+
+
+    def _walk(self, root: Path) -> Iterator[os.DirEntry]:
+        # Depth-first with os.scandir: the directory entries carry their file type,
+        # so only PDFs cost a stat call, and entries are sorted for a stable order.
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                self.logger.warning('Directory unreadable, skipped | path=%s | error=%s', directory, e)
+                continue
+
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(Path(entry.path))
+                elif entry.name.endswith('.pdf') and entry.is_file():
+                    yield entry
+            stack.extend(reversed(subdirs))
+
+
+    def _content_hash(self, path: Path, stat: os.stat_result, previous: dict[str, dict[str, Any]]) -> tuple[str, bool]:
+        known = previous.get(str(path))
+        if known and known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns:
+            return known['sha256'], True
+        return file_sha256(path), False
+
+
+    def _load_manifest(self) -> dict[str, dict[str, Any]]:
+        if self.manifest_path is None or not self.manifest_path.exists():
+            return {}
+
+        entries: dict[str, dict[str, Any]] = {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    entries[record['path']] = record
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning('Input manifest unreadable, hashing all files | path=%s | error=%s', self.manifest_path, e)
+            return {}
+        return entries
@@ -1,26 +1,111 @@
-import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Iterator, Optional
+from gre.ingestion.loader.backends import ExtractionBackend, create_backend
 from gre.logger.logger import get_logger
 
 
+# Shard processes per document when `shard_workers` is not set
+DEFAULT_SHARD_WORKERS = 4
+
+
+def _iter_pages(backend: ExtractionBackend, pdf_path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    '''
+    Yields `=== PAGE n ===` blocks one page at a time. Backends release each
+    page's cached objects as soon as its text is extracted, so memory stays
+    flat regardless of document size.
+    '''
+    for page_number, text in backend.iter_page_texts(pdf_path, start, end):
+        if text:
+            yield f'=== PAGE {page_number} ===\n{text}'
+
+
+def _extract_range(backend: ExtractionBackend, pdf_path: Path, start: int, end: int) -> list[str]:
+    '''
+    Extracts the 0-based page range [start, end) as `=== PAGE n ===` blocks.
+    Module-level so it can run inside a worker process.
+    '''
+    return list(_iter_pages(backend, pdf_path, start, end))
+
+
 class TextExtractor:
-    def __init__(self):
+    # Sharding changes how pages are scheduled, never the extracted text.
+    FINGERPRINT_EXCLUDE = ('shard_threshold', 'shard_pages', 'shard_workers')
+
+    def __init__(
+        self,
+        backend: str = 'pdfplumber',
+        backend_options: Optional[dict[str, Any]] = None,
+        shard_threshold: Optional[int] = None,
+        shard_pages: int = 50,
+        shard_workers: Optional[int] = None
+    ):
+        '''
+        `backend` selects the text engine (see `backends.BACKENDS`); the default
+        pdfplumber backend runs with x/y tolerance 2 unless `backend_options`
+        say otherwise.
+
+        Documents with more than `shard_threshold` pages are split into ranges of
+        `shard_pages` pages that are extracted in parallel. Sharding is off when
+        `shard_threshold` is None. At most `shard_workers` processes extract one
+        document, `DEFAULT_SHARD_WORKERS` when unset; keep `shard_workers` times
+        the number of ingestion workers at or below the core count.
+        '''
         self.logger = get_logger(self.__class__.__name__)
-    
+        self.backend = backend
+        self.backend_options = backend_options if backend_options is not None else self._default_options(backend)
+        self.shard_threshold = shard_threshold
+        self.shard_pages = shard_pages
+        self.shard_workers = shard_workers
+        self._backend = create_backend(backend, self.backend_options)
+
+
+    @staticmethod
+    def _default_options(backend: str) -> dict[str, Any]:
+        if backend == 'pdfplumber':
+            return {'x_tolerance': 2, 'y_tolerance': 2}
+        return {}
+
 
     def extract(self, pdf_path: Path) -> str:
         '''
         Low-level PDF text extraction.
         '''
-        pages: list[str] = []
-
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text(
-                    x_tolerance = 2,
-                    y_tolerance = 2
-                )
-                if text:
-                    pages.append(f'=== PAGE {i+1} ===\n{text}')
-        
-        return '\n'.join(pages)
\ No newline at end of file
+        return '\n'.join(self.iter_pages(pdf_path))
+
+
+    def iter_pages(self, pdf_path: Path) -> Iterator[str]:
+        '''
+        Streaming variant of `extract`: yields one `=== PAGE n ===` block at a time.
+        '''
+        if self.shard_threshold is not None:
+            page_count = self._backend.page_count(pdf_path)
+            if page_count > self.shard_threshold:
+                yield from self._iter_sharded(pdf_path, page_count)
+                return
+
+        yield from _iter_pages(self._backend, pdf_path)
+
+
+    def _iter_sharded(self, pdf_path: Path, page_count: int) -> Iterator[str]:
+        ranges = [
+            (start, min(start + self.shard_pages, page_count))
+            for start in range(0, page_count, self.shard_pages)
+        ]
+
+        self.logger.info(
+            'Sharded extraction | backend=%s | pages=%d | shards=%d',
+            self.backend,
+            page_count,
+            len(ranges)
+        )
+
+        max_workers = min(self.shard_workers or DEFAULT_SHARD_WORKERS, len(ranges))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_extract_range, self._backend, pdf_path, start, end)
+                for start, end in ranges
+            ]
+            # Futures are consumed in submission order, so pages stay in document order.
+            for future in futures:
+                yield from future.result()
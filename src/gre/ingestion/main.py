@@ -1,5 +1,8 @@
+import os
+import time
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 
 from gre.ingestion.loader.pdf_loader import PdfLoader
 from gre.ingestion.loader.text_extractor import TextExtractor
@@ -15,13 +18,25 @@ from gre.ingestion.cleaners.noise_cleaner import NoiseCleaner
 from gre.ingestion.post.line_normalizer import LineNormalizer
 from gre.ingestion.processor import PdfIngestionProcessor
 from gre.ingestion.batch_runner import BatchIngestionRunner
+from gre.ingestion.cache import IngestionCache
+from gre.ingestion.artifacts import StageArtifactStore
+from gre.ingestion.metrics import MetricsReport
+from gre.workqueue.lease import LeaseQueue
 
 
-def run(input_dir: str, output_dir: str):
-    loader = PdfLoader(Path(input_dir))
-    writer = TextWriter(Path(output_dir))
+logger = get_logger(__name__)
+
 
-    extractor = TextExtractor()
+def build_processor(
+    extractor_settings: Optional[dict[str, Any]] = None,
+    artifacts_dir: Optional[str] = None,
+    cleaner_time_limit: Optional[float] = None
+) -> PdfIngestionProcessor:
+    '''
+    Builds the full ingestion chain. Kept at module level so that worker
+    processes can construct their own processor instance.
+    '''
+    extractor = TextExtractor(**(extractor_settings or {}))
     layout_repairer = LayoutRepairer()
 
     cleaners: list[Any] = [
@@ -35,17 +50,72 @@ def run(input_dir: str, output_dir: str):
 
     normalizer = LineNormalizer()
 
-    processor = PdfIngestionProcessor(
+    artifacts = StageArtifactStore(Path(artifacts_dir)) if artifacts_dir else None
+
+    return PdfIngestionProcessor(
         extractor=extractor,
         repairer=layout_repairer,
         cleaners=cleaners,
-        normalizer=normalizer
+        normalizer=normalizer,
+        artifacts=artifacts,
+        cleaner_time_limit=cleaner_time_limit
     )
 
+
+def run(
+    input_dir: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    extractor_settings: Optional[dict[str, Any]] = None,
+    use_cache: bool = False,
+    artifacts_dir: Optional[str] = None,
+    metrics_dir: Optional[str] = None,
+    profile: bool = False,
+    cleaner_time_limit: Optional[float] = None,
+    queue_dir: Optional[str] = None,
+    lease_ttl: float = 300.0,
+    on_output: Optional[Callable[[Path], None]] = None
+):
+    '''
+    With `metrics_dir`, every run writes its stage timings to a fresh
+    `run-<timestamp>` directory below it; `profile` adds cProfile dumps per
+    document and stage. With a shared `queue_dir`, runs on several hosts
+    split the input directory between them. `on_output` receives each
+    cleaned text file as soon as it is ready.
+    '''
+    extractor_settings = dict(extractor_settings or {})
+    parallel = workers if workers is not None else (os.cpu_count() or 1)
+    if parallel > 1 and extractor_settings.get('shard_workers') is None:
+        # Each ingestion worker shards on its own; split the cores between them
+        extractor_settings['shard_workers'] = max(1, (os.cpu_count() or 1) // parallel)
+
+    loader = PdfLoader(Path(input_dir), manifest_path=Path(output_dir) / PdfLoader.MANIFEST_NAME)
+    writer = TextWriter(Path(output_dir))
+    processor = build_processor(extractor_settings, artifacts_dir, cleaner_time_limit)
+
+    cache = None
+    if use_cache:
+        cache = IngestionCache(Path(output_dir), processor.fingerprint())
+
+    metrics = None
+    if metrics_dir:
+        run_dir = Path(metrics_dir) / time.strftime('run-%Y%m%d-%H%M%S')
+        metrics = MetricsReport(run_dir, profile=profile)
+    elif profile:
+        logger.warning('Profiling requested but no metrics directory configured, skipping')
+
+    queue = LeaseQueue(Path(queue_dir) / 'ingestion', ttl=lease_ttl) if queue_dir else None
+
     runner = BatchIngestionRunner(
         loader=loader,
         processor=processor,
-        writer=writer
+        writer=writer,
+        workers=workers,
+        processor_factory=partial(build_processor, extractor_settings, artifacts_dir, cleaner_time_limit),
+        cache=cache,
+        metrics=metrics,
+        queue=queue,
+        on_output=on_output
     )
-    
-    runner.run()
\ No newline at end of file
+
+    runner.run()
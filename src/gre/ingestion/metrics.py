@@ -0,0 +1,131 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+
+class StageTimer:
+    '''
+    Wall-clock time per pipeline stage for one document. With a `profile_dir`,
+    every stage is also run under cProfile and dumped to `<stage>.prof`.
+    Stages that were cut off by their time limit are listed in `timeouts`.
+    '''
+
+    def __init__(self, profile_dir: Optional[Path] = None) -> None:
+        self.stages: dict[str, float] = {}
+        self.timeouts: list[str] = []
+        self.profile_dir = profile_dir
+
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        profiler = cProfile.Profile() if self.profile_dir is not None else None
+        start_time = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start_time
+            if profiler is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(self.profile_dir / f'{name}.prof')
+
+
+def _percentile(values: list[float], q: float) -> float:
+    '''
+    Linear-interpolated percentile of `values` (sorted ascending), q in [0, 100].
+    '''
+    if len(values) == 1:
+        return values[0]
+    rank = (len(values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class MetricsReport:
+    '''
+    Machine-readable timing report for one ingestion run, stored in `run_dir`:
+    `documents.jsonl` gets one line per processed PDF as results arrive and
+    `summary.json` the per-stage p50/p95/max once the run is finished.
+    '''
+
+    DOCUMENTS_NAME = 'documents.jsonl'
+    SUMMARY_NAME = 'summary.json'
+
+    def __init__(self, run_dir: Path, profile: bool = False) -> None:
+        self.run_dir = run_dir
+        self.profile = profile
+        self._stages: dict[str, list[float]] = {}
+        self._durations: list[float] = []
+        self._failed = 0
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._documents = open(self.run_dir / self.DOCUMENTS_NAME, 'w', encoding='utf-8')
+
+
+    @property
+    def profile_dir(self) -> Optional[Path]:
+        return self.run_dir / 'profiles' if self.profile else None
+
+
+    def record(
+        self,
+        path: Path,
+        worker: str,
+        duration: float,
+        stages: dict[str, float],
+        error: Optional[str] = None,
+        timeouts: Optional[list[str]] = None
+    ) -> None:
+        entry = {
+            'file': path.name,
+            'worker': worker,
+            'duration': round(duration, 6),
+            'error': error,
+            'timeouts': timeouts or [],
+            'stages': {name: round(seconds, 6) for name, seconds in stages.items()},
+        }
+        self._documents.write(json.dumps(entry) + '\n')
+        self._documents.flush()
+
+        self._durations.append(duration)
+        if error is not None:
+            self._failed += 1
+        for name, seconds in stages.items():
+            self._stages.setdefault(name, []).append(seconds)
+
+
+    def summary(self) -> dict[str, Any]:
+        stages = {}
+        for name, values in self._stages.items():
+            values = sorted(values)
+            stages[name] = {
+                'docs': len(values),
+                'total': sum(values),
+                'p50': _percentile(values, 50),
+                'p95': _percentile(values, 95),
+                'max': values[-1],
+            }
+
+        return {
+            'docs': len(self._durations),
+            'failed': self._failed,
+            'total': sum(self._durations),
+            'stages': stages,
+        }
+
+
+    def close(self) -> dict[str, Any]:
+        '''
+        Writes `summary.json` and returns the summary.
+        '''
+        self._documents.close()
+        summary = self.summary()
+        (self.run_dir / self.SUMMARY_NAME).write_text(json.dumps(summary, indent=2), encoding='utf-8')
+        return summary
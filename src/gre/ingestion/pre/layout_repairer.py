@@ -1,39 +1,61 @@
 import re
+from functools import lru_cache
 
-from gre.logger.logger import get_logger
+from gre.logger.logger import EventCounter, get_logger
 
 
 HEADER_BODY_KEYS = ['Keywords:', 'Abstract', 'Highlights', 'Introduction', 'Background', 'Conclusion']
+SECTION_WORDS = ['ABSTRACT', 'INTRODUCTION', 'ARTICLE', 'INFO', 'METHOD', 'RESULT', 'CONCLUSION', 'REFERENCES']
 DE_HYPHEN_RE = re.compile(r'(\w+)-\n([a-z])')
 LINE_UNWRAP_RE = re.compile(r'([^\.\?\!\n])\n([a-z])')
 
+# Fused scan, pass 1: spaced-out letters (plus the word they run into) and
+# all-caps tokens that may hide glued section names. Both start at a word
+# boundary; inside the spaced form every letter follows whitespace, so the
+# boundary is only tested once.
+CAPS_TOKEN_RE = re.compile(r'\b([A-Z]{5,})\b')
+TOKEN_RE = re.compile(r'\b(?:(?P<spaced>(?:[A-Za-z]\s){4,}[A-Za-z])(?P<tail>\w*)|(?P<caps>[A-Z]{5,})\b)')
+
+# Fused scan, pass 2: blank-line runs and single newlines that may be joined
+# or need a blank line before a header keyword
+HEADER_KEY_PATTERN = '|'.join(re.escape(k) for k in HEADER_BODY_KEYS)
+NEWLINE_RE = re.compile(rf'\n(?:(?P<run>\n+)|(?=(?P<key>(?i:{HEADER_KEY_PATTERN}))|[a-z]))')
+WORD_CHAR_RE = re.compile(r'\w')
+
+
+@lru_cache(maxsize=4096)
+def _section_split(token: str) -> str:
+    result = token
+    for sec in SECTION_WORDS:
+        result = result.replace(sec, f' {sec} ')
+    return ' '.join(result.split())
+
 
 class LayoutRepairer:
     def __init__(self) -> None:
         self.logger = get_logger(self.__class__.__name__)
-        self.source_id: str | None = None
 
     
     def process(self, text: str) -> str:
+        '''
+        Repairs the layout in two scans over precompiled tables: token fixes
+        (spaced letters, glued section names) first, then all newline decisions
+        (header/body split, de-hyphenation, unwrap, blank reduction). The output
+        matches `process_multipass`.
+        '''
         original_len = len(text)
 
         self.logger.info(
-            'Layout repair started | file=%s | chars=%d',
-            self.source_id,
+            'Layout repair started | chars=%d',
             original_len
         )
 
-        text = self._merge_spaces(text)
-        text = self._split_knows_sections(text)
-        text = self._split_header_body_lines(text)
-        text = self._de_hyphenation(text)
-        text = self._line_unwrap(text)
-        text = self._reduce_multiple_blanks(text)
+        text = self._repair_tokens(text)
+        text = self._repair_newlines(text)
 
         fixed_len = len(text)
         self.logger.info(
-            'Layout repair finished | file=%s | chars=%d | chars_after=%d | chars_diff=%d',
-            self.source_id,
+            'Layout repair finished | chars=%d | chars_after=%d | chars_diff=%d',
             original_len,
             fixed_len,
             original_len - fixed_len
@@ -41,6 +63,87 @@ class LayoutRepairer:
         return text
 
 
+    def process_multipass(self, text: str) -> str:
+        '''
+        Reference implementation with one full pass per repair step. Kept for
+        benchmarking and cross-checking the fused scan.
+        '''
+        text = self._merge_spaces(text)
+        text = self._split_knows_sections(text)
+        text = self._split_header_body_lines(text)
+        text = self._de_hyphenation(text)
+        text = self._line_unwrap(text)
+        text = self._reduce_multiple_blanks(text)
+        return text
+
+
+    def _repair_tokens(self, text: str) -> str:
+        events = EventCounter()
+
+        def split_token(token: str) -> str:
+            result = _section_split(token)
+            if result != token:
+                events.add('sections_split')
+                self.logger.debug('Section header split | before=\'%s\' | after=\'%s\'', token, result)
+            return result
+
+        def replace(match: re.Match[str]) -> str:
+            caps = match.group('caps')
+            if caps is not None:
+                return split_token(caps)
+
+            spaced = match.group('spaced')
+            if ' ' in spaced:
+                events.add('spaced_words_merged')
+            merged = spaced.replace(' ', '') + match.group('tail')
+            # Merged letters may form all-caps tokens of their own
+            return CAPS_TOKEN_RE.sub(lambda m: split_token(m.group(1)), merged)
+
+        text = TOKEN_RE.sub(replace, text)
+        events.log(self.logger, 'Layout tokens repaired')
+
+        return text
+
+
+    def _repair_newlines(self, text: str) -> str:
+        pieces: list[str] = []
+        last = 0
+        # Index of the lowercase letter taken by the last join; a letter cannot
+        # take part in two joins of the same kind, as in the sequential passes.
+        last_dehyphen = -1
+        last_unwrap = -1
+
+        for match in NEWLINE_RE.finditer(text):
+            pos = match.start()
+
+            if match.group('run') is not None:
+                pieces.append(text[last:pos])
+                pieces.append('\n\n')
+                last = match.end()
+                continue
+
+            if match.group('key') is not None:
+                pieces.append(text[last:pos])
+                pieces.append('\n\n')
+                last = pos + 1
+                continue
+
+            # Otherwise the newline is followed by a lowercase letter
+            prev = text[pos - 1] if pos > 0 else '\n'
+            if prev == '-' and pos >= 2 and pos - 2 != last_dehyphen and WORD_CHAR_RE.match(text, pos - 2):
+                pieces.append(text[last:pos - 1])
+                last = pos + 1
+                last_dehyphen = pos + 1
+            elif prev not in '.?!\n' and pos - 1 != last_unwrap:
+                pieces.append(text[last:pos])
+                pieces.append(' ')
+                last = pos + 1
+                last_unwrap = pos + 1
+
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+
     def _reduce_multiple_blanks(self, text: str) -> str:
         return re.sub(r'\n{3,}', '\n\n', text)
 
@@ -73,7 +176,7 @@ class LayoutRepairer:
         )   
 
         if text != original:
-            self.logger.info('file=%s | Spaces-character words normalized', self.source_id)
+            self.logger.info('Spaces-character words normalized')
 
         return text
     
@@ -89,33 +192,18 @@ class LayoutRepairer:
 
     def _split_sections(self, match: re.Match[str]):
         token = match.group(1)
-        sections = [
-            "ABSTRACT",
-            "INTRODUCTION",
-            "ARTICLE",
-            "INFO",
-            "METHOD",
-            "RESULT",
-            "CONCLUSION",
-            "REFERENCES"
-        ]
 
         result = token
-        for sec in sections:
+        for sec in SECTION_WORDS:
             result = result.replace(sec, f' {sec} ')
 
         result = re.sub(r'\s+', ' ', result)
 
         if result != token:
-            self.logger.info(
-                'Section header split | file=%s | before=\'%s\' | after=\'%s\'',
-                self.source_id,
+            self.logger.debug(
+                'Section header split | before=\'%s\' | after=\'%s\'',
                 token,
                 result.strip()
             )
 
-        return result.strip()
-
-
-    def set_source(self, source_id: str) -> None:
-        self.source_id = source_id
\ No newline at end of file
+        return result.strip()
\ No newline at end of file
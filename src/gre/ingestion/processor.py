@@ -1,55 +1,145 @@
 from pathlib import Path
+from typing import Optional
 
 from gre.ingestion.loader.text_extractor import TextExtractor
 from gre.ingestion.pre.layout_repairer import LayoutRepairer
 from gre.ingestion.post.line_normalizer import LineNormalizer
-from gre.logger.logger import get_logger
+from gre.logger.logger import document_context, get_logger
 from gre.ingestion.cleaners.base import BaseCleaner
+from gre.ingestion.artifacts import StageArtifactStore
+from gre.ingestion.document import Document
+from gre.ingestion.guard import StageTimeout, time_limit
+from gre.ingestion.metrics import StageTimer
+from gre.ingestion.fingerprint import component_fingerprint, file_sha256, fingerprint_digest
 
 
 class PdfIngestionProcessor:
-    def __init__(self, extractor: TextExtractor, repairer: LayoutRepairer, cleaners: list[BaseCleaner], normalizer: LineNormalizer) -> None:
+    def __init__(
+        self,
+        extractor: TextExtractor,
+        repairer: LayoutRepairer,
+        cleaners: list[BaseCleaner],
+        normalizer: LineNormalizer,
+        artifacts: Optional[StageArtifactStore] = None,
+        cleaner_time_limit: Optional[float] = None
+    ) -> None:
+        '''
+        With an `artifacts` store, the raw extracted text and the layout-repaired
+        text are persisted per document and reused while the PDF and the
+        extractor/repairer fingerprints stay the same.
+        `cleaner_time_limit` caps the seconds a single cleaner, and the layout
+        repairer, may spend on one document; a stage that runs over is skipped
+        for that document.
+        '''
         self.logger = get_logger(self.__class__.__name__)
         self.extractor = extractor
         self.repairer = repairer
         self.cleaners = cleaners
         self.normalizer = normalizer
+        self.artifacts = artifacts
+        self.cleaner_time_limit = cleaner_time_limit
+
+
+    def fingerprint(self) -> str:
+        '''
+        Stable digest of the extractor settings, the ordered cleaner list and all
+        component parameters. Changes whenever the output could change.
+        '''
+        components = [self.extractor, self.repairer, *self.cleaners, self.normalizer]
+        return fingerprint_digest([component_fingerprint(c) for c in components])
     
 
-    def process(self, pdf_path: Path):
-        self.logger.info('Reading PDF: %s', pdf_path.name)
-        text = self.extractor.extract(pdf_path) 
+    def process(self, pdf_path: Path, timer: Optional[StageTimer] = None, content_hash: Optional[str] = None):
+        '''
+        Runs the full chain on one PDF. Pass a `timer` to collect per-stage
+        timings: extract, repair, one entry per cleaner class and normalize.
+        `content_hash` is the PDF's SHA-256 if the caller already knows it;
+        otherwise it is computed when artifacts are enabled.
+        '''
+        with document_context(pdf_path.name):
+            return self._process(pdf_path, timer or StageTimer(), content_hash)
 
-        if not text.strip():
-            self.logger.warning(
-                'PDF extracted but empty content detected | file=%s',
-                pdf_path.name
-            )
-        
-        original_len = len(text)
 
-        self.logger.info(
-            'PDF loaded successfully | file=%s | chars=%d',
-            pdf_path.name,
-            original_len,
-        )
+    def _process(self, pdf_path: Path, timer: StageTimer, content_hash: Optional[str]) -> str:
+        self.logger.info('Reading PDF')
 
-        self.repairer.set_source(pdf_path.name)
-        text = self.repairer.process(text)
+        extract_key = repair_key = None
+        if self.artifacts is not None:
+            content_hash = content_hash or file_sha256(pdf_path)
+            extract_key = fingerprint_digest('extract', content_hash, component_fingerprint(self.extractor))
+            repair_key = fingerprint_digest('repair', extract_key, component_fingerprint(self.repairer))
 
+        with timer.stage('extract'):
+            text = self._extract(pdf_path, extract_key)
+        original_len = len(text)
+        with timer.stage('repair'):
+            try:
+                text = self._repair(pdf_path, text, repair_key)
+            except StageTimeout:
+                # The cleaners still run on the unrepaired text
+                self.logger.error('Layout repair exceeded time limit, skipped | limit=%.1fs', self.cleaner_time_limit)
+                timer.timeouts.append(self.repairer.__class__.__name__)
+
+        # Cleaners and the normalizer share one line-based document; the text is
+        # split once here and joined once for the writer.
+        document = Document.from_text(text)
         for cleaner in self.cleaners:
-            cleaner.set_source(pdf_path.name)
-            text = cleaner.run(text)
+            name = cleaner.__class__.__name__
+            with timer.stage(name):
+                try:
+                    document = cleaner.run(document, self.cleaner_time_limit)
+                except StageTimeout:
+                    timer.timeouts.append(name)
 
-        self.normalizer.set_source(pdf_path.name)
-        text = self.normalizer.normalize(text)
+        with timer.stage('normalize'):
+            text = self.normalizer.normalize(document).text()
 
         removed_ratio = 1 - (len(text) / max(original_len, 1))
 
         self.logger.info(
-            'PDF processed successfully | file=%s | chars=%d | removed_ratio=%.2f',
-            pdf_path.name,
+            'PDF processed successfully | chars=%d | removed_ratio=%.2f',
             len(text),
             removed_ratio,
         )
-        return text
\ No newline at end of file
+        return text
+
+
+    def _extract(self, pdf_path: Path, key: Optional[str]) -> str:
+        if self.artifacts is not None and key is not None:
+            cached = self.artifacts.load('extract', key)
+            if cached is not None:
+                self.logger.info('Extraction reused from artifact | chars=%d', len(cached))
+                return cached
+
+        # Consume the extractor page by page so pdfplumber's per-page objects are
+        # released as we go; only the page texts are kept.
+        pages = list(self.extractor.iter_pages(pdf_path))
+        text = '\n'.join(pages)
+
+        if not text.strip():
+            self.logger.warning('PDF extracted but empty content detected')
+
+        self.logger.info(
+            'PDF loaded successfully | pages=%d | chars=%d',
+            len(pages),
+            len(text),
+        )
+
+        if self.artifacts is not None and key is not None:
+            self.artifacts.save('extract', key, text)
+        return text
+
+
+    def _repair(self, pdf_path: Path, text: str, key: Optional[str]) -> str:
+        if self.artifacts is not None and key is not None:
+            cached = self.artifacts.load('repair', key)
+            if cached is not None:
+                self.logger.info('Layout repair reused from artifact | chars=%d', len(cached))
+                return cached
+
+        with time_limit(self.cleaner_time_limit, self.repairer.__class__.__name__):
+            text = self.repairer.process(text)
+
+        if self.artifacts is not None and key is not None:
+            self.artifacts.save('repair', key, text)
+        return text
@@ -1,26 +1,132 @@
 import logging
+import os
+import queue
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.util import Finalize, register_after_fork
 from pathlib import Path
+from typing import Iterator, Optional
 
 
 _initialized = False
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_target_handlers: list[logging.Handler] = []
+
+# Document currently being processed by this thread/task
+_document: ContextVar[Optional[str]] = ContextVar('document', default=None)
+
+
+class DocumentContextFilter(logging.Filter):
+    '''
+    Adds the current document to every record as `%(document)s`. The context is
+    only read for records that pass the level check, so disabled calls cost
+    nothing beyond the level test.
+    '''
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        document = _document.get()
+        record.document = f'file={document} | ' if document else ''
+        return True
+
+
+class RawQueueHandler(QueueHandler):
+    '''
+    Enqueues records unformatted; the listener thread formats them. The
+    queue never leaves the process, so the record needs no pickling.
+    '''
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+@contextmanager
+def document_context(document: str) -> Iterator[None]:
+    '''
+    Tags all log records emitted inside the block with `document`, so their
+    messages need not name it.
+    '''
+    token = _document.set(document)
+    try:
+        yield
+    finally:
+        _document.reset(token)
+
+
+class EventCounter:
+    '''
+    Aggregates repetitive per-line or per-token events so a document logs one
+    summary record instead of one record per event. Individual events belong
+    at DEBUG level.
+    '''
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+
+    def add(self, event: str, count: int = 1) -> None:
+        self.counts[event] += count
+
+
+    def log(self, logger: logging.Logger, msg: str, level: int = logging.INFO) -> None:
+        if self.counts and logger.isEnabledFor(level):
+            details = ' | '.join(f'{event}={count}' for event, count in sorted(self.counts.items()))
+            logger.log(level, '%s | %s', msg, details)
+
+
+def _start_listener() -> None:
+    '''
+    Records are handed to a queue by the emitting thread and written to the file
+    and stderr by a background listener, so cleaning never waits on log I/O.
+    '''
+    global _listener
+
+    records: queue.Queue = queue.Queue()
+    _listener = QueueListener(records, *_target_handlers, respect_handler_level=True)
+    _queue_handler.queue = records
+    _listener.start()
+    _register_stop()
+
+
+def _register_stop(*_) -> None:
+    '''
+    Stops the listener, flushing pending records, at interpreter exit and at
+    the end of multiprocessing workers, which skip regular atexit hooks.
+    '''
+    Finalize(_listener, _listener.stop, exitpriority=100)
 
 
 def get_logger(name: str) -> logging.Logger:
-    global _initialized
+    global _initialized, _queue_handler
 
     if not _initialized:
         log_dir = Path('logs')
         log_dir.mkdir(exist_ok=True)
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-            handlers=[
-                logging.FileHandler(log_dir / 'preprocessing.log'),
-                logging.StreamHandler()
-            ]
-        )
+        formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(document)s%(message)s")
+        _target_handlers.extend([
+            logging.FileHandler(log_dir / 'preprocessing.log'),
+            logging.StreamHandler()
+        ])
+        for handler in _target_handlers:
+            handler.setFormatter(formatter)
+
+        _queue_handler = RawQueueHandler(queue.Queue())
+        _queue_handler.addFilter(DocumentContextFilter())
+
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        root.addHandler(_queue_handler)
+
+        _start_listener()
+        # Forked workers do not inherit the listener thread
+        os.register_at_fork(after_in_child=_start_listener)
+        # A multiprocessing child clears the finalizers it inherited after the fork
+        # hooks ran, so the stop is registered again once its bootstrap is done
+        register_after_fork(_queue_handler, _register_stop)
 
         _initialized = True
-    
-    return logging.getLogger(name)
\ No newline at end of file
+
+    return logging.getLogger(name)
@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from gre.logger.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so a journal must have a single writer
+    fcntl = None
+
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+# The journal is rewritten with only the latest record per item once it holds this many records per item
+COMPACT_RATIO = 8
+
+
+@dataclass
+class JournalEntry:
+    state: str
+    attempts: int = 0
+    token: Optional[str] = None
+    error: Optional[str] = None
+
+
+class RunJournal:
+    '''
+    Append-only JSONL journal of per-item state across runs. Every state
+    change is one line, written with a single O_APPEND write and fsynced, so
+    a crash loses at most the record being written; a torn last line is
+    ignored on replay. Items whose last record is `in_flight` were
+    interrupted. `attempts` counts how often an item was started.
+
+    Several processes, e.g. hosts sharing an output directory, may write one
+    journal: replay and compaction hold an exclusive lock on a `.lock` file
+    next to it, appends a shared one, and a writer whose file was replaced by
+    another process's compaction reopens it before appending.
+    '''
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.logger = get_logger(self.__class__.__name__)
+        self.entries: Dict[str, JournalEntry] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(self.path.with_name(f'{self.path.name}.lock'), os.O_CREAT | os.O_RDWR, 0o644)
+        with self._file_lock(exclusive=True):
+            records = self._replay()
+            if self.entries and records > COMPACT_RATIO * len(self.entries):
+                self._compact()
+            self._fd = self._open()
+
+        states = [entry.state for entry in self.entries.values()]
+        self.logger.info(
+            'Journal loaded | path=%s | done=%d | failed=%d | interrupted=%d',
+            self.path,
+            states.count(DONE),
+            states.count(FAILED),
+            states.count(IN_FLIGHT)
+        )
+
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+
+    def _open(self) -> int:
+        return os.open(self.path, os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o644)
+
+
+    def _append(self, data: bytes) -> None:
+        '''
+        Appends and fsyncs `data` under the shared file lock. Call with `_lock` held.
+        '''
+        with self._file_lock(exclusive=False):
+            # Another process's compaction swaps in a new file; appends to the old one would be lost
+            try:
+                replaced = os.stat(self.path).st_ino != os.fstat(self._fd).st_ino
+            except FileNotFoundError:
+                replaced = True
+            if replaced:
+                os.close(self._fd)
+                self._fd = self._open()
+            # os.write may write less than asked for large buffers
+            while data:
+                data = data[os.write(self._fd, data):]
+            os.fsync(self._fd)
+
+
+    def _replay(self) -> int:
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return 0
+
+        # A record torn by a crash is cut off, so the next append starts on a fresh line
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            self.logger.warning('Dropping torn journal record | path=%s', self.path)
+            os.truncate(self.path, complete)
+
+        records = 0
+        for line in data[:complete].decode('utf-8', errors='replace').splitlines():
+            try:
+                record = json.loads(line)
+                self.entries[record['item']] = JournalEntry(
+                    state=record['state'],
+                    attempts=record.get('attempts', 0),
+                    token=record.get('token'),
+                    error=record.get('error')
+                )
+            except (ValueError, KeyError):
+                self.logger.warning('Ignoring malformed journal record | path=%s', self.path)
+                continue
+            records += 1
+        return records
+
+
+    def _line(self, item: str, entry: JournalEntry) -> str:
+        record = {'ts': time.time(), 'item': item, 'state': entry.state, 'attempts': entry.attempts}
+        if entry.token is not None:
+            record['token'] = entry.token
+        if entry.error is not None:
+            record['error'] = entry.error
+        return json.dumps(record) + '\n'
+
+
+    def _compact(self) -> None:
+        tmp_path = self.path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for item, entry in self.entries.items():
+                f.write(self._line(item, entry))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.path)
+
+
+    def _entry(self, item: str, state: str, token: Optional[str], error: Optional[str]) -> JournalEntry:
+        previous = self.entries.get(item)
+        attempts = previous.attempts if previous is not None else 0
+        if state == IN_FLIGHT:
+            attempts += 1
+        entry = JournalEntry(state=state, attempts=attempts, token=token, error=error)
+        self.entries[item] = entry
+        return entry
+
+
+    def record(self, item: str, state: str, token: Optional[str] = None, error: Optional[str] = None) -> None:
+        '''
+        Blocks on the fsync; call it off the event loop while other work is in flight.
+        '''
+        with self._lock:
+            entry = self._entry(item, state, token, error)
+            self._append(self._line(item, entry).encode('utf-8'))
+
+
+    def record_pending(self, items: Iterable[str]) -> None:
+        '''
+        Records all `items` as pending with one write and one fsync.
+        '''
+        self.record_many((item, PENDING, None, None) for item in items)
+
+
+    def record_many(self, records: Iterable[Tuple[str, str, Optional[str], Optional[str]]]) -> None:
+        '''
+        Records (item, state, token, error) tuples with one write and one fsync.
+        '''
+        with self._lock:
+            lines = ''.join(self._line(item, self._entry(item, state, token, error)) for item, state, token, error in records)
+            if lines:
+                self._append(lines.encode('utf-8'))
+
+
+    def is_done(self, item: str, token: Optional[str] = None) -> bool:
+        '''
+        Whether `item` last finished successfully, with the same `token` if one is given.
+        '''
+        entry = self.entries.get(item)
+        if entry is None or entry.state != DONE:
+            return False
+        return token is None or entry.token == token
+
+
+    def close(self) -> None:
+        with self._lock:
+            os.close(self._fd)
+            os.close(self._lock_fd)
+
+
+def write_atomic(path: Path, text: str) -> None:
+    '''
+    Writes `text` to `path` through a temp file in the same directory, so a
+    reader or a crash never sees a partially written file.
+    '''
+    tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
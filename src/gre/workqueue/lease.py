@@ -0,0 +1,227 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from gre.logger.logger import get_logger
+
+
+T = TypeVar('T')
+
+CLAIMED = 'claimed'
+DONE = 'done'
+HELD = 'held'
+
+
+class LeaseQueue:
+    '''
+    Work queue shared by several hosts through a common directory, without a
+    broker. A worker claims an item by creating `<name>.lease` with O_EXCL;
+    while it works on the item a heartbeat thread keeps touching the lease.
+    A lease whose last heartbeat is older than `ttl` seconds belongs to a
+    crashed worker and is taken over by the next one that asks.
+
+    Finished items get a `<name>.done` marker holding the item's `token`
+    (e.g. content hash + pipeline fingerprint), so they are skipped for as
+    long as the token matches. Failed items are marked too, so other hosts do
+    not retry them in the same run; markers of failures older than this queue
+    are retried.
+    '''
+
+    def __init__(
+        self,
+        queue_dir: Path,
+        ttl: float = 300.0,
+        poll_interval: float = 5.0,
+        worker_id: Optional[str] = None
+    ) -> None:
+        self.queue_dir = queue_dir
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self.logger = get_logger(self.__class__.__name__)
+        self.opened_at = time.time()
+
+        self._held: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+
+
+    def _lease_path(self, name: str) -> Path:
+        return self.queue_dir / f'{name}.lease'
+
+
+    def _done_path(self, name: str) -> Path:
+        return self.queue_dir / f'{name}.done'
+
+
+    def _is_done(self, name: str, token: str) -> bool:
+        try:
+            with open(self._done_path(name), 'r', encoding='utf-8') as f:
+                marker = json.load(f)
+            mtime = self._done_path(name).stat().st_mtime
+        except (OSError, ValueError):
+            return False
+
+        if marker.get('token') != token:
+            return False
+        return marker.get('status') == 'done' or mtime >= self.opened_at
+
+
+    def _create_lease(self, name: str) -> bool:
+        try:
+            fd = os.open(self._lease_path(name), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'worker': self.worker_id, 'claimed_at': time.time()}, f)
+        return True
+
+
+    def _take_over_expired(self, name: str) -> bool:
+        '''
+        Moves an expired lease out of the way. Only one worker can win the rename;
+        if the lease turns out to have been renewed in the meantime, it is put back.
+        '''
+        path = self._lease_path(name)
+        try:
+            if time.time() - path.stat().st_mtime <= self.ttl:
+                return False
+            stale = path.with_name(f'{path.name}.{self.worker_id}.stale')
+            os.rename(path, stale)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+        try:
+            if time.time() - stale.stat().st_mtime <= self.ttl:
+                os.link(stale, path)
+                return False
+            self.logger.warning('Expired lease taken over | item=%s', name)
+            return True
+        except OSError:
+            return False
+        finally:
+            stale.unlink(missing_ok=True)
+
+
+    def claim(self, name: str, token: str = '') -> str:
+        '''
+        Returns CLAIMED if this worker now holds the item, DONE if it is already
+        finished and HELD if another live worker is on it.
+        '''
+        if self._is_done(name, token):
+            return DONE
+
+        if not self._create_lease(name):
+            if not self._take_over_expired(name) or not self._create_lease(name):
+                return HELD
+
+        # The item may have been finished between the check and the claim
+        if self._is_done(name, token):
+            self._lease_path(name).unlink(missing_ok=True)
+            return DONE
+
+        with self._lock:
+            self._held.add(name)
+        self._ensure_heartbeat()
+        return CLAIMED
+
+
+    def complete(self, name: str, token: str = '', ok: bool = True) -> None:
+        marker = {'token': token, 'status': 'done' if ok else 'failed', 'worker': self.worker_id, 'finished_at': time.time()}
+        tmp_path = self._done_path(name).with_suffix(f'.{self.worker_id}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(marker, f)
+        tmp_path.replace(self._done_path(name))
+        self.release(name)
+
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            self._held.discard(name)
+        self._lease_path(name).unlink(missing_ok=True)
+
+
+    def claim_all(
+        self,
+        items: Iterable[T],
+        name_of: Callable[[T], str],
+        token_of: Callable[[T], str] = lambda item: ''
+    ) -> Iterator[T]:
+        '''
+        Yields the items this worker claimed. Items held by other workers are
+        polled again after the first pass until they are done or their lease
+        expires, so the batch is finished even when another host dies.
+        '''
+        deferred: list[tuple[T, str, str]] = []
+        claimed = skipped = 0
+
+        for item in items:
+            name, token = name_of(item), token_of(item)
+            state = self.claim(name, token)
+            if state == CLAIMED:
+                claimed += 1
+                yield item
+            elif state == HELD:
+                deferred.append((item, name, token))
+            else:
+                skipped += 1
+
+        while deferred:
+            self.logger.info('Waiting for items held by other workers | items=%d', len(deferred))
+            time.sleep(self.poll_interval)
+            waiting = []
+            for item, name, token in deferred:
+                state = self.claim(name, token)
+                if state == CLAIMED:
+                    claimed += 1
+                    yield item
+                elif state == HELD:
+                    waiting.append((item, name, token))
+                else:
+                    skipped += 1
+            deferred = waiting
+
+        self.logger.info('Work queue drained | worker=%s | claimed=%d | done_elsewhere=%d', self.worker_id, claimed, skipped)
+
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat is not None and self._heartbeat.is_alive():
+            return
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=self._beat, name='lease-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            with self._lock:
+                held = list(self._held)
+            for name in held:
+                try:
+                    os.utime(self._lease_path(name))
+                except FileNotFoundError:
+                    self.logger.warning('Lease lost | item=%s', name)
+                    with self._lock:
+                        self._held.discard(name)
+
+
+    def close(self) -> None:
+        '''
+        Stops the heartbeat and releases leases of items that were not completed.
+        '''
+        self._stop.set()
+        with self._lock:
+            held = list(self._held)
+        for name in held:
+            self.release(name)
@@ -0,0 +1,154 @@
+import asyncio
+import json
+
+from gre.condensation.base import LLMProvider
+from gre.condensation.batch_api import COMPLETED, LocalBatchClient, parse_result, request_record
+from gre.condensation.batch_processor import BatchCondensationProcessor
+from gre.condensation.pipeline import ReviewCondensationPipeline
+from gre.condensation.validators import ReviewArticleValidator
+
+
+RESPONSE = '### SECTION: Problem_Definition\n- p'
+
+
+class FailingLLM(LLMProvider):
+    '''Answers every prompt except those containing `fail_on`.'''
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.prompts = []
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        if self.fail_on is not None and self.fail_on in prompt:
+            raise RuntimeError('rate limited')
+        return RESPONSE
+
+
+def _write_requests(path, prompts):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, prompt in enumerate(prompts):
+            f.write(json.dumps(request_record(f'doc#{i}', 'model', prompt, temperature=0)) + '\n')
+
+
+def test_local_client_answers_in_provider_format(tmp_path):
+    _write_requests(tmp_path / 'requests.jsonl', ['ok', 'please fail'])
+    client = LocalBatchClient('model', tmp_path / 'work', FailingLLM(fail_on='fail'))
+
+    async def run():
+        batch_id = await client.asubmit(tmp_path / 'requests.jsonl')
+        return await client.astatus(batch_id), await client.aresults(batch_id)
+
+    status, records = asyncio.run(run())
+
+    assert status == COMPLETED
+    assert parse_result(records[0]) == ('doc#0', RESPONSE, None)
+    custom_id, content, error = parse_result(records[1])
+    assert custom_id == 'doc#1' and content is None and 'rate limited' in error
+
+
+def test_local_client_without_llm_stays_pending(tmp_path):
+    _write_requests(tmp_path / 'requests.jsonl', ['ok'])
+    client = LocalBatchClient('model', tmp_path / 'work')
+
+    async def run():
+        return await client.astatus(await client.asubmit(tmp_path / 'requests.jsonl'))
+
+    assert asyncio.run(run()) != COMPLETED
+
+
+def test_failed_files_are_resubmitted(tmp_path):
+    (tmp_path / 'in').mkdir()
+    (tmp_path / 'in' / 'a.txt').write_text('first document', encoding='utf-8')
+    (tmp_path / 'in' / 'b.txt').write_text('second document', encoding='utf-8')
+    llm = FailingLLM(fail_on='second')
+    processor = BatchCondensationProcessor(ReviewCondensationPipeline(llm, ReviewArticleValidator()))
+    client = LocalBatchClient('model', tmp_path / 'work', llm)
+    batch_dir, output_dir = str(tmp_path / 'batch'), str(tmp_path / 'out')
+
+    asyncio.run(processor.asubmit_batch(str(tmp_path / 'in'), batch_dir, output_dir, client))
+    assert asyncio.run(processor.acollect_batch(batch_dir, output_dir, client))
+
+    state = json.loads((tmp_path / 'batch' / 'batch.json').read_text(encoding='utf-8'))
+    assert state['failed'] == ['b.txt']
+    assert (tmp_path / 'out' / 'condensed_a.txt').exists()
+    assert not (tmp_path / 'out' / 'condensed_b.txt').exists()
+
+    llm.fail_on = None
+    asyncio.run(processor.asubmit_batch(str(tmp_path / 'in'), batch_dir, output_dir, client))
+    state = json.loads((tmp_path / 'batch' / 'batch.json').read_text(encoding='utf-8'))
+    assert list(state['files']) == ['b.txt']
+
+    asyncio.run(processor.acollect_batch(batch_dir, output_dir, client))
+    assert (tmp_path / 'out' / 'condensed_b.txt').exists()
+
+
+def test_collect_reuses_the_submitted_input(tmp_path):
+    (tmp_path / 'in').mkdir()
+    (tmp_path / 'in' / 'a.txt').write_text('document', encoding='utf-8')
+    pipeline = ReviewCondensationPipeline(FailingLLM(), ReviewArticleValidator())
+    prepared = []
+    prepare = pipeline.prepare
+    pipeline.prepare = lambda text: prepared.append(text) or prepare(text)
+    processor = BatchCondensationProcessor(pipeline)
+    client = LocalBatchClient('model', tmp_path / 'work', pipeline.llm)
+
+    asyncio.run(processor.asubmit_batch(str(tmp_path / 'in'), str(tmp_path / 'batch'), str(tmp_path / 'out'), client))
+    (tmp_path / 'in' / 'a.txt').unlink()
+    asyncio.run(processor.acollect_batch(str(tmp_path / 'batch'), str(tmp_path / 'out'), client))
+
+    assert prepared == ['document']
+    assert (tmp_path / 'out' / 'condensed_a.txt').exists()
+
+
+class ExpiringClient(LocalBatchClient):
+    async def astatus(self, batch_id: str) -> str:
+        return 'expired'
+
+
+def test_expired_batch_fails_all_files_and_allows_a_new_submit(tmp_path):
+    (tmp_path / 'in').mkdir()
+    (tmp_path / 'in' / 'a.txt').write_text('first document', encoding='utf-8')
+    (tmp_path / 'in' / 'b.txt').write_text('second document', encoding='utf-8')
+    llm = FailingLLM()
+    processor = BatchCondensationProcessor(ReviewCondensationPipeline(llm, ReviewArticleValidator()))
+    batch_dir, output_dir = str(tmp_path / 'batch'), str(tmp_path / 'out')
+
+    asyncio.run(processor.asubmit_batch(str(tmp_path / 'in'), batch_dir, output_dir, ExpiringClient('model', tmp_path / 'work')))
+    assert not asyncio.run(processor.acollect_batch(batch_dir, output_dir, ExpiringClient('model', tmp_path / 'work')))
+
+    state = json.loads((tmp_path / 'batch' / 'batch.json').read_text(encoding='utf-8'))
+    assert state['collected'] and sorted(state['failed']) == ['a.txt', 'b.txt']
+
+    client = LocalBatchClient('model', tmp_path / 'work', llm)
+    assert asyncio.run(processor.asubmit_batch(str(tmp_path / 'in'), batch_dir, output_dir, client)) is not None
+    asyncio.run(processor.acollect_batch(batch_dir, output_dir, client))
+    assert sorted(p.name for p in (tmp_path / 'out').glob('condensed_*')) == ['condensed_a.txt', 'condensed_b.txt']
+
+
+def test_resubmit_includes_new_inputs_and_caps_retries(tmp_path):
+    (tmp_path / 'in').mkdir()
+    (tmp_path / 'in' / 'a.txt').write_text('first document', encoding='utf-8')
+    (tmp_path / 'in' / 'b.txt').write_text('broken document', encoding='utf-8')
+    llm = FailingLLM(fail_on='broken')
+    processor = BatchCondensationProcessor(ReviewCondensationPipeline(llm, ReviewArticleValidator()), max_attempts=2)
+    client = LocalBatchClient('model', tmp_path / 'work', llm)
+    batch_dir, output_dir = str(tmp_path / 'batch'), str(tmp_path / 'out')
+
+    def submit_and_collect():
+        batch_id = asyncio.run(processor.asubmit_batch(str(tmp_path / 'in'), batch_dir, output_dir, client))
+        if batch_id is None:
+            return None
+        asyncio.run(processor.acollect_batch(batch_dir, output_dir, client))
+        return sorted(json.loads((tmp_path / 'batch' / 'batch.json').read_text(encoding='utf-8'))['files'])
+
+    assert submit_and_collect() == ['a.txt', 'b.txt']
+    (tmp_path / 'in' / 'c.txt').write_text('third document', encoding='utf-8')
+    assert submit_and_collect() == ['b.txt', 'c.txt']
+    # b.txt has failed twice with the same input, so it is not submitted again
+    assert submit_and_collect() is None
+
+    (tmp_path / 'in' / 'b.txt').write_text('fixed document', encoding='utf-8')
+    assert submit_and_collect() == ['b.txt']
+    assert (tmp_path / 'out' / 'condensed_b.txt').exists()
@@ -0,0 +1,33 @@
+import asyncio
+
+from gre.condensation.base import LLMProvider
+from gre.condensation.batch_processor import BatchCondensationProcessor
+from gre.condensation.pipeline import ReviewCondensationPipeline
+from gre.condensation.validators import ReviewArticleValidator
+
+
+class SlowLLM(LLMProvider):
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return '### SECTION: Problem_Definition\n- p'
+
+
+def test_directory_mode_bounds_files_in_flight(tmp_path):
+    (tmp_path / 'in').mkdir()
+    for i in range(20):
+        (tmp_path / 'in' / f'{i}.txt').write_text(f'document {i}', encoding='utf-8')
+    llm = SlowLLM()
+    processor = BatchCondensationProcessor(ReviewCondensationPipeline(llm, ReviewArticleValidator()), concurrency=3)
+
+    asyncio.run(processor.aprocess_directory(str(tmp_path / 'in'), str(tmp_path / 'out')))
+
+    assert llm.peak == 3
+    assert len(list((tmp_path / 'out').glob('condensed_*.txt'))) == 20
@@ -0,0 +1,60 @@
+from gre.condensation.compaction import TextCompactor, is_heading
+
+
+def test_body_text_after_caption_is_kept():
+    text = '\n'.join([
+        'Figure 1: Overview of the pipeline.',
+        'The proposed method improves accuracy by 12% over the baseline.',
+        'It also halves the inference time.',
+    ])
+
+    compacted = TextCompactor().compact(text)
+
+    assert 'Overview of the pipeline' not in compacted
+    assert 'The proposed method improves accuracy by 12% over the baseline.' in compacted
+    assert 'It also halves the inference time.' in compacted
+
+
+def test_wrapped_caption_is_dropped_up_to_its_end():
+    text = '\n'.join([
+        'Table 2: Accuracy of the compared models on',
+        'three benchmark datasets.',
+        'Transformers outperform recurrent models.',
+    ])
+
+    assert TextCompactor().compact(text) == 'Transformers outperform recurrent models.'
+
+
+def test_drop_section_ends_at_unnumbered_heading():
+    text = '\n'.join([
+        'We propose a taxonomy of methods.',
+        'Acknowledgments',
+        'We thank the anonymous reviewers.',
+        'Conclusions',
+        'Graph methods remain an open problem.',
+    ])
+
+    compacted = TextCompactor().compact(text)
+
+    assert 'anonymous reviewers' not in compacted
+    assert 'Conclusions\nGraph methods remain an open problem.' in compacted
+
+
+def test_appendix_is_dropped_to_the_end():
+    text = '\n'.join([
+        'Body text.',
+        'Appendix A. Proofs',
+        'Proof of Lemma 1.',
+        'Additional Results',
+        'More tables.',
+    ])
+
+    assert TextCompactor().compact(text) == 'Body text.'
+
+
+def test_heading_shapes():
+    assert is_heading('Conclusions')
+    assert is_heading('5.2 Limitations of the Study')
+    assert is_heading('RELATED WORK')
+    assert not is_heading('We thank the reviewers.')
+    assert not is_heading('the results show a clear gain')
@@ -0,0 +1,28 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from gre.condensation.handoff import CondensationHandoff
+
+
+class StalledProcessor:
+    '''Takes one file off the queue, then dies without draining the rest.'''
+
+    async def aprocess_queue(self, files: asyncio.Queue, output_dir: str) -> None:
+        await files.get()
+        await asyncio.sleep(0.05)
+        raise RuntimeError('provider gone')
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_submit_raises_when_condensation_thread_dies(monkeypatch):
+    monkeypatch.setattr(CondensationHandoff, 'POLL_INTERVAL', 0.05)
+    handoff = CondensationHandoff(StalledProcessor(), 'out', maxsize=1)
+    handoff.start()
+
+    with pytest.raises(RuntimeError):
+        for i in range(5):
+            handoff.submit(Path(f'{i}.txt'))
+    handoff._thread.join()
+    handoff.close()
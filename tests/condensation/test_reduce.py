@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from gre.condensation.base import LLMProvider
+from gre.condensation.pipeline import ReviewCondensationPipeline
+from gre.condensation.scheduler import estimate_tokens
+from gre.condensation.validators import REQUIRED_SECTIONS, ReviewArticleValidator, format_sections
+
+
+def _partial(tag: str, lines: int) -> str:
+    return format_sections({name: [f'- {tag} {name} finding {i}' for i in range(lines)] for name in REQUIRED_SECTIONS})
+
+
+class EchoLLM(LLMProvider):
+    '''Answers with a fixed condensation and records the prompts.'''
+
+    def __init__(self):
+        self.prompts = []
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return _partial('reduced', 1)
+
+
+def _pipeline(llm, chunk_tokens):
+    return ReviewCondensationPipeline(llm, ReviewArticleValidator(), chunk_tokens=chunk_tokens)
+
+
+def test_oversized_partials_are_truncated_to_the_budget():
+    llm = EchoLLM()
+    pipeline = _pipeline(llm, chunk_tokens=600)
+    template_tokens = estimate_tokens(pipeline.reduce_template)
+    partials = [_partial(tag, 30) for tag in 'abc']
+    assert all(estimate_tokens(partial) > 600 for partial in partials)
+
+    asyncio.run(pipeline._areduce(partials))
+
+    assert len(llm.prompts) == 1
+    assert estimate_tokens(llm.prompts[0]) <= 600 + template_tokens
+    # Every partial keeps its leading lines in every section
+    for name in REQUIRED_SECTIONS:
+        for tag in 'abc':
+            assert f'- {tag} {name} finding 0' in llm.prompts[0]
+
+
+def test_budget_below_the_section_headers_raises():
+    pipeline = _pipeline(EchoLLM(), chunk_tokens=20)
+
+    with pytest.raises(ValueError):
+        asyncio.run(pipeline._areduce([_partial('a', 5), _partial('b', 5)]))
@@ -0,0 +1,66 @@
+import asyncio
+
+from gre.condensation.base import LLMProvider
+from gre.condensation.batch_processor import JOURNAL_NAME, BatchCondensationProcessor
+from gre.condensation.pipeline import ReviewCondensationPipeline
+from gre.condensation.validators import ReviewArticleValidator
+from gre.workqueue.journal import RunJournal
+
+
+class EchoLLM(LLMProvider):
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.documents = []
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        document = prompt.rsplit('-INPUT-', 1)[1].strip()
+        self.documents.append(document)
+        if document in self.fail:
+            raise RuntimeError(f'failed on {document}')
+        return f'### SECTION: Problem_Definition\n- {document}'
+
+
+def run(tmp_path, llm, resume, chunk_tokens=None):
+    pipeline = ReviewCondensationPipeline(llm, ReviewArticleValidator(), chunk_tokens=chunk_tokens)
+    processor = BatchCondensationProcessor(pipeline, resume=resume, concurrency=2)
+    asyncio.run(processor.aprocess_directory(str(tmp_path / 'in'), str(tmp_path / 'out')))
+
+
+def make_inputs(tmp_path):
+    (tmp_path / 'in').mkdir()
+    for name in 'abcd':
+        (tmp_path / 'in' / f'{name}.txt').write_text(name, encoding='utf-8')
+
+
+def test_resume_schedules_only_unfinished_files(tmp_path):
+    make_inputs(tmp_path)
+    run(tmp_path, EchoLLM(fail={'c'}), resume=False)
+    (tmp_path / 'out' / 'condensed_d.txt').unlink()
+
+    llm = EchoLLM()
+    run(tmp_path, llm, resume=True)
+
+    assert sorted(llm.documents) == ['c', 'd']
+    entries = RunJournal(tmp_path / 'out' / JOURNAL_NAME).entries
+    assert entries['c.txt'].attempts == 2
+    assert not list((tmp_path / 'out').glob('*.partial'))
+
+
+def test_failure_is_journaled_with_error(tmp_path):
+    make_inputs(tmp_path)
+    run(tmp_path, EchoLLM(fail={'b'}), resume=False)
+
+    entry = RunJournal(tmp_path / 'out' / JOURNAL_NAME).entries['b.txt']
+    assert entry.state == 'failed'
+    assert entry.error == 'failed on b'
+
+
+def test_changed_settings_invalidate_finished_files(tmp_path):
+    make_inputs(tmp_path)
+    run(tmp_path, EchoLLM(), resume=False)
+
+    llm = EchoLLM()
+    run(tmp_path, llm, resume=True, chunk_tokens=1000)
+
+    assert sorted(llm.documents) == ['a', 'b', 'c', 'd']
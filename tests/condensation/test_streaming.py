@@ -0,0 +1,109 @@
+import asyncio
+
+from gre.condensation.base import LLMProvider
+from gre.condensation.pipeline import ReviewCondensationPipeline
+from gre.condensation.response_cache import CachedLLMProvider, ResponseCache
+from gre.condensation.streaming import SectionMonitor, StreamLimits
+from gre.condensation.validators import ReviewArticleValidator, parse_sections
+
+
+LOOP = '### SECTION: Problem_Definition\n- p\n### SECTION: Models_and_Methods\n' + '- loop\n' * 500
+
+
+class StreamingLLM(LLMProvider):
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+        self.closed = 0
+
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        raise AssertionError('streaming pipeline must not call agenerate')
+
+
+    async def astream(self, prompt: str, **kwargs):
+        self.prompts.append(prompt)
+        response = self.responses.pop(0)
+        try:
+            for start in range(0, len(response), 16):
+                yield response[start:start + 16]
+        finally:
+            self.closed += 1
+
+
+def test_monitor_allows_recurring_but_not_consecutive_lines():
+    monitor = SectionMonitor(StreamLimits(max_repeats=2))
+    text = ''.join(f'### SECTION: {name}\n- N/A\n' for name in ('Problem_Definition', 'Models_and_Methods', 'Open_Challenges'))
+    assert monitor.feed(text) is None
+
+    monitor = SectionMonitor(StreamLimits(max_repeats=2))
+    assert monitor.feed('### SECTION: Problem_Definition\n- a\n- a\n- a\n') == 'repetition'
+    assert monitor.text == '### SECTION: Problem_Definition\n- a\n- a'
+
+
+def test_aborted_stream_is_repaired(tmp_path):
+    repair_prompt = tmp_path / 'repair.txt'
+    repair_prompt.write_text('{sections}\n-INPUT-\n{input_text}')
+    llm = StreamingLLM([LOOP, '### SECTION: Open_Challenges\n- scaling\n'])
+    pipeline = ReviewCondensationPipeline(
+        llm,
+        ReviewArticleValidator(),
+        prompt_path='prompts/review_condense.txt',
+        repair_prompt_path=str(repair_prompt),
+        stream_limits=StreamLimits()
+    )
+
+    sections = parse_sections(asyncio.run(pipeline.arun('document text')))
+
+    assert len(llm.prompts) == 2
+    assert sections['Models_and_Methods'] == ['- loop'] * 3
+    assert sections['Open_Challenges'] == ['- scaling']
+
+
+def test_aborted_stream_is_retried_without_repair_prompt():
+    complete = '### SECTION: Problem_Definition\n- p\n### SECTION: Models_and_Methods\n- m\n'
+    llm = StreamingLLM([LOOP, complete])
+    pipeline = ReviewCondensationPipeline(llm, ReviewArticleValidator(), stream_limits=StreamLimits())
+
+    sections = parse_sections(asyncio.run(pipeline.arun('document text')))
+
+    assert len(llm.prompts) == 2
+    assert sections['Models_and_Methods'] == ['- m']
+
+
+def test_cached_stream_closes_inner_stream_and_skips_cache_on_abort(tmp_path):
+    llm = StreamingLLM([LOOP])
+    cache = ResponseCache(tmp_path / 'cache.sqlite')
+    provider = CachedLLMProvider(llm, cache, 'model')
+
+    async def consume_first_chunk():
+        stream = provider.astream('prompt')
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+    asyncio.run(consume_first_chunk())
+
+    assert llm.closed == 1
+    assert cache.get(cache.key('model', 'prompt', {})) is None
+    cache.close()
+
+
+def test_cache_tracks_size_and_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path / 'cache.sqlite', max_bytes=10)
+    cache.put('a', 'aaaa')
+    cache.put('b', 'bbbb')
+    cache.put('a', 'aa')
+    assert cache._total == 6
+
+    cache.get('a')
+    cache.put('c', 'cccccc')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'aa'
+    assert cache._total == 8
+    cache.close()
+
+    reopened = ResponseCache(tmp_path / 'cache.sqlite', max_bytes=10)
+    assert reopened._total == 8
+    reopened.close()
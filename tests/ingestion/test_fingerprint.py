@@ -0,0 +1,55 @@
+import inspect
+
+from gre.bench.backends import _similarity
+from gre.bench.corpus import write_review_pdf
+from gre.ingestion import fingerprint
+from gre.ingestion.cleaners.noise_cleaner import NoiseCleaner
+from gre.ingestion.loader.backends import PdfiumBackend, PdfplumberBackend
+from gre.ingestion.loader.text_extractor import TextExtractor
+from gre.ingestion.post.line_normalizer import LineNormalizer
+
+
+def fingerprint_with_edited(monkeypatch, module_name, component_factory):
+    '''
+    Fingerprints a fresh component before and after the source of
+    `module_name` changes.
+    '''
+    fingerprint._source_sha256.cache_clear()
+    before = fingerprint.component_fingerprint(component_factory())
+
+    getsource = inspect.getsource
+
+    def edited(obj):
+        source = getsource(obj)
+        return source + '\n# edited' if getattr(obj, '__name__', None) == module_name else source
+
+    monkeypatch.setattr(fingerprint.inspect, 'getsource', edited)
+    fingerprint._source_sha256.cache_clear()
+    after = fingerprint.component_fingerprint(component_factory())
+    fingerprint._source_sha256.cache_clear()
+    return before, after
+
+
+def test_backend_edit_changes_extractor_fingerprint(monkeypatch):
+    before, after = fingerprint_with_edited(monkeypatch, 'gre.ingestion.loader.backends', TextExtractor)
+    assert before != after
+
+
+def test_shared_module_edits_change_cleaner_fingerprints(monkeypatch):
+    for module_name in ('gre.ingestion.cleaners.patterns', 'gre.ingestion.document'):
+        before, after = fingerprint_with_edited(monkeypatch, module_name, NoiseCleaner)
+        assert before != after, module_name
+        monkeypatch.undo()
+
+    before, after = fingerprint_with_edited(monkeypatch, 'gre.ingestion.document', LineNormalizer)
+    assert before != after
+
+
+def test_pdfium_reads_in_page_order(tmp_path):
+    pdf = tmp_path / 'review.pdf'
+    write_review_pdf(pdf, pages=2, seed=3)
+
+    reference = '\n'.join(text for _, text in PdfplumberBackend().iter_page_texts(pdf))
+    candidate = '\n'.join(text for _, text in PdfiumBackend().iter_page_texts(pdf))
+
+    assert _similarity(reference, candidate) > 0.9
@@ -0,0 +1,84 @@
+import random
+from difflib import SequenceMatcher
+
+from gre.ingestion.cleaners.header_footer_cleaner import MIN_OVERLAP, CandidateIndex, HeaderFooterCleaner
+from gre.ingestion.document import Document
+
+
+HEADS = [
+    'journalofsyntheticreviews12(2024)101-110',
+    'journalofsyntheticreviewsspecialissue',
+    'graphretrievalmodelevaluationbenchmarksurvey',
+    'ieeetransactionsonknowledgeanddataengineering',
+    'authorizedlicenseduselimitedto',
+]
+
+
+def _reference_overlap(candidates, norm_line):
+    # The per-candidate scan CandidateIndex replaces
+    for cand in candidates:
+        match = SequenceMatcher(None, norm_line, cand).find_longest_match(0, len(norm_line), 0, len(cand))
+        if match.size > MIN_OVERLAP:
+            return match.a, match.size
+    return None
+
+
+def _lines(rng, count):
+    words = ['graph', 'retrieval', 'model', 'journal', 'review', 'survey', '2024', 'of', 'the']
+    for _ in range(count):
+        line = ''.join(rng.choice(words) for _ in range(rng.randint(1, 8)))
+        if rng.random() < 0.5:
+            head = rng.choice(HEADS)
+            start = rng.randrange(len(head))
+            cut = head[start:start + rng.randint(5, len(head))]
+            pos = rng.randint(0, len(line))
+            line = line[:pos] + cut + line[pos:]
+        yield line
+
+
+def test_candidate_index_matches_per_candidate_scan():
+    rng = random.Random(7)
+    candidates = HEADS + [''.join(rng.choice('abcdefgh') for _ in range(rng.randint(10, 60))) for _ in range(20)]
+    index = CandidateIndex(candidates)
+
+    for line in _lines(rng, 2000):
+        assert index.find_overlap(line) == _reference_overlap(candidates, line), line
+
+
+def test_running_heads_are_removed():
+    pages = []
+    for page in range(1, 7):
+        pages += [
+            f'=== PAGE {page} ===',
+            'Journal of Synthetic Reviews 12 (2024) 101-110',
+            f'Body paragraph {page} discusses graph retrieval in detail.',
+            'More body text follows here.',
+        ]
+    document = HeaderFooterCleaner().run(Document.from_text('\n'.join(pages)))
+
+    text = document.text()
+    assert 'Journal of Synthetic Reviews' not in text
+    assert 'Body paragraph 3 discusses graph retrieval in detail.' in text
+
+
+def test_page_markers_inside_lines_split_pages():
+    lines = []
+    for page in range(1, 7):
+        # Layout repair can leave a marker after a heading or before body text on the same line
+        lines.append(('ABSTRACT ' if page == 4 else '') + f'=== PAGE {page} ===' + (' Results continue' if page == 5 else ''))
+        lines += [
+            'Journal of Synthetic Reviews 12 (2024) 101-110',
+            f'Body paragraph {page} discusses graph retrieval.',
+            'More body text follows here.',
+        ]
+    document = HeaderFooterCleaner().run(Document.from_text('\n'.join(lines)))
+
+    # Output of the string-based cleaner, which split the text on markers anywhere
+    assert document.text() == '\n'.join([
+        '=== PAGE 1 ===', 'Body paragraph 1 discusses graph retrieval.',
+        '=== PAGE 2 ===', 'Body paragraph 2 discusses graph retrieval.',
+        '=== PAGE 3 ===', 'Body paragraph 3 discusses graph retrieval.', 'More body text follows here.', 'ABSTRACT',
+        '=== PAGE 4 ===', 'Body paragraph 4 discusses graph retrieval.',
+        '=== PAGE 5 ===', 'Results continue', 'Journal of Synthetic Reviews 12 (2024) 101-110', 'Body paragraph 5 discusses graph retrieval.',
+        '=== PAGE 6 ===', 'Body paragraph 6 discusses graph retrieval.',
+    ])
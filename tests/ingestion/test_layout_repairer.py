@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from gre.ingestion.pre.layout_repairer import HEADER_BODY_KEYS, SECTION_WORDS, LayoutRepairer
+
+
+# Fragments that trigger every repair step, alone and where steps interact
+PIECES = [
+    'a', 'b', 'x', 'Z', '1', 'é', 'word', 'Word', 'WORD',
+    ' ', ' ', '\t', '\n', '\n', '\n\n', '-', '.', '?',
+    'I N T R O', 'A B S T R A C T', 'ABSTRACTINTRODUCTION', 'REFERENCESX', 'keywords:',
+    *SECTION_WORDS,
+    *HEADER_BODY_KEYS,
+]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_fused_scan_matches_multipass(seed):
+    rng = random.Random(seed)
+    repairer = LayoutRepairer()
+
+    for _ in range(2000):
+        text = ''.join(rng.choice(PIECES) for _ in range(rng.randint(1, 30)))
+        assert repairer.process(text) == repairer.process_multipass(text), repr(text)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('A B S T R A C T\nThe model', 'ABSTRACT\nThe model'),
+    ('Graph retrieval\nIntroduction follows', 'Graph retrieval\n\nIntroduction follows'),
+    ('retrie-\nval works', 'retrieval works'),
+    ('a wrapped\nline', 'a wrapped line'),
+    ('one\n\n\n\ntwo', 'one\n\ntwo'),
+    ('ARTICLEINFO', 'ARTICLE INFO'),
+])
+def test_repairs(text, expected):
+    assert LayoutRepairer().process(text) == expected
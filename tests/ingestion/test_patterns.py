@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from gre.ingestion.cleaners.front_matter_cleaner import METADATA_PATTERNS
+from gre.ingestion.cleaners.patterns import PatternSet
+from gre.ingestion.cleaners.publication_metadata_cleaner import PublicationMetadataCleaner
+
+
+LINES = [
+    '',
+    'Graph retrieval for scientific reviews',
+    'Corresponding author: jane.doe@example.org (J. Doe)',
+    'E-mail addresses: a@b.c, d@e.f',
+    'Received 12 March 2024; Accepted 3 June 2024; Available online 9 June 2024',
+    'Manuscript received January 5, 2023; accepted March 1, 2023. Date of publication April 2, 2023',
+    'date of current version May 1, 2023. Associate Editor: A. Smith',
+    'This work was supported by the National Science Foundation under Grant 12345.',
+    'https://doi.org/10.1016/j.example.2024.01.001',
+    '© 2024 Elsevier Ltd. All rights reserved. ScienceDirect journal homepage: www.elsevier.com',
+    'Authorized licensed use limited to: IEEE Xplore. url: http://ieeexplore.ieee.org',
+    'Contents lists available at ScienceDirect',
+    'We accepted the grant-based e-mails as unaccepted inputs.',
+    'The received signal is accepted by the model.',
+]
+
+
+def _reference_search(patterns, flags, text):
+    # Leftmost match wins; at the same position the earlier pattern does, as in an alternation
+    matches = [(m.start(), i) for i, p in enumerate(patterns) if (m := re.search(p, text, flags))]
+    return patterns[min(matches)[1]] if matches else None
+
+
+@pytest.mark.parametrize('patterns', [METADATA_PATTERNS, PublicationMetadataCleaner.KEY_PATTERNS], ids=['front-matter', 'publication-metadata'])
+@pytest.mark.parametrize('flags', [0, re.IGNORECASE], ids=['case-sensitive', 'ignorecase'])
+def test_pattern_set_matches_per_pattern_search(patterns, flags):
+    matcher = PatternSet(patterns, flags)
+
+    for line in LINES:
+        assert matcher.search(line) == _reference_search(patterns, flags, line), line
+        assert matcher.count(line) == sum(1 for p in patterns if re.search(p, line, flags)), line
+
+
+@pytest.mark.parametrize('pattern', [r'(?i)doi', r'(\w+) \1', r'(?P<word>\w+) (?P=word)', r'(a)?(?(1)b|c)'])
+def test_pattern_set_rejects_patterns_it_cannot_combine(pattern):
+    with pytest.raises(ValueError):
+        PatternSet(['received', pattern])
+
+
+@pytest.mark.parametrize('pattern', [r'(?i:doi)', r'\\1', r'(\w+)-(\w+)'])
+def test_pattern_set_accepts_scoped_flags_and_groups(pattern):
+    assert PatternSet([pattern]).patterns == [pattern]
@@ -0,0 +1,39 @@
+import logging
+import queue
+
+from gre.logger.logger import DocumentContextFilter, RawQueueHandler, document_context
+
+
+def _queued_logger(records: queue.Queue) -> logging.Logger:
+    handler = RawQueueHandler(records)
+    handler.addFilter(DocumentContextFilter())
+    logger = logging.getLogger('test_logger.queued')
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_records_are_queued_unformatted():
+    records = queue.Queue()
+    logger = _queued_logger(records)
+
+    logger.info('Sharded extraction | pages=%d', 120)
+
+    record = records.get_nowait()
+    assert record.msg == 'Sharded extraction | pages=%d'
+    assert record.args == (120,)
+    assert record.getMessage() == 'Sharded extraction | pages=120'
+
+
+def test_document_context_tags_records():
+    records = queue.Queue()
+    logger = _queued_logger(records)
+
+    with document_context('d2.txt'):
+        logger.error('Error processing file: %s', 'timeout')
+    logger.info('Batch finished')
+
+    tagged, untagged = records.get_nowait(), records.get_nowait()
+    assert tagged.document == 'file=d2.txt | '
+    assert untagged.document == ''
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+SRC = Path(__file__).resolve().parents[2] / 'src'
+
+# Each pool worker logs and exits; every record must reach the log file
+SCRIPT = '''
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from gre.logger.logger import get_logger
+
+
+def work(task):
+    logger = get_logger('worker')
+    for i in range(200):
+        logger.info('record | task=%d | i=%d', task, i)
+
+
+if __name__ == '__main__':
+    get_logger('main')
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('fork')) as executor:
+        list(executor.map(work, range(4)))
+'''
+
+
+def test_pool_workers_flush_every_record(tmp_path):
+    script = tmp_path / 'pool_logging.py'
+    script.write_text(SCRIPT, encoding='utf-8')
+
+    subprocess.run([sys.executable, str(script)], cwd=tmp_path, env={'PYTHONPATH': str(SRC)}, check=True, capture_output=True)
+
+    lines = (tmp_path / 'logs' / 'preprocessing.log').read_text(encoding='utf-8').splitlines()
+    assert sum(1 for line in lines if '| record |' in line) == 800
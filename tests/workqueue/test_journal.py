@@ -0,0 +1,85 @@
+import json
+import os
+
+from gre.workqueue import journal as journal_module
+from gre.workqueue.journal import COMPACT_RATIO, DONE, FAILED, IN_FLIGHT, PENDING, RunJournal, write_atomic
+
+
+def test_replay_drops_torn_record_and_keeps_attempts(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = RunJournal(path)
+    journal.record('a.txt', IN_FLIGHT, token='t')
+    journal.record('a.txt', FAILED, token='t', error='boom')
+    journal.record('a.txt', IN_FLIGHT, token='t')
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"ts": 1, "item": "a.t')
+
+    journal = RunJournal(path)
+    journal.record('b.txt', DONE, token='u')
+    journal.close()
+
+    entries = RunJournal(path).entries
+    assert entries['a.txt'].state == IN_FLIGHT
+    assert entries['a.txt'].attempts == 2
+    assert entries['b.txt'].state == DONE
+    for line in path.read_text(encoding='utf-8').splitlines():
+        json.loads(line)
+
+
+def test_failure_keeps_error(tmp_path):
+    journal = RunJournal(tmp_path / 'journal.jsonl')
+    journal.record('a.txt', FAILED, error='rate limited')
+    journal.close()
+
+    assert RunJournal(tmp_path / 'journal.jsonl').entries['a.txt'].error == 'rate limited'
+
+
+def test_record_pending_syncs_once(tmp_path, monkeypatch):
+    journal = RunJournal(tmp_path / 'journal.jsonl')
+    syncs = []
+    monkeypatch.setattr(journal_module.os, 'fsync', lambda fd: syncs.append(fd))
+
+    journal.record_pending(f'{i}.txt' for i in range(100))
+    journal.close()
+
+    assert len(syncs) == 1
+    assert all(entry.state == PENDING for entry in RunJournal(tmp_path / 'journal.jsonl').entries.values())
+
+
+def test_is_done_checks_token(tmp_path):
+    journal = RunJournal(tmp_path / 'journal.jsonl')
+    journal.record('a.txt', DONE, token='old')
+
+    assert journal.is_done('a.txt', 'old')
+    assert not journal.is_done('a.txt', 'new')
+    journal.close()
+
+
+def test_write_atomic_leaves_no_temp_files(tmp_path):
+    target = tmp_path / 'out.txt'
+    write_atomic(target, 'first')
+    write_atomic(target, 'second')
+
+    assert target.read_text(encoding='utf-8') == 'second'
+    assert os.listdir(tmp_path) == ['out.txt']
+
+
+def test_appends_survive_compaction_by_another_writer(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    first = RunJournal(path)
+    for _ in range(COMPACT_RATIO + 2):
+        first.record('a', IN_FLIGHT)
+
+    # Opening the journal again compacts it, replacing the file `first` appends to
+    second = RunJournal(path)
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 1
+    first.record('b', DONE)
+    second.record('c', DONE)
+    first.close()
+    second.close()
+
+    replayed = RunJournal(path)
+    assert replayed.is_done('b') and replayed.is_done('c')
+    assert replayed.entries['a'].attempts == COMPACT_RATIO + 2
+    replayed.close()